@@ -1,38 +1,72 @@
 from flask import Flask
 import os
 from .extensions import init_extensions
-from .models import User, Vehicle, ServiceRecord, Reminder, ServiceRecordAttachment  # noqa: F401
+from .utils.json_provider import OrjsonProvider
+from .models import User, Vehicle, ServiceRecord, Reminder, ServiceRecordAttachment, Job, RecallCampaign, SingleFlightCall  # noqa: F401
 from config import Config
-import cloudinary
 
 
 def create_app():
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     app.config.from_object(Config)
 
     instance_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "instance")
     os.makedirs(instance_path, exist_ok=True)
 
-    cloudinary.config(
-        cloud_name=app.config.get("CLOUDINARY_CLOUD_NAME"),
-        api_key=app.config.get("CLOUDINARY_API_KEY"),
-        api_secret=app.config.get("CLOUDINARY_API_SECRET"),
-        secure=True,
-    )
-
     init_extensions(app)
 
+    from .utils.admission import init_admission
+    from .utils.circuit_breaker import init_circuit_breakers
+    from .utils.compression import init_compression
+    from .utils.db_routing import init_db_routing
+    from .utils.identity import init_identity
+    from .utils.jobs import init_jobs
+    from .utils.metrics import init_metrics
+    from .utils.query_budget import init_query_budget
+    from .utils.response_cache import init_response_cache
+    from .utils.soft_delete import init_soft_delete
+    from .utils.sqlite import init_sqlite
+
+    init_sqlite(app)
+    init_db_routing(app)
+    init_metrics(app)
+    init_query_budget(app)
+    init_identity(app)
+    init_admission(app)
+    init_circuit_breakers(app)
+    init_response_cache(app)
+    init_compression(app)
+    init_soft_delete(app)
+    init_jobs(app)
+
     # Register blueprints
     from .routes.auth import auth_bp
     from .routes.vehicles import vehicles_bp
     from .routes.service_records import service_records_bp
     from .routes.reminders import reminders_bp
     from .routes.attachments import attachments_bp
+    from .routes.storage import storage_bp
+    from .routes.ops import ops_bp
+    from .routes.batch import batch_bp
+    from .routes.sync import sync_bp
+    from .routes.overview import overview_bp
+    from .routes.jobs import jobs_bp
 
     app.register_blueprint(auth_bp, url_prefix="/auth")
     app.register_blueprint(vehicles_bp, url_prefix="/vehicles")
+    app.register_blueprint(overview_bp, url_prefix="/vehicles")
     app.register_blueprint(service_records_bp, url_prefix="/service-records")
     app.register_blueprint(reminders_bp, url_prefix="/reminders")
     app.register_blueprint(attachments_bp)
+    app.register_blueprint(storage_bp, url_prefix="/storage")
+    app.register_blueprint(ops_bp)
+    app.register_blueprint(batch_bp)
+    app.register_blueprint(sync_bp)
+    app.register_blueprint(jobs_bp, url_prefix="/jobs")
+
+    from .commands import register_commands
+
+    register_commands(app)
 
     return app
@@ -0,0 +1,142 @@
+import time
+
+import click
+
+from app.utils.passwords import hash_password
+from app.utils.resp import LocalRespServer
+
+
+def register_commands(app):
+    @app.cli.command("seed-fleet")
+    @click.option("--users", default=100, show_default=True, help="Number of users to create.")
+    @click.option("--vehicles-per-user", default=3, show_default=True)
+    @click.option("--records-per-vehicle", default=20, show_default=True)
+    @click.option("--reminders-per-vehicle", default=3, show_default=True)
+    @click.option("--attachment-ratio", default=0.3, show_default=True,
+                  help="Share of service records that get an attachment row.")
+    @click.option("--seed", default=0, show_default=True, help="Random seed for reproducible data.")
+    @click.option("--batch-size", default=10000, show_default=True, help="Rows per bulk insert.")
+    @click.option("--password", default="password123", show_default=True,
+                  help="Password shared by every generated user.")
+    def seed_fleet(users, vehicles_per_user, records_per_vehicle, reminders_per_vehicle,
+                   attachment_ratio, seed, batch_size, password):
+        """Generate a synthetic fleet of users, vehicles, service history and reminders."""
+        from app.utils.fleet import generate_fleet
+
+        start = time.perf_counter()
+
+        def progress(counts):
+            total = sum(counts.values())
+            click.echo(f"  {total:,} rows written ({time.perf_counter() - start:.1f}s)")
+
+        counts = generate_fleet(
+            users=users,
+            vehicles_per_user=vehicles_per_user,
+            records_per_vehicle=records_per_vehicle,
+            reminders_per_vehicle=reminders_per_vehicle,
+            attachment_ratio=attachment_ratio,
+            seed=seed,
+            batch_size=batch_size,
+            password_hash=hash_password(password),
+            progress=progress,
+        )
+
+        elapsed = time.perf_counter() - start
+        summary = ", ".join(f"{table}={count:,}" for table, count in counts.items())
+        click.echo(f"Seeded {summary} in {elapsed:.1f}s ({sum(counts.values()) / elapsed:,.0f} rows/s).")
+
+    @app.cli.command("cache-server")
+    @click.option("--host", default="127.0.0.1", show_default=True)
+    @click.option("--port", default=6380, show_default=True)
+    def cache_server(host, port):
+        """Run an in-memory Redis-protocol server for RESPONSE_CACHE_BACKEND=resp."""
+        server = LocalRespServer(host, port)
+        click.echo(f"Response cache server listening on {server.url}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.server_close()
+
+    @app.cli.command("purge-deleted")
+    @click.option("--chunk-size", default=None, type=int, help="Rows per transaction (default PURGE_CHUNK_SIZE).")
+    @click.option("--max-chunks", default=None, type=int, help="Stop after this many chunks (default: until done).")
+    def purge_deleted_command(chunk_size, max_chunks):
+        """Hard-delete soft-deleted vehicles and service records and their attachment files; prune old sync tombstones."""
+        from app.utils.soft_delete import purge_deleted
+        from app.utils.sync import prune_tombstones
+
+        start = time.perf_counter()
+        chunks = purge_deleted(chunk_size or app.config.get("PURGE_CHUNK_SIZE", 500), max_chunks)
+        pruned = prune_tombstones()
+        click.echo(
+            f"Purged {chunks} chunk(s) and {pruned} expired sync tombstone(s) in {time.perf_counter() - start:.1f}s."
+        )
+
+    @app.cli.command("run-jobs")
+    @click.option("--threads", default=1, show_default=True, help="Worker threads in this process.")
+    @click.option("--once", is_flag=True, help="Run the jobs that are due now, then exit.")
+    def run_jobs_command(threads, once):
+        """Run background jobs in a dedicated worker process."""
+        from app.utils.jobs import JobWorker, run_next_job
+
+        if once:
+            count = 0
+            while run_next_job():
+                count += 1
+            click.echo(f"Ran {count} job(s).")
+            return
+
+        worker = JobWorker(
+            app,
+            threads=threads,
+            poll_interval=app.config.get("JOB_POLL_SECONDS", 1),
+            maintenance_interval=app.config.get("JOB_LOCK_TIMEOUT_SECONDS", 300),
+        )
+        click.echo(f"Running jobs with {threads} thread(s); Ctrl+C to stop.")
+        worker.start()
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            worker.stop()
+
+    @app.cli.command("load-vpic")
+    @click.argument("dump", type=click.Path(exists=True, dir_okay=False))
+    @click.option("--output", default=None, help="Snapshot path (default VPIC_SNAPSHOT_PATH).")
+    def load_vpic_command(dump, output):
+        """Build the offline VIN decoder snapshot from a vPIC pattern export (CSV) or snapshot file."""
+        from app.utils.vpic import load_dump, write_snapshot
+
+        start = time.perf_counter()
+        snapshot = load_dump(dump)
+        path = output or app.config["VPIC_SNAPSHOT_PATH"]
+        write_snapshot(snapshot, path)
+        app.extensions.pop("vpic_index", None)
+        click.echo(
+            f"Wrote {len(snapshot['wmi']):,} WMIs and {len(snapshot['patterns']):,} patterns to {path} "
+            f"in {time.perf_counter() - start:.1f}s."
+        )
+
+    @app.cli.command("import-recalls")
+    @click.argument("flat_file", type=click.Path(exists=True, dir_okay=False))
+    @click.option("--batch-size", default=5000, show_default=True, help="Rows written per transaction.")
+    @click.option("--prune", is_flag=True, help="Delete records that are no longer in the file.")
+    @click.option("--refresh-vehicles/--no-refresh-vehicles", default=True, show_default=True,
+                  help="Recount recalls for every vehicle afterwards.")
+    def import_recalls_command(flat_file, batch_size, prune, refresh_vehicles):
+        """Load NHTSA's recall flat file (FLAT_RCL.zip/.txt) into recall_campaigns, upserting changed records."""
+        from app.utils.recalls import import_recalls, refresh_recall_counts
+
+        start = time.perf_counter()
+
+        def progress(counts):
+            written = counts["inserted"] + counts["updated"]
+            click.echo(f"  {written:,} rows written ({time.perf_counter() - start:.1f}s)")
+
+        counts = import_recalls(flat_file, batch_size=batch_size, prune=prune, progress=progress)
+        summary = ", ".join(f"{name}={count:,}" for name, count in counts.items())
+        click.echo(f"Imported recalls: {summary} in {time.perf_counter() - start:.1f}s.")
+
+        if refresh_vehicles:
+            changed = refresh_recall_counts()
+            click.echo(f"Updated recall counts on {changed:,} vehicle(s).")
@@ -1,14 +1,42 @@
+import click
 from flask_sqlalchemy import SQLAlchemy
-from flask_jwt_extended import JWTManager
 from flask_cors import CORS
-from flask_migrate import Migrate
 
-db = SQLAlchemy()
-jwt = JWTManager()
-migrate = Migrate()
+from app.utils.batch import BatchJWTManager
+from app.utils.db_routing import RoutingSession
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+jwt = BatchJWTManager()
+
+
+class MigrateCommands(click.Command):
+    """
+    `flask db ...`, registered on every app. Flask-Migrate pulls in alembic, the
+    slowest import at startup, so it is imported and set up with Migrate(app, db)
+    only when a db command runs, which then gets the arguments as they were given.
+    """
+
+    def __init__(self, app):
+        super().__init__(
+            "db",
+            help="Perform database migrations.",
+            add_help_option=False,
+            context_settings={"ignore_unknown_options": True, "allow_extra_args": True},
+        )
+        self.app = app
+
+    def invoke(self, ctx):
+        from flask_migrate import Migrate
+        from flask_migrate.cli import db as db_cli_group
+
+        if "migrate" not in self.app.extensions:
+            Migrate(self.app, db)
+        with db_cli_group.make_context(ctx.info_name, ctx.args, parent=ctx.parent) as migrate_ctx:
+            return db_cli_group.invoke(migrate_ctx)
+
 
 def init_extensions(app):
     CORS(app, origins=app.config.get("CORS_ORIGINS", []))
     db.init_app(app)
     jwt.init_app(app)
-    migrate.init_app(app, db)
+    app.cli.add_command(MigrateCommands(app))
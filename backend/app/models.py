@@ -5,6 +5,11 @@ class TimestampMixin:
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
+class SoftDeleteMixin:
+    # Set instead of deleting; app.utils.soft_delete hides these rows from every
+    # ORM query and its purge worker hard-deletes them later
+    deleted_at = db.Column(db.DateTime, index=True)
+
 class User(db.Model, TimestampMixin):
     __tablename__ = "users"
 
@@ -13,14 +18,20 @@ class User(db.Model, TimestampMixin):
     last_name = db.Column(db.String(80))
     email = db.Column(db.String(255), unique=True, nullable=False, index=True)
     password_hash = db.Column(db.String(255), nullable=False)
+    # Bumped on profile/password changes; access tokens with an older version are rejected
+    token_version = db.Column(db.Integer, default=1, server_default="1", nullable=False)
+    # Last write to any of the user's vehicles/records/reminders/attachments (see app.utils.sync)
+    sync_changed_at = db.Column(db.DateTime)
 
     vehicles = db.relationship("Vehicle", backref="user", cascade="all, delete-orphan", lazy=True)
 
-class Vehicle(db.Model, TimestampMixin):
+class Vehicle(db.Model, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "vehicles"
 
     __table_args__ = (
         db.UniqueConstraint("user_id", "vin", name="uq_vehicle_user_vin"),
+        db.Index("ix_vehicles_user_id_deleted_at", "user_id", "deleted_at"),
+        db.Index("ix_vehicles_user_id_updated_at", "user_id", "updated_at"),
     )
 
     id = db.Column(db.Integer, primary_key=True)
@@ -42,9 +53,14 @@ class Vehicle(db.Model, TimestampMixin):
     service_records = db.relationship("ServiceRecord", backref="vehicle", cascade="all, delete-orphan", lazy=True)
     reminders = db.relationship("Reminder", backref="vehicle", cascade="all, delete-orphan", lazy=True)
 
-class ServiceRecord(db.Model, TimestampMixin):
+class ServiceRecord(db.Model, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "service_records"
 
+    __table_args__ = (
+        db.Index("ix_service_records_vehicle_id_deleted_at", "vehicle_id", "deleted_at"),
+        db.Index("ix_service_records_vehicle_id_updated_at", "vehicle_id", "updated_at"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     vehicle_id = db.Column(db.Integer, db.ForeignKey("vehicles.id"), nullable=False, index=True)
 
@@ -59,6 +75,10 @@ class ServiceRecord(db.Model, TimestampMixin):
 class ServiceRecordAttachment(db.Model, TimestampMixin):
     __tablename__ = "service_record_attachments"
 
+    __table_args__ = (
+        db.Index("ix_service_record_attachments_record_id_updated_at", "service_record_id", "updated_at"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     service_record_id = db.Column(
         db.Integer,
@@ -80,6 +100,10 @@ class ServiceRecordAttachment(db.Model, TimestampMixin):
 class Reminder(db.Model, TimestampMixin):
     __tablename__ = "reminders"
 
+    __table_args__ = (
+        db.Index("ix_reminders_vehicle_id_updated_at", "vehicle_id", "updated_at"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     vehicle_id = db.Column(db.Integer, db.ForeignKey("vehicles.id"), nullable=False, index=True)
 
@@ -89,3 +113,88 @@ class Reminder(db.Model, TimestampMixin):
 
     is_completed = db.Column(db.Boolean, default=False, nullable=False)
     notes = db.Column(db.Text)
+
+class Tombstone(db.Model):
+    """Deletions reported to /sync clients; pruned after SYNC_TOMBSTONE_RETENTION_DAYS."""
+    __tablename__ = "tombstones"
+
+    __table_args__ = (
+        db.Index("ix_tombstones_user_id_deleted_at", "user_id", "deleted_at"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    entity = db.Column(db.String(40), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+class Job(db.Model, TimestampMixin):
+    """Background work run by the job workers (app.utils.jobs)."""
+    __tablename__ = "jobs"
+
+    __table_args__ = (
+        # Workers claim the oldest due queued job
+        db.Index("ix_jobs_status_run_after", "status", "run_after"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False, index=True)
+    kind = db.Column(db.String(40), nullable=False)
+    status = db.Column(db.String(20), default="queued", nullable=False)
+    payload = db.Column(db.JSON, nullable=False, default=dict)
+    result = db.Column(db.JSON)
+    error = db.Column(db.Text)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    # One job per key, e.g. "vehicle:3:decode_vin:<vin>"; enqueueing again returns it
+    dedupe_key = db.Column(db.String(120), unique=True)
+    run_after = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    locked_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+class RecallCampaign(db.Model):
+    """
+    One row of NHTSA's recall flat file (FLAT_RCL): a campaign's entry for one
+    make/model/year/component. Loaded by `flask import-recalls` (app.utils.recalls).
+    """
+    __tablename__ = "recall_campaigns"
+
+    __table_args__ = (
+        db.Index("ix_recall_campaigns_make_model_year", "make_key", "model_key", "year"),
+    )
+
+    # NHTSA's RECORD_ID, stable across releases of the file
+    record_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    campaign_number = db.Column(db.String(12), nullable=False, index=True)
+    make = db.Column(db.String(50), nullable=False)
+    model = db.Column(db.String(60), nullable=False)
+    # Upper-cased with spaces/punctuation removed (app.utils.recalls.name_key)
+    make_key = db.Column(db.String(50), nullable=False)
+    model_key = db.Column(db.String(60), nullable=False)
+    year = db.Column(db.Integer)
+    component = db.Column(db.String(255))
+    manufacturer = db.Column(db.String(255))
+    report_date = db.Column(db.Date)
+    potentially_affected = db.Column(db.Integer)
+    summary = db.Column(db.Text)
+    consequence = db.Column(db.Text)
+    remedy = db.Column(db.Text)
+    # Hash of the imported fields; re-imports only write rows whose hash changed
+    row_hash = db.Column(db.String(16), nullable=False)
+    imported_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+class SingleFlightCall(db.Model):
+    """
+    Cross-process single-flight lock and short-lived result for one external
+    lookup key (app.utils.single_flight). Written on its own connection, outside
+    the request's transaction.
+    """
+    __tablename__ = "single_flight_calls"
+
+    key = db.Column(db.String(200), primary_key=True)
+    owner = db.Column(db.String(64), nullable=False)
+    # running, done or error
+    status = db.Column(db.String(10), nullable=False)
+    result = db.Column(db.JSON)
+    error = db.Column(db.Text)
+    # While running: when the lock is presumed abandoned; after: when the result goes stale
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
@@ -1,13 +1,34 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
 from app.extensions import db
 from app.models import ServiceRecord, Vehicle, ServiceRecordAttachment
-from app.utils.storage import delete_attachment_file
-import cloudinary.uploader
+from app.utils.admission import admission_controlled
+from app.utils.metrics import external_call
+from app.utils.query_budget import query_budget
+from app.utils.storage import (
+    ATTACHMENT_FOLDER,
+    cloudinary_sdk,
+    delete_attachment_file,
+    delete_stored_file,
+    get_upload_signer,
+    new_public_id,
+    upload_format,
+    upload_resource_type,
+)
+from app.utils.sync import record_deletion
+from app.utils.validation import parse_id_list
 
 
 attachments_bp = Blueprint("attachments", __name__, url_prefix="/service-records")
 
+MAX_BATCH_RECORD_IDS = 200
+ALLOWED_FILES_MESSAGE = "Only JPG, JPEG, PNG, WEBP, and PDF files are allowed."
+
+
+def _upload_grant_serializer():
+    return URLSafeTimedSerializer(current_app.config["SECRET_KEY"], salt="attachment-upload")
+
 
 def attachment_to_dict(a: ServiceRecordAttachment):
     return {
@@ -22,7 +43,89 @@ def attachment_to_dict(a: ServiceRecordAttachment):
     }
 
 
+ATTACHMENT_COLUMNS = (
+    ServiceRecordAttachment.id, ServiceRecordAttachment.service_record_id,
+    ServiceRecordAttachment.file_name, ServiceRecordAttachment.file_url,
+    ServiceRecordAttachment.public_id, ServiceRecordAttachment.file_type,
+    ServiceRecordAttachment.created_at, ServiceRecordAttachment.updated_at,
+)
+
+
+def attachment_row_to_dict(row):
+    """Same output as attachment_to_dict, from ATTACHMENT_COLUMNS."""
+    attachment_id, record_id, file_name, file_url, public_id, file_type, created_at, updated_at = row
+    return {
+        "id": attachment_id,
+        "service_record_id": record_id,
+        "file_name": file_name,
+        "file_url": file_url,
+        "public_id": public_id,
+        "file_type": file_type,
+        "created_at": created_at,
+        "updated_at": updated_at,
+    }
+
+
+def attachments_by_record(record_ids):
+    """
+    Loads attachments for many (already ownership-checked) records with one IN query,
+    grouped by service record id. Records without attachments map to an empty list.
+    """
+    grouped = {record_id: [] for record_id in record_ids}
+    if not grouped:
+        return grouped
+
+    rows = (
+        db.session.query(*ATTACHMENT_COLUMNS)
+        .filter(ServiceRecordAttachment.service_record_id.in_(list(grouped)))
+        .order_by(ServiceRecordAttachment.id)
+        .all()
+    )
+    for row in rows:
+        grouped[row.service_record_id].append(attachment_row_to_dict(row))
+
+    return grouped
+
+
+# READ attachments for many records at once (record_ids=1,2,3 and/or vehicle_id)
+@attachments_bp.get("/attachments")
+@query_budget(3)
+@jwt_required()
+def list_attachments_for_records():
+    user_id = int(get_jwt_identity())
+    vehicle_id = request.args.get("vehicle_id", type=int)
+    record_ids = parse_id_list(request.args.get("record_ids"))
+
+    if record_ids is None:
+        return jsonify({"message": "record_ids must be a comma-separated list of ids."}), 400
+    if not record_ids and not vehicle_id:
+        return jsonify({"message": "Provide record_ids or vehicle_id."}), 400
+    if len(record_ids) > MAX_BATCH_RECORD_IDS:
+        return jsonify({
+            "message": f"At most {MAX_BATCH_RECORD_IDS} record_ids can be requested at once."
+        }), 400
+
+    # Single ownership query for every requested record
+    query = (
+        db.session.query(ServiceRecord.id)
+        .join(Vehicle, ServiceRecord.vehicle_id == Vehicle.id)
+        .filter(Vehicle.user_id == user_id)
+    )
+    if vehicle_id:
+        query = query.filter(ServiceRecord.vehicle_id == vehicle_id)
+    if record_ids:
+        query = query.filter(ServiceRecord.id.in_(record_ids))
+
+    owned_ids = [row.id for row in query.order_by(ServiceRecord.id).all()]
+    grouped = attachments_by_record(owned_ids)
+
+    return jsonify({
+        "attachments": {str(record_id): items for record_id, items in grouped.items()}
+    }), 200
+
+
 @attachments_bp.get("/<int:record_id>/attachments")
+@query_budget(3)
 @jwt_required()
 def list_service_record_attachments(record_id: int):
     user_id = int(get_jwt_identity())
@@ -42,7 +145,9 @@ def list_service_record_attachments(record_id: int):
 
 
 @attachments_bp.post("/<int:record_id>/attachments")
+@query_budget(4)
 @jwt_required()
+@admission_controlled("upload")
 def upload_service_record_attachment(record_id: int):
     user_id = int(get_jwt_identity())
 
@@ -54,7 +159,6 @@ def upload_service_record_attachment(record_id: int):
 
     if not record:
         return jsonify({"message": "Service record not found."}), 404
-    
 
     if "file" not in request.files:
         return jsonify({"message": "No file uploaded."}), 400
@@ -64,22 +168,18 @@ def upload_service_record_attachment(record_id: int):
     if not file or file.filename == "":
         return jsonify({"message": "No file selected."}), 400
 
-    allowed_extensions = {"jpg", "jpeg", "png", "webp", "pdf"}
-    ext = file.filename.rsplit(".", 1)[-1].lower() if "." in file.filename else ""
-
-    if ext not in allowed_extensions:
-        return jsonify({
-            "message": "Only JPG, JPEG, PNG, WEBP, and PDF files are allowed."
-        }), 400
+    resource_type = upload_resource_type(file.filename)
+    if not resource_type:
+        return jsonify({"message": ALLOWED_FILES_MESSAGE}), 400
 
     try:
-        resource_type = "image" if ext in {"jpg", "jpeg", "png", "webp"} else "raw"
-
-        upload_result = cloudinary.uploader.upload(
-            file,
-            folder="servicetrak/service-records",
-            resource_type=resource_type,
-        )
+        cloudinary = cloudinary_sdk()
+        with external_call("cloudinary", "upload"):
+            upload_result = cloudinary.uploader.upload(
+                file,
+                folder=ATTACHMENT_FOLDER,
+                resource_type=resource_type,
+            )
 
         attachment = ServiceRecordAttachment(
             service_record_id=record.id,
@@ -98,11 +198,141 @@ def upload_service_record_attachment(record_id: int):
         }), 201
 
     except Exception as e:
-        print("Cloudinary upload failed:", str(e))
+        current_app.logger.exception("Cloudinary upload failed")
         return jsonify({"message": f"Failed to upload attachment: {str(e)}"}), 502
 
 
+# Direct upload, step 1: issue short-lived signed upload parameters for an owned record
+@attachments_bp.post("/<int:record_id>/attachments/upload-url")
+@query_budget(2)
+@jwt_required()
+def sign_service_record_attachment_upload(record_id: int):
+    user_id = int(get_jwt_identity())
+
+    record = (
+        ServiceRecord.query.join(Vehicle, ServiceRecord.vehicle_id == Vehicle.id)
+        .filter(ServiceRecord.id == record_id, Vehicle.user_id == user_id)
+        .first()
+    )
+
+    if not record:
+        return jsonify({"message": "Service record not found."}), 404
+
+    data = request.get_json(silent=True) or {}
+    file_name = (data.get("file_name") or "").strip()
+    file_type = (data.get("file_type") or "").strip() or None
+
+    if not file_name:
+        return jsonify({"message": "file_name is required."}), 400
+
+    resource_type = upload_resource_type(file_name)
+    if not resource_type:
+        return jsonify({"message": ALLOWED_FILES_MESSAGE}), 400
+
+    public_id = new_public_id(record.id)
+    file_format = upload_format(file_name)
+    signed = get_upload_signer().sign_upload(public_id, resource_type, file_format)
+    upload_token = _upload_grant_serializer().dumps({
+        "user_id": user_id,
+        "record_id": record.id,
+        "public_id": public_id,
+        "resource_type": resource_type,
+        "format": file_format,
+        "max_bytes": current_app.config.get("ATTACHMENT_MAX_BYTES", 10 * 1024 * 1024),
+        "file_name": file_name,
+        "file_type": file_type,
+    })
+
+    return jsonify({
+        "upload_url": signed["upload_url"],
+        "fields": signed["fields"],
+        "upload_token": upload_token,
+        "expires_in": current_app.config.get("ATTACHMENT_UPLOAD_URL_TTL", 600),
+    }), 200
+
+
+# Direct upload, step 2: verify the storage provider's result and record the attachment
+@attachments_bp.post("/<int:record_id>/attachments/confirm")
+@query_budget(5)
+@jwt_required()
+def confirm_service_record_attachment_upload(record_id: int):
+    user_id = int(get_jwt_identity())
+    data = request.get_json(silent=True) or {}
+    result = data.get("result") or {}
+
+    try:
+        grant = _upload_grant_serializer().loads(
+            data.get("upload_token") or "",
+            max_age=current_app.config.get("ATTACHMENT_UPLOAD_URL_TTL", 600),
+        )
+    except SignatureExpired:
+        return jsonify({"message": "Upload grant has expired."}), 400
+    except BadSignature:
+        return jsonify({"message": "Invalid upload grant."}), 400
+
+    if grant.get("user_id") != user_id or grant.get("record_id") != record_id:
+        return jsonify({"message": "Invalid upload grant."}), 400
+
+    record = (
+        ServiceRecord.query.join(Vehicle, ServiceRecord.vehicle_id == Vehicle.id)
+        .filter(ServiceRecord.id == record_id, Vehicle.user_id == user_id)
+        .first()
+    )
+
+    if not record:
+        return jsonify({"message": "Service record not found."}), 404
+
+    if result.get("public_id") != grant["public_id"]:
+        return jsonify({"message": "Upload result does not match the upload grant."}), 400
+
+    signer = get_upload_signer()
+    resource_type = grant["resource_type"]
+    try:
+        stored = signer.verify_upload(result, resource_type)
+    except Exception:
+        stored = None
+    if stored is None:
+        return jsonify({"message": "Upload result signature is invalid."}), 400
+
+    # Cloudinary reports no format for raw files (PDFs); allowed_formats was enforced on upload
+    format_ok = stored["format"] == grant["format"] or (stored["format"] is None and resource_type == "raw")
+    if not format_ok or stored["bytes"] is None or stored["bytes"] > grant["max_bytes"]:
+        try:
+            delete_stored_file(grant["public_id"], resource_type)
+        except Exception:
+            pass
+        return jsonify({"message": "Uploaded file does not match the upload grant."}), 400
+
+    # Confirming the same upload twice returns the existing attachment
+    attachment = ServiceRecordAttachment.query.filter_by(
+        service_record_id=record.id, public_id=grant["public_id"]
+    ).first()
+    if attachment:
+        return jsonify({
+            "message": "Attachment already confirmed.",
+            "attachment": attachment_to_dict(attachment),
+        }), 200
+
+    attachment = ServiceRecordAttachment(
+        service_record_id=record.id,
+        file_name=grant["file_name"],
+        # Built from the verified public_id and version, never the client's URL
+        file_url=signer.file_url(grant["public_id"], result.get("version"), resource_type),
+        public_id=grant["public_id"],
+        file_type=grant.get("file_type"),
+    )
+
+    db.session.add(attachment)
+    db.session.commit()
+
+    return jsonify({
+        "message": "Attachment uploaded successfully.",
+        "attachment": attachment_to_dict(attachment),
+    }), 201
+
+
 @attachments_bp.delete("/attachments/<int:attachment_id>")
+@query_budget(5)
 @jwt_required()
 def delete_service_record_attachment(attachment_id: int):
     user_id = int(get_jwt_identity())
@@ -124,6 +354,7 @@ def delete_service_record_attachment(attachment_id: int):
         pass
 
     db.session.delete(attachment)
+    record_deletion(user_id, "attachment", attachment_id)
     db.session.commit()
 
     return jsonify({"message": "Attachment deleted."}), 200
@@ -1,30 +1,38 @@
 from flask import Blueprint, request, jsonify
-from werkzeug.security import generate_password_hash, check_password_hash
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity
 
 from app.extensions import db
 from app.models import User
+from app.utils.db_routing import pin_to_primary
+from app.utils.identity import (
+    bump_token_version,
+    current_identity,
+    invalidate_identity,
+    issue_access_token,
+    user_identity,
+)
+from app.utils.passwords import PasswordHashUnavailable, hash_password, needs_rehash, verify_password
+from app.utils.query_budget import query_budget
 
 auth_bp = Blueprint("auth", __name__)
 
 
 def _user_to_dict(user: User):
-    return {
-        "id": user.id,
-        "first_name": user.first_name,
-        "last_name": user.last_name,
-        "email": user.email,
-        "created_at": user.created_at.isoformat() if user.created_at else None,
-        "updated_at": user.updated_at.isoformat() if user.updated_at else None,
-    }
+    return user_identity(user)
+
+
+def _hashing_unavailable(e: PasswordHashUnavailable):
+    return jsonify({"message": "Sign-in is busy. Please retry shortly."}), 503, {"Retry-After": str(e.retry_after)}
 
 
 @auth_bp.get("/health")
+@query_budget(0)
 def health():
     return jsonify({"status": "ok", "service": "auth"}), 200
 
 
 @auth_bp.post("/register")
+@query_budget(3)
 def register():
     data = request.get_json(silent=True) or {}
 
@@ -40,16 +48,23 @@ def register():
     if existing:
         return jsonify({"message": "An account with that email already exists."}), 409
 
+    try:
+        password_hash = hash_password(password)
+    except PasswordHashUnavailable as e:
+        return _hashing_unavailable(e)
+
     user = User(
         email=email,
         first_name=first_name or None,
         last_name=last_name or None,
-        password_hash=generate_password_hash(password),
+        password_hash=password_hash,
     )
     db.session.add(user)
     db.session.commit()
+    # The new row may not have reached the replicas when the first token is used
+    pin_to_primary(user.id)
 
-    access_token = create_access_token(identity=str(user.id))
+    access_token = issue_access_token(user)
     return jsonify({
         "message": "Registration successful.",
         "access_token": access_token,
@@ -58,6 +73,7 @@ def register():
 
 
 @auth_bp.post("/login")
+@query_budget(3)
 def login():
     data = request.get_json(silent=True) or {}
 
@@ -68,10 +84,21 @@ def login():
         return jsonify({"message": "Email and password are required."}), 400
 
     user = User.query.filter_by(email=email).first()
-    if not user or not check_password_hash(user.password_hash, password):
-        return jsonify({"message": "Invalid email or password."}), 401
-
-    access_token = create_access_token(identity=str(user.id))
+    try:
+        if not user or not verify_password(user.password_hash, password):
+            return jsonify({"message": "Invalid email or password."}), 401
+    except PasswordHashUnavailable as e:
+        return _hashing_unavailable(e)
+
+    # Transparently upgrade hashes created with older algorithm/cost settings
+    if needs_rehash(user.password_hash):
+        try:
+            user.password_hash = hash_password(password)
+            db.session.commit()
+        except PasswordHashUnavailable:
+            pass  # the password checked out; the upgrade is retried on the next login
+
+    access_token = issue_access_token(user)
     return jsonify({
         "message": "Login successful.",
         "access_token": access_token,
@@ -80,20 +107,22 @@ def login():
 
 
 @auth_bp.get("/profile")
+@query_budget(1)
 @jwt_required()
 def me():
-    user_id = int(get_jwt_identity())
-    user = User.query.get(user_id)
-    if not user:
+    # Served from the identity cache; no database round trip on a warm cache
+    identity = current_identity()
+    if not identity:
         return jsonify({"message": "User not found."}), 404
-    return jsonify({"user": _user_to_dict(user)}), 200
+    return jsonify({"user": identity}), 200
 
 
 @auth_bp.put("/update")
+@query_budget(5)
 @jwt_required()
 def update_me():
     user_id = int(get_jwt_identity())
-    user = User.query.get(user_id)
+    user = db.session.get(User, user_id)
     if not user:
         return jsonify({"message": "User not found."}), 404
 
@@ -116,7 +145,19 @@ def update_me():
 
     # Optional: allow password change
     if "password" in data and data.get("password"):
-        user.password_hash = generate_password_hash(data["password"])
-
+        try:
+            user.password_hash = hash_password(data["password"])
+        except PasswordHashUnavailable as e:
+            return _hashing_unavailable(e)
+
+    # Any profile or password change invalidates previously issued tokens
+    if db.session.is_modified(user):
+        bump_token_version(user)
     db.session.commit()
-    return jsonify({"message": "Profile updated.", "user": _user_to_dict(user)}), 200
+    invalidate_identity(user.id)
+
+    return jsonify({
+        "message": "Profile updated.",
+        "access_token": issue_access_token(user),
+        "user": _user_to_dict(user),
+    }), 200
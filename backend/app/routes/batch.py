@@ -0,0 +1,69 @@
+import time
+
+from flask import Blueprint, current_app, g, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt
+
+from app.utils.batch import SubResponse, dispatch
+from app.utils.query_budget import query_budget
+
+batch_bp = Blueprint("batch", __name__)
+
+BATCH_METHODS = {"GET", "POST", "PUT", "PATCH", "DELETE"}
+
+
+def _validate_subrequest(item):
+    """Returns (method, path, body) or an error message."""
+    if not isinstance(item, dict):
+        return "Each sub-request must be an object with method and path."
+    method = str(item.get("method") or "GET").upper()
+    path = item.get("path")
+    if method not in BATCH_METHODS:
+        return f"Unsupported method {method}."
+    if not isinstance(path, str) or not path.startswith("/") or path.startswith("//"):
+        return "path must be an absolute path such as /vehicles/."
+    if path.split("?", 1)[0].rstrip("/") == request.path.rstrip("/"):
+        return "Batches cannot be nested."
+    return method, path, item.get("body")
+
+
+# Run up to BATCH_MAX_REQUESTS sub-requests ({method, path, body}) in order with the
+# caller's identity; returns their {status, body} in the same order. Each sub-request
+# keeps its own query budget; the batch stops running sub-requests once the total
+# statement count or elapsed time passes BATCH_MAX_QUERIES / BATCH_MAX_SECONDS.
+@batch_bp.post("/batch")
+@query_budget(1)
+@jwt_required()
+def run_batch():
+    data = request.get_json(silent=True) or {}
+    items = data.get("requests")
+    if not isinstance(items, list) or not items:
+        return jsonify({"message": "requests must be a non-empty list."}), 400
+
+    max_requests = current_app.config.get("BATCH_MAX_REQUESTS", 30)
+    if len(items) > max_requests:
+        return jsonify({"message": f"At most {max_requests} sub-requests can be sent in one batch."}), 400
+
+    max_queries = current_app.config.get("BATCH_MAX_QUERIES", 300)
+    deadline = time.monotonic() + current_app.config.get("BATCH_MAX_SECONDS", 10)
+    headers = {"Authorization": request.headers["Authorization"]}
+    g.batch_jwt = (headers["Authorization"].split(" ", 1)[-1], get_jwt())
+
+    responses = []
+    total_queries = 0
+    try:
+        for item in items:
+            if total_queries >= max_queries or time.monotonic() >= deadline:
+                result = SubResponse(429, {"message": "Batch work limit reached; sub-request not run."})
+            else:
+                parsed = _validate_subrequest(item)
+                if isinstance(parsed, str):
+                    result = SubResponse(400, {"message": parsed})
+                else:
+                    method, path, body = parsed
+                    result = dispatch(method, path, body, headers, request.url_root)
+                    total_queries += result.queries
+            responses.append(result.to_dict())
+    finally:
+        g.pop("batch_jwt", None)
+
+    return jsonify({"responses": responses}), 200
@@ -0,0 +1,70 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+
+from app.extensions import db
+from app.models import Job
+from app.utils.db_routing import primary_db
+from app.utils.jobs import FAILED, JOB_KINDS, SUCCEEDED, JobRejected, job_to_dict, wake_workers
+from app.utils.query_budget import query_budget
+
+jobs_bp = Blueprint("jobs", __name__)
+
+
+def _user_job(job_id, user_id):
+    return Job.query.filter_by(id=job_id, user_id=user_id).first()
+
+
+# ENQUEUE a job: {"kind": "decode_vin", ...kind parameters}. Returns 202 with the
+# job; a kind with idempotency returns its existing job instead of a duplicate.
+@jobs_bp.post("/")
+@query_budget(7)
+@jwt_required()
+def enqueue_job():
+    user_id = int(get_jwt_identity())
+    data = request.get_json(silent=True) or {}
+
+    job_kind = JOB_KINDS.get(data.get("kind"))
+    if job_kind is None or job_kind.submit is None:
+        return jsonify({"message": "Unknown job kind."}), 400
+
+    try:
+        job = job_kind.submit(user_id, data)
+    except JobRejected as e:
+        db.session.rollback()
+        return jsonify({"message": str(e)}), e.status
+
+    db.session.commit()
+    wake_workers()
+    return jsonify({"job": job_to_dict(job)}), 202
+
+
+# Job status. Read from the primary: a replica could still report a finished job as queued.
+@jobs_bp.get("/<int:job_id>")
+@query_budget(2)
+@primary_db
+@jwt_required()
+def get_job(job_id: int):
+    job = _user_job(job_id, int(get_jwt_identity()))
+    if not job:
+        return jsonify({"message": "Job not found."}), 404
+    return jsonify({"job": job_to_dict(job)}), 200
+
+
+# Job result: 200 with the result once succeeded, 202 while queued/running, 409 if it failed
+@jobs_bp.get("/<int:job_id>/result")
+@query_budget(2)
+@primary_db
+@jwt_required()
+def get_job_result(job_id: int):
+    job = _user_job(job_id, int(get_jwt_identity()))
+    if not job:
+        return jsonify({"message": "Job not found."}), 404
+
+    if job.status == SUCCEEDED:
+        return jsonify({"job": job_to_dict(job), "result": job.result}), 200
+    if job.status == FAILED:
+        return jsonify({"message": job.error or "Job failed.", "job": job_to_dict(job)}), 409
+
+    response = jsonify({"job": job_to_dict(job)})
+    response.headers["Retry-After"] = "1"
+    return response, 202
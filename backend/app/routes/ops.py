@@ -0,0 +1,50 @@
+from flask import Blueprint, Response, current_app, jsonify
+
+from app.utils.circuit_breaker import OPEN, breaker_states
+from app.utils.metrics import REGISTRY
+from app.utils.query_budget import query_budget
+from app.utils.response_cache import cache_stats
+
+ops_bp = Blueprint("ops", __name__)
+
+
+@ops_bp.get("/health")
+@query_budget(0)
+def health():
+    # An open breaker means NHTSA is down, not this process: still 200, so the
+    # load balancer keeps routing here, with "degraded" for dashboards
+    dependencies = breaker_states()
+    degraded = any(state["state"] == OPEN for state in dependencies.values())
+    return jsonify({
+        "status": "degraded" if degraded else "ok",
+        "service": "servicetrak",
+        "dependencies": dependencies,
+    }), 200
+
+
+# Current admission-control utilization for this worker process
+@ops_bp.get("/admission")
+@query_budget(0)
+def admission():
+    controller = current_app.extensions.get("admission")
+    return jsonify({
+        "enabled": bool(controller) and current_app.config.get("ADMISSION_CONTROL_ENABLED", True),
+        "classes": controller.snapshot() if controller else {},
+    }), 200
+
+
+# Prometheus text exposition of request, SQL and external-call metrics
+@ops_bp.get("/metrics")
+@query_budget(0)
+def metrics():
+    return Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
+
+# Response cache hit rates per endpoint (this worker process's counters)
+@ops_bp.get("/cache")
+@query_budget(0)
+def cache():
+    return jsonify({
+        "backend": current_app.config.get("RESPONSE_CACHE_BACKEND", "off"),
+        "endpoints": cache_stats(),
+    }), 200
@@ -0,0 +1,88 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import func, select
+
+from app.extensions import db
+from app.models import Reminder, ServiceRecord, Vehicle
+from app.routes.reminders import REMINDER_FIELDS
+from app.routes.service_records import SERVICE_RECORD_FIELDS, service_record_rows_to_dicts
+from app.routes.vehicles import VEHICLE_FIELDS
+from app.utils.query_budget import query_budget
+
+overview_bp = Blueprint("overview", __name__)
+
+DEFAULT_OVERVIEW_RECORDS = 10
+MAX_OVERVIEW_RECORDS = 50
+
+# Counters as correlated subqueries, so the vehicle and its counts come back in one row
+COUNT_COLUMNS = {
+    "service_record_count": select(func.count(ServiceRecord.id))
+    .where(ServiceRecord.vehicle_id == Vehicle.id)
+    .scalar_subquery(),
+    "reminder_count": select(func.count(Reminder.id))
+    .where(Reminder.vehicle_id == Vehicle.id)
+    .scalar_subquery(),
+    "open_reminder_count": select(func.count(Reminder.id))
+    .where(Reminder.vehicle_id == Vehicle.id, Reminder.is_completed.is_(False))
+    .scalar_subquery(),
+}
+
+
+# Everything the vehicle detail page needs in one request: the vehicle with its
+# counters and cached recall status, the most recent service records with their
+# attachments, and open reminders. Ownership is checked once, by the first query;
+# the rest filter on the already-verified vehicle id. 4 queries regardless of size.
+@overview_bp.get("/<int:vehicle_id>/overview")
+@query_budget(4)
+@jwt_required()
+def get_vehicle_overview(vehicle_id: int):
+    user_id = int(get_jwt_identity())
+    records_limit = request.args.get("records_limit", DEFAULT_OVERVIEW_RECORDS, type=int)
+    if records_limit < 0 or records_limit > MAX_OVERVIEW_RECORDS:
+        return jsonify({"message": f"records_limit must be between 0 and {MAX_OVERVIEW_RECORDS}."}), 400
+
+    vehicle_selection = VEHICLE_FIELDS.select({"exclude": "counts"})
+    row = (
+        db.session.query(*vehicle_selection.columns, *COUNT_COLUMNS.values())
+        .filter(Vehicle.id == vehicle_id, Vehicle.user_id == user_id)
+        .first()
+    )
+    if not row:
+        return jsonify({"message": "Vehicle not found."}), 404
+
+    vehicle = vehicle_selection.to_dict(row)
+    vehicle.update(zip(COUNT_COLUMNS, row[-len(COUNT_COLUMNS):]))
+    vehicle["open_reminder_count"] = int(vehicle["open_reminder_count"] or 0)
+
+    record_selection = SERVICE_RECORD_FIELDS.select({"include": "attachments", "exclude": "vehicle"})
+    record_rows = []
+    if records_limit:
+        record_rows = (
+            db.session.query(*record_selection.columns)
+            .filter(ServiceRecord.vehicle_id == vehicle_id)
+            .order_by(ServiceRecord.service_date.desc(), ServiceRecord.id.desc())
+            .limit(records_limit)
+            .all()
+        )
+    records = service_record_rows_to_dicts(record_rows, record_selection)
+    for record in records:
+        record["attachment_count"] = len(record["attachments"])
+
+    reminder_selection = REMINDER_FIELDS.select({"exclude": "vehicle"})
+    reminder_rows = (
+        db.session.query(*reminder_selection.columns)
+        .filter(Reminder.vehicle_id == vehicle_id, Reminder.is_completed.is_(False))
+        .order_by(Reminder.due_date.is_(None), Reminder.due_date, Reminder.due_mileage, Reminder.id)
+        .all()
+    )
+
+    return jsonify({
+        "vehicle": vehicle,
+        "service_records": records,
+        "has_more_service_records": vehicle["service_record_count"] > len(records),
+        "open_reminders": [reminder_selection.to_dict(row) for row in reminder_rows],
+        "recalls": {
+            "count": vehicle["recall_count"],
+            "checked_at": vehicle["recall_checked_at"],
+        },
+    }), 200
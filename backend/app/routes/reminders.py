@@ -1,8 +1,14 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy.orm import contains_eager
 
 from app.extensions import db
 from app.models import Reminder, Vehicle
+from app.routes.vehicles import VEHICLE_SUMMARY_COLUMNS
+from app.utils.fieldsets import Fieldset, FieldsetError
+from app.utils.query_budget import query_budget
+from app.utils.response_cache import cached_response
+from app.utils.sync import record_deletion
 from app.utils.validation import parse_date, parse_non_negative_int
 
 reminders_bp = Blueprint("reminders", __name__)
@@ -31,13 +37,32 @@ def reminder_to_dict(r: Reminder):
     }
 
 
+REMINDER_FIELDS = Fieldset(
+    columns={
+        "id": Reminder.id,
+        "vehicle_id": Reminder.vehicle_id,
+        "title": Reminder.title,
+        "due_date": Reminder.due_date,
+        "due_mileage": Reminder.due_mileage,
+        "is_completed": Reminder.is_completed,
+        "notes": Reminder.notes,
+        "created_at": Reminder.created_at,
+        "updated_at": Reminder.updated_at,
+    },
+    joined={"vehicle": VEHICLE_SUMMARY_COLUMNS},
+    default_embeds=("vehicle",),
+)
+
+
 @reminders_bp.get("/health")
+@query_budget(0)
 def health():
     return jsonify({"status": "ok", "service": "reminders"}), 200
 
 
 # CREATE reminder
 @reminders_bp.post("/")
+@query_budget(5)
 @jwt_required()
 def create_reminder():
     user_id = int(get_jwt_identity())
@@ -82,15 +107,26 @@ def create_reminder():
     return jsonify({"message": "Reminder created.", "reminder": reminder_to_dict(reminder)}), 201
 
 
-# READ all reminders (optional filters)
+# READ all reminders (optional filters; fields=; include/exclude=vehicle)
 @reminders_bp.get("/")
+@query_budget(2)
 @jwt_required()
+@cached_response
 def list_reminders():
     user_id = int(get_jwt_identity())
     vehicle_id = request.args.get("vehicle_id", type=int)
     completed = request.args.get("completed")
-
-    query = Reminder.query.join(Vehicle).filter(Vehicle.user_id == user_id)
+    try:
+        selection = REMINDER_FIELDS.select(request.args)
+    except FieldsetError as e:
+        return jsonify({"message": str(e)}), 400
+
+    query = (
+        db.session.query(*selection.columns)
+        .select_from(Reminder)
+        .join(Vehicle, Reminder.vehicle_id == Vehicle.id)
+        .filter(Vehicle.user_id == user_id)
+    )
 
     if vehicle_id:
         query = query.filter(Reminder.vehicle_id == vehicle_id)
@@ -101,31 +137,38 @@ def list_reminders():
         elif completed.lower() == "false":
             query = query.filter(Reminder.is_completed.is_(False))
 
-    reminders = query.order_by(Reminder.created_at.desc()).all()
-    return jsonify({"reminders": [reminder_to_dict(r) for r in reminders]}), 200
+    rows = query.order_by(Reminder.created_at.desc()).all()
+    return jsonify({"reminders": [selection.to_dict(row) for row in rows]}), 200
 
 
 # READ one reminder
 @reminders_bp.get("/<int:reminder_id>")
+@query_budget(2)
 @jwt_required()
 def get_reminder(reminder_id: int):
     user_id = int(get_jwt_identity())
-
-    reminder = (
-        Reminder.query
-        .join(Vehicle)
+    try:
+        selection = REMINDER_FIELDS.select(request.args)
+    except FieldsetError as e:
+        return jsonify({"message": str(e)}), 400
+
+    row = (
+        db.session.query(*selection.columns)
+        .select_from(Reminder)
+        .join(Vehicle, Reminder.vehicle_id == Vehicle.id)
         .filter(Reminder.id == reminder_id, Vehicle.user_id == user_id)
         .first()
     )
 
-    if not reminder:
+    if not row:
         return jsonify({"message": "Reminder not found."}), 404
 
-    return jsonify({"reminder": reminder_to_dict(reminder)}), 200
+    return jsonify({"reminder": selection.to_dict(row)}), 200
 
 
 # UPDATE reminder
 @reminders_bp.put("/<int:reminder_id>")
+@query_budget(6)
 @jwt_required()
 def update_reminder(reminder_id: int):
     user_id = int(get_jwt_identity())
@@ -134,6 +177,7 @@ def update_reminder(reminder_id: int):
     reminder = (
         Reminder.query
         .join(Vehicle)
+        .options(contains_eager(Reminder.vehicle))
         .filter(Reminder.id == reminder_id, Vehicle.user_id == user_id)
         .first()
     )
@@ -178,6 +222,7 @@ def update_reminder(reminder_id: int):
 
 # DELETE reminder
 @reminders_bp.delete("/<int:reminder_id>")
+@query_budget(5)
 @jwt_required()
 def delete_reminder(reminder_id: int):
     user_id = int(get_jwt_identity())
@@ -185,6 +230,7 @@ def delete_reminder(reminder_id: int):
     reminder = (
         Reminder.query
         .join(Vehicle)
+        .options(contains_eager(Reminder.vehicle))
         .filter(Reminder.id == reminder_id, Vehicle.user_id == user_id)
         .first()
     )
@@ -192,5 +238,6 @@ def delete_reminder(reminder_id: int):
         return jsonify({"message": "Reminder not found."}), 404
 
     db.session.delete(reminder)
+    record_deletion(user_id, "reminder", reminder_id)
     db.session.commit()
     return jsonify({"message": "Reminder deleted."}), 200
@@ -1,9 +1,16 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy.orm import contains_eager
 
 from app.extensions import db
 from app.models import ServiceRecord, Vehicle
-from app.utils.storage import delete_attachment_files
+from app.routes.attachments import attachments_by_record
+from app.routes.vehicles import VEHICLE_SUMMARY_COLUMNS
+from app.utils.fieldsets import Fieldset, FieldsetError
+from app.utils.query_budget import query_budget
+from app.utils.response_cache import cached_response
+from app.utils.soft_delete import soft_delete
+from app.utils.sync import record_deletion
 from app.utils.validation import parse_date, parse_non_negative_decimal, parse_non_negative_int
 
 service_records_bp = Blueprint("service_records", __name__)
@@ -33,13 +40,43 @@ def service_record_to_dict(r: ServiceRecord):
     }
 
 
+SERVICE_RECORD_FIELDS = Fieldset(
+    columns={
+        "id": ServiceRecord.id,
+        "vehicle_id": ServiceRecord.vehicle_id,
+        "title": ServiceRecord.title,
+        "category": ServiceRecord.category,
+        "service_date": ServiceRecord.service_date,
+        "mileage": ServiceRecord.mileage,
+        "cost": ServiceRecord.cost,
+        "notes": ServiceRecord.notes,
+        "created_at": ServiceRecord.created_at,
+        "updated_at": ServiceRecord.updated_at,
+    },
+    joined={"vehicle": VEHICLE_SUMMARY_COLUMNS},
+    embeds=("attachments",),
+    default_embeds=("vehicle",),
+)
+
+
+def service_record_rows_to_dicts(rows, selection):
+    items = [selection.to_dict(row) for row in rows]
+    if "attachments" in selection.embeds:
+        grouped = attachments_by_record([item["id"] for item in items])
+        for item in items:
+            item["attachments"] = grouped[item["id"]]
+    return items
+
+
 @service_records_bp.get("/health")
+@query_budget(0)
 def health():
     return jsonify({"status": "ok", "service": "service_records"}), 200
 
 
 # CREATE service record
 @service_records_bp.post("/")
+@query_budget(5)
 @jwt_required()
 def create_service_record():
     user_id = int(get_jwt_identity())
@@ -86,43 +123,61 @@ def create_service_record():
     return jsonify({"message": "Service record created.", "service_record": service_record_to_dict(record)}), 201
 
 
-# READ all service records (optional filters: vehicle_id)
+# READ all service records (optional filters: vehicle_id; fields=; include/exclude=vehicle,attachments)
 @service_records_bp.get("/")
+@query_budget(3)
 @jwt_required()
+@cached_response
 def list_service_records():
     user_id = int(get_jwt_identity())
     vehicle_id = request.args.get("vehicle_id", type=int)
-
-    query = ServiceRecord.query.join(Vehicle).filter(Vehicle.user_id == user_id)
+    try:
+        selection = SERVICE_RECORD_FIELDS.select(request.args)
+    except FieldsetError as e:
+        return jsonify({"message": str(e)}), 400
+
+    query = (
+        db.session.query(*selection.columns)
+        .select_from(ServiceRecord)
+        .join(Vehicle, ServiceRecord.vehicle_id == Vehicle.id)
+        .filter(Vehicle.user_id == user_id)
+    )
 
     if vehicle_id:
         query = query.filter(ServiceRecord.vehicle_id == vehicle_id)
 
-    records = query.order_by(ServiceRecord.service_date.desc()).all()
-    return jsonify({"service_records": [service_record_to_dict(r) for r in records]}), 200
+    rows = query.order_by(ServiceRecord.service_date.desc()).all()
+    return jsonify({"service_records": service_record_rows_to_dicts(rows, selection)}), 200
 
 
 # READ one service record
 @service_records_bp.get("/<int:record_id>")
+@query_budget(2)
 @jwt_required()
 def get_service_record(record_id: int):
     user_id = int(get_jwt_identity())
-
-    record = (
-        ServiceRecord.query
-        .join(Vehicle)
+    try:
+        selection = SERVICE_RECORD_FIELDS.select(request.args)
+    except FieldsetError as e:
+        return jsonify({"message": str(e)}), 400
+
+    row = (
+        db.session.query(*selection.columns)
+        .select_from(ServiceRecord)
+        .join(Vehicle, ServiceRecord.vehicle_id == Vehicle.id)
         .filter(ServiceRecord.id == record_id, Vehicle.user_id == user_id)
         .first()
     )
 
-    if not record:
+    if not row:
         return jsonify({"message": "Service record not found."}), 404
 
-    return jsonify({"service_record": service_record_to_dict(record)}), 200
+    return jsonify({"service_record": service_record_rows_to_dicts([row], selection)[0]}), 200
 
 
 # UPDATE service record
 @service_records_bp.put("/<int:record_id>")
+@query_budget(6)
 @jwt_required()
 def update_service_record(record_id: int):
     user_id = int(get_jwt_identity())
@@ -131,6 +186,7 @@ def update_service_record(record_id: int):
     record = (
         ServiceRecord.query
         .join(Vehicle)
+        .options(contains_eager(ServiceRecord.vehicle))
         .filter(ServiceRecord.id == record_id, Vehicle.user_id == user_id)
         .first()
     )
@@ -181,6 +237,7 @@ def update_service_record(record_id: int):
 
 # DELETE service record
 @service_records_bp.delete("/<int:record_id>")
+@query_budget(5)
 @jwt_required()
 def delete_service_record(record_id: int):
     user_id = int(get_jwt_identity())
@@ -188,13 +245,15 @@ def delete_service_record(record_id: int):
     record = (
         ServiceRecord.query
         .join(Vehicle)
+        .options(contains_eager(ServiceRecord.vehicle))
         .filter(ServiceRecord.id == record_id, Vehicle.user_id == user_id)
         .first()
     )
     if not record:
         return jsonify({"message": "Service record not found."}), 404
 
-    delete_attachment_files(record.attachments)
-    db.session.delete(record)
+    # Attachments and their files go with the record when the purge worker runs
+    soft_delete(record)
+    record_deletion(user_id, "service_record", record.id)
     db.session.commit()
     return jsonify({"message": "Service record deleted."}), 200
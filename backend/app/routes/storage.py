@@ -0,0 +1,69 @@
+import os
+import time
+
+from flask import Blueprint, current_app, jsonify, request, send_file, url_for
+
+from app.utils.query_budget import query_budget
+from app.utils.storage import LocalSigner, local_file_path, storage_backend, upload_format
+
+storage_bp = Blueprint("storage", __name__)
+
+
+# Local stand-in for the Cloudinary upload API (ATTACHMENT_STORAGE=local only)
+@storage_bp.post("/local-upload")
+@query_budget(0)
+def local_upload():
+    if storage_backend() != "local":
+        return jsonify({"message": "Local storage is disabled."}), 404
+
+    signer = LocalSigner()
+    max_age = current_app.config.get("ATTACHMENT_UPLOAD_URL_TTL", 600)
+    if not signer.verify_upload_fields(request.form, max_age):
+        return jsonify({"message": "Invalid or expired upload signature."}), 401
+
+    file = request.files.get("file")
+    if not file or file.filename == "":
+        return jsonify({"message": "No file uploaded."}), 400
+
+    # Like Cloudinary's allowed_formats: the signed format is the only one accepted
+    file_format = upload_format(file.filename)
+    if file_format is None or file_format != request.form.get("allowed_formats"):
+        return jsonify({"message": "File format is not allowed."}), 400
+
+    public_id = request.form["public_id"]
+    try:
+        path = local_file_path(public_id)
+    except ValueError:
+        return jsonify({"message": "Invalid public_id."}), 400
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    file.save(path)
+
+    version = int(time.time())
+    size = os.path.getsize(path)
+    return jsonify({
+        "public_id": public_id,
+        "version": version,
+        "format": file_format,
+        "bytes": size,
+        "signature": signer.sign_result(public_id, version, file_format, size),
+        "resource_type": request.form.get("resource_type"),
+        "secure_url": url_for("storage.local_file", public_id=public_id, _external=True),
+    }), 200
+
+
+@storage_bp.get("/local/<path:public_id>")
+@query_budget(0)
+def local_file(public_id: str):
+    if storage_backend() != "local":
+        return jsonify({"message": "Local storage is disabled."}), 404
+
+    try:
+        path = local_file_path(public_id)
+    except ValueError:
+        return jsonify({"message": "File not found."}), 404
+
+    if not os.path.isfile(path):
+        return jsonify({"message": "File not found."}), 404
+
+    return send_file(path)
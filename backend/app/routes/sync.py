@@ -0,0 +1,119 @@
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+
+from app.extensions import db
+from app.models import Reminder, ServiceRecord, ServiceRecordAttachment, Tombstone, User, Vehicle
+from app.routes.attachments import ATTACHMENT_COLUMNS, attachment_row_to_dict
+from app.routes.reminders import REMINDER_FIELDS
+from app.routes.service_records import SERVICE_RECORD_FIELDS
+from app.routes.vehicles import VEHICLE_FIELDS
+from app.utils.db_routing import primary_db
+from app.utils.query_budget import query_budget
+from app.utils.sync import SyncTokenError, SyncTokenExpired, issue_token, read_token
+
+sync_bp = Blueprint("sync", __name__)
+
+SYNC_ENTITIES = ("vehicles", "service_records", "reminders", "attachments")
+# Tombstone.entity -> response key
+TOMBSTONE_KEYS = {
+    "vehicle": "vehicles",
+    "service_record": "service_records",
+    "reminder": "reminders",
+    "attachment": "attachments",
+}
+
+
+def _changed_rows(user_id, since):
+    """Rows changed after `since` (all live rows when None), each scan on a (parent, updated_at) index."""
+    vehicle_selection = VEHICLE_FIELDS.select({"exclude": "counts"})
+    record_selection = SERVICE_RECORD_FIELDS.select({"exclude": "vehicle"})
+    reminder_selection = REMINDER_FIELDS.select({"exclude": "vehicle"})
+
+    vehicles = db.session.query(*vehicle_selection.columns).filter(Vehicle.user_id == user_id)
+    records = (
+        db.session.query(*record_selection.columns)
+        .join(Vehicle, ServiceRecord.vehicle_id == Vehicle.id)
+        .filter(Vehicle.user_id == user_id)
+    )
+    reminders = (
+        db.session.query(*reminder_selection.columns)
+        .join(Vehicle, Reminder.vehicle_id == Vehicle.id)
+        .filter(Vehicle.user_id == user_id)
+    )
+    attachments = (
+        db.session.query(*ATTACHMENT_COLUMNS)
+        .join(ServiceRecord, ServiceRecordAttachment.service_record_id == ServiceRecord.id)
+        .join(Vehicle, ServiceRecord.vehicle_id == Vehicle.id)
+        .filter(Vehicle.user_id == user_id)
+    )
+
+    if since is not None:
+        vehicles = vehicles.filter(Vehicle.updated_at > since)
+        records = records.filter(ServiceRecord.updated_at > since)
+        reminders = reminders.filter(Reminder.updated_at > since)
+        attachments = attachments.filter(ServiceRecordAttachment.updated_at > since)
+
+    return {
+        "vehicles": [vehicle_selection.to_dict(row) for row in vehicles.order_by(Vehicle.id)],
+        "service_records": [record_selection.to_dict(row) for row in records.order_by(ServiceRecord.id)],
+        "reminders": [reminder_selection.to_dict(row) for row in reminders.order_by(Reminder.id)],
+        "attachments": [attachment_row_to_dict(row) for row in attachments.order_by(ServiceRecordAttachment.id)],
+    }
+
+
+# Delta sync for offline clients. Without ?token= returns every live row; with one,
+# only rows created/updated since the token plus ids deleted since (tombstones).
+# Always returns a new sync_token. An up-to-date client costs one primary key lookup.
+# Read from the primary: the token's watermark is the app clock, so rows a replica
+# hasn't received yet would never be sent.
+@sync_bp.get("/sync")
+@query_budget(6)
+@primary_db
+@jwt_required()
+def sync():
+    user_id = int(get_jwt_identity())
+    started = datetime.utcnow()
+
+    since = None
+    token = request.args.get("token")
+    if token:
+        try:
+            since = read_token(token)
+        except SyncTokenExpired as e:
+            return jsonify({"message": str(e)}), 410
+        except SyncTokenError as e:
+            return jsonify({"message": str(e)}), 400
+
+    deleted = {key: [] for key in SYNC_ENTITIES}
+    if since is not None:
+        changed_at = db.session.query(User.sync_changed_at).filter(User.id == user_id).scalar()
+        if changed_at is not None and changed_at <= since:
+            return jsonify({
+                **{key: [] for key in SYNC_ENTITIES},
+                "deleted": deleted,
+                "full": False,
+                "sync_token": issue_token(started),
+            }), 200
+
+    changes = _changed_rows(user_id, since)
+
+    if since is not None:
+        tombstones = (
+            db.session.query(Tombstone.entity, Tombstone.entity_id)
+            .filter(Tombstone.user_id == user_id, Tombstone.deleted_at > since)
+            .order_by(Tombstone.id)
+        )
+        for entity, entity_id in tombstones:
+            key = TOMBSTONE_KEYS.get(entity)
+            if key is not None:
+                deleted[key].append(entity_id)
+        deleted = {key: list(dict.fromkeys(ids)) for key, ids in deleted.items()}
+
+    return jsonify({
+        **changes,
+        "deleted": deleted,
+        "full": since is None,
+        "sync_token": issue_token(started),
+    }), 200
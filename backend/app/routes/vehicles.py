@@ -1,22 +1,108 @@
 from datetime import datetime
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
+from sqlalchemy import case, func
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.utils.admission import admission_controlled
+from app.utils.circuit_breaker import CircuitOpenError, guarded
+from app.utils.db_routing import primary_db
+from app.utils.fieldsets import Fieldset, FieldsetError
+from app.utils.jobs import JobFailed, JobRejected, enqueue, job_to_dict, register_job_kind, wake_workers
+from app.utils.metrics import external_call
 from app.utils.nhtsa import decode_vin
 from app.extensions import db
-from app.models import Vehicle
-from app.utils.storage import delete_attachment_files
+from app.models import Reminder, ServiceRecord, Vehicle
+from app.utils.query_budget import query_budget
+from app.utils.recalls import lookup_recalls_local, name_key
+from app.utils.response_cache import cached_response, invalidate_user
+from app.utils.single_flight import coalesce
+from app.utils.soft_delete import soft_delete
+from app.utils.sync import record_deletion
 from app.utils.validation import normalize_vin, parse_non_negative_int
-import requests
 
 vehicles_bp = Blueprint("vehicles", __name__)
 
 
-def vehicle_to_dict(v: Vehicle):
-    reminder_count = len(v.reminders) if v.reminders else 0
-    open_reminder_count = len([r for r in v.reminders if not r.is_completed]) if v.reminders else 0
-    service_record_count = len(v.service_records) if v.service_records else 0
+def vehicle_counts(vehicle_ids):
+    """
+    Service record / reminder counters for many vehicles in two grouped queries,
+    instead of lazy-loading both collections for every vehicle.
+    """
+    counts = {
+        vehicle_id: {"service_record_count": 0, "reminder_count": 0, "open_reminder_count": 0}
+        for vehicle_id in vehicle_ids
+    }
+    if not counts:
+        return counts
+
+    record_counts = (
+        db.session.query(ServiceRecord.vehicle_id, func.count(ServiceRecord.id))
+        .filter(ServiceRecord.vehicle_id.in_(list(counts)))
+        .group_by(ServiceRecord.vehicle_id)
+    )
+    for vehicle_id, total in record_counts:
+        counts[vehicle_id]["service_record_count"] = total
+
+    reminder_counts = (
+        db.session.query(
+            Reminder.vehicle_id,
+            func.count(Reminder.id),
+            func.sum(case((Reminder.is_completed.is_(False), 1), else_=0)),
+        )
+        .filter(Reminder.vehicle_id.in_(list(counts)))
+        .group_by(Reminder.vehicle_id)
+    )
+    for vehicle_id, total, open_total in reminder_counts:
+        counts[vehicle_id]["reminder_count"] = total
+        counts[vehicle_id]["open_reminder_count"] = int(open_total or 0)
+
+    return counts
+
+
+# Read endpoints select only the requested columns (?fields=, see app.utils.fieldsets)
+# and serialize straight from Row tuples; the full selection matches vehicle_to_dict.
+VEHICLE_FIELDS = Fieldset(
+    columns={
+        "id": Vehicle.id,
+        "user_id": Vehicle.user_id,
+        "nickname": Vehicle.nickname,
+        "vin": Vehicle.vin,
+        "year": Vehicle.year,
+        "make": Vehicle.make,
+        "model": Vehicle.model,
+        "trim": Vehicle.trim,
+        "engine": Vehicle.engine,
+        "recall_count": func.coalesce(Vehicle.recall_count, 0),
+        "recall_checked_at": Vehicle.recall_checked_at,
+        "created_at": Vehicle.created_at,
+        "updated_at": Vehicle.updated_at,
+    },
+    derived={"is_decoded": (("year", "make", "model"), lambda year, make, model: bool(year and make and model))},
+    embeds=("counts",),
+    default_embeds=("counts",),
+)
+# Nested vehicle on service records and reminders
+VEHICLE_SUMMARY_COLUMNS = {
+    "id": Vehicle.id,
+    "nickname": Vehicle.nickname,
+    "year": Vehicle.year,
+    "make": Vehicle.make,
+    "model": Vehicle.model,
+}
+
+
+def vehicle_rows_to_dicts(rows, selection):
+    items = [selection.to_dict(row) for row in rows]
+    if "counts" in selection.embeds:
+        counts = vehicle_counts([item["id"] for item in items])
+        for item in items:
+            item.update(counts[item["id"]])
+    return items
+
+
+def vehicle_to_dict(v: Vehicle, counts=None):
+    if counts is None:
+        counts = vehicle_counts([v.id])[v.id]
 
-    
     return {
         "id": v.id,
         "user_id": v.user_id,
@@ -27,9 +113,9 @@ def vehicle_to_dict(v: Vehicle):
         "model": v.model,
         "trim": v.trim,
         "engine": v.engine,
-        "service_record_count": service_record_count,
-        "reminder_count": reminder_count,
-        "open_reminder_count": open_reminder_count,
+        "service_record_count": counts["service_record_count"],
+        "reminder_count": counts["reminder_count"],
+        "open_reminder_count": counts["open_reminder_count"],
         "is_decoded": bool(v.year and v.make and v.model),
         "recall_count": getattr(v, "recall_count", 0) or 0,
         "recall_checked_at": (
@@ -42,6 +128,8 @@ def vehicle_to_dict(v: Vehicle):
     }
 
 def lookup_recalls(year, make, model):
+    import requests
+
     url = "https://api.nhtsa.gov/recalls/recallsByVehicle"
     params = {
         "make": make,
@@ -50,8 +138,9 @@ def lookup_recalls(year, make, model):
         "format": "json",
     }
 
-    response = requests.get(url, params=params, timeout=15)
-    response.raise_for_status()
+    with guarded("nhtsa_recalls"), external_call("nhtsa", "recalls"):
+        response = requests.get(url, params=params, timeout=15)
+        response.raise_for_status()
 
     data = response.json()
     results = data.get("results", []) or []
@@ -69,13 +158,69 @@ def lookup_recalls(year, make, model):
 
     return recalls
 
+DECODED_FIELDS = ("year", "make", "model", "trim", "engine")
+
+
+def apply_decoded_vin(vehicle, decoded, overwrite=True):
+    """Copies decoded VIN details onto the vehicle; without overwrite, only fills blank fields."""
+    for field in DECODED_FIELDS:
+        if overwrite or getattr(vehicle, field) in (None, ""):
+            setattr(vehicle, field, decoded.get(field))
+
+
+def enqueue_vin_decode(vehicle, overwrite=True, new_vehicle=False):
+    """Enqueues (at most once per vehicle and VIN) a background decode_vin job for the vehicle."""
+    return enqueue(
+        "decode_vin",
+        vehicle.user_id,
+        {"vehicle_id": vehicle.id, "vin": vehicle.vin, "overwrite": overwrite},
+        dedupe_key=f"vehicle:{vehicle.id}:decode_vin:{vehicle.vin}",
+        check_existing=not new_vehicle,
+    )
+
+
+def _submit_decode_vin_job(user_id, params):
+    vehicle_id = parse_non_negative_int(params.get("vehicle_id"))
+    vehicle = Vehicle.query.filter_by(id=vehicle_id, user_id=user_id).first() if vehicle_id is not None else None
+    if not vehicle:
+        raise JobRejected("Vehicle not found.", 404)
+    if not vehicle.vin:
+        raise JobRejected("No VIN on this vehicle.")
+    return enqueue_vin_decode(vehicle, overwrite=params.get("overwrite", True) is not False)
+
+
+def _run_decode_vin_job(job):
+    payload = job.payload
+    # Decode before loading the vehicle so no transaction is held open across a
+    # remote NHTSA call; request errors propagate and are retried
+    decoded = decode_vin(payload["vin"])
+    if not decoded:
+        raise JobFailed("No data returned from VIN API.")
+
+    vehicle = Vehicle.query.filter_by(id=payload["vehicle_id"], user_id=job.user_id).first()
+    if not vehicle:
+        raise JobFailed("Vehicle not found.")
+    if vehicle.vin != payload["vin"]:
+        raise JobFailed("The vehicle's VIN changed before it was decoded.")
+
+    apply_decoded_vin(vehicle, decoded, overwrite=payload.get("overwrite", True))
+    db.session.flush()
+    return {"decoded": decoded, "vehicle": vehicle_to_dict(vehicle)}
+
+
+register_job_kind("decode_vin", run=_run_decode_vin_job, submit=_submit_decode_vin_job)
+
+
 @vehicles_bp.get("/health")
+@query_budget(0)
 def health():
     return jsonify({"status": "ok", "service": "vehicles"}), 200
 
 
-# CREATE vehicle
+# CREATE vehicle. With "decode_vin": true and a VIN, also enqueues a background
+# decode that fills in blank year/make/model/trim/engine; poll /jobs/<job.id>.
 @vehicles_bp.post("/")
+@query_budget(8)
 @jwt_required()
 def create_vehicle():
     user_id = int(get_jwt_identity())
@@ -106,35 +251,68 @@ def create_vehicle():
         engine=(data.get("engine") or "").strip() or None,
     )
     db.session.add(vehicle)
+
+    job = None
+    if vin and data.get("decode_vin") is True:
+        db.session.flush()
+        job = enqueue_vin_decode(vehicle, overwrite=False, new_vehicle=True)
+        db.session.flush()
+        job = job_to_dict(job)
     db.session.commit()
 
-    return jsonify({"message": "Vehicle created.", "vehicle": vehicle_to_dict(vehicle)}), 201
+    body = {"message": "Vehicle created.", "vehicle": vehicle_to_dict(vehicle)}
+    if job is not None:
+        wake_workers()
+        body["job"] = job
+    return jsonify(body), 201
 
 
-# READ all vehicles for the logged-in user
+# READ all vehicles for the logged-in user (fields=; include/exclude=counts)
 @vehicles_bp.get("/")
+@query_budget(4)
 @jwt_required()
+@cached_response
 def list_vehicles():
     user_id = int(get_jwt_identity())
-    vehicles = Vehicle.query.filter_by(user_id=user_id).order_by(Vehicle.created_at.desc()).all()
-    return jsonify({"vehicles": [vehicle_to_dict(v) for v in vehicles]}), 200
+    try:
+        selection = VEHICLE_FIELDS.select(request.args)
+    except FieldsetError as e:
+        return jsonify({"message": str(e)}), 400
+
+    rows = (
+        db.session.query(*selection.columns)
+        .filter(Vehicle.user_id == user_id)
+        .order_by(Vehicle.created_at.desc())
+        .all()
+    )
+    return jsonify({"vehicles": vehicle_rows_to_dicts(rows, selection)}), 200
 
 
 # READ one vehicle (must belong to user)
 @vehicles_bp.get("/<int:vehicle_id>")
+@query_budget(4)
 @jwt_required()
 def get_vehicle(vehicle_id: int):
     user_id = int(get_jwt_identity())
-    vehicle = Vehicle.query.filter_by(id=vehicle_id, user_id=user_id).first()
-
-    if not vehicle:
+    try:
+        selection = VEHICLE_FIELDS.select(request.args)
+    except FieldsetError as e:
+        return jsonify({"message": str(e)}), 400
+
+    row = (
+        db.session.query(*selection.columns)
+        .filter(Vehicle.id == vehicle_id, Vehicle.user_id == user_id)
+        .first()
+    )
+    if not row:
         return jsonify({"message": "Vehicle not found."}), 404
 
-    return jsonify({"vehicle": vehicle_to_dict(vehicle)}), 200
+    return jsonify({"vehicle": vehicle_rows_to_dicts([row], selection)[0]}), 200
 
 
 # UPDATE vehicle (must belong to user)
 @vehicles_bp.put("/<int:vehicle_id>")
+@query_budget(7)
 @jwt_required()
 def update_vehicle(vehicle_id: int):
     user_id = int(get_jwt_identity())
@@ -185,6 +363,7 @@ def update_vehicle(vehicle_id: int):
 
 # DELETE vehicle (must belong to user)
 @vehicles_bp.delete("/<int:vehicle_id>")
+@query_budget(5)
 @jwt_required()
 def delete_vehicle(vehicle_id: int):
     user_id = int(get_jwt_identity())
@@ -193,15 +372,19 @@ def delete_vehicle(vehicle_id: int):
     if not vehicle:
         return jsonify({"message": "Vehicle not found."}), 404
 
-    for record in vehicle.service_records:
-        delete_attachment_files(record.attachments)
-    db.session.delete(vehicle)
+    # Hides the vehicle and with it its records and reminders; the purge worker
+    # deletes them and their files later. Clearing the VIN lets the user re-add it.
+    soft_delete(vehicle)
+    vehicle.vin = None
+    record_deletion(user_id, "vehicle", vehicle.id)
     db.session.commit()
     return jsonify({"message": "Vehicle deleted."}), 200
 
 #POST Vin decoder
 @vehicles_bp.post("/<int:vehicle_id>/decode-vin")
+@query_budget(6)
 @jwt_required()
+@admission_controlled("nhtsa")
 def decode_vehicle_vin(vehicle_id: int):
     user_id = int(get_jwt_identity())
 
@@ -214,6 +397,8 @@ def decode_vehicle_vin(vehicle_id: int):
 
     try:
         decoded = decode_vin(vehicle.vin)
+    except CircuitOpenError as e:
+        return jsonify({"message": "VIN decoding is temporarily unavailable."}), 503, {"Retry-After": str(e.retry_after)}
     except Exception:
         return jsonify({"message": "Failed to decode VIN."}), 502
 
@@ -221,11 +406,7 @@ def decode_vehicle_vin(vehicle_id: int):
         return jsonify({"message": "No data returned from VIN API."}), 404
 
     # Update vehicle with decoded data
-    vehicle.year = decoded.get("year")
-    vehicle.make = decoded.get("make")
-    vehicle.model = decoded.get("model")
-    vehicle.trim = decoded.get("trim")
-    vehicle.engine = decoded.get("engine")
+    apply_decoded_vin(vehicle, decoded)
 
     db.session.commit()
 
@@ -236,7 +417,9 @@ def decode_vehicle_vin(vehicle_id: int):
 
 # POST VIN decoder (preview - no vehicle needed yet)
 @vehicles_bp.post("/decode")
+@query_budget(1)
 @jwt_required()
+@admission_controlled("nhtsa")
 def decode_vin_preview():
     data = request.get_json(silent=True) or {}
     vin = (data.get("vin") or "").strip().upper()
@@ -248,6 +431,8 @@ def decode_vin_preview():
 
     try:
         decoded = decode_vin(vin)
+    except CircuitOpenError as e:
+        return jsonify({"message": "VIN decoding is temporarily unavailable."}), 503, {"Retry-After": str(e.retry_after)}
     except Exception:
         return jsonify({"message": "Failed to decode VIN."}), 502
 
@@ -258,7 +443,10 @@ def decode_vin_preview():
     return jsonify({"decoded": decoded}), 200
 
 @vehicles_bp.get("/<int:vehicle_id>/recalls")
+@query_budget(5)
+@primary_db
 @jwt_required()
+@admission_controlled("nhtsa")
 def get_vehicle_recalls(vehicle_id: int):
     user_id = int(get_jwt_identity())
 
@@ -271,21 +459,46 @@ def get_vehicle_recalls(vehicle_id: int):
             "message": "Vehicle must have year, make, and model before checking recalls."
         }), 400
 
+    # Read before the commit expires the vehicle
+    summary = {"id": vehicle.id, "year": vehicle.year, "make": vehicle.make, "model": vehicle.model}
+    source = current_app.config.get("RECALLS_SOURCE", "remote")
     try:
-        recalls = lookup_recalls(vehicle.year, vehicle.make, vehicle.model)
+        if source == "local":
+            # recall_campaigns from `flask import-recalls`: one indexed query, no NHTSA call
+            recalls = lookup_recalls_local(vehicle.year, vehicle.make, vehicle.model)
+        else:
+            year, make, model = vehicle.year, vehicle.make, vehicle.model
+            # Owners of the same year/make/model checking at once share one NHTSA call
+            recalls = coalesce(
+                "recalls",
+                f"{year}:{name_key(make)}:{name_key(model)}",
+                lambda: lookup_recalls(year, make, model),
+            )
         vehicle.recall_count = len(recalls)
         vehicle.recall_checked_at = datetime.utcnow()
         db.session.commit()
+        # recall_count shows up in the cached vehicle list
+        invalidate_user(user_id)
+    except CircuitOpenError as e:
+        # NHTSA is known to be down: answer now, with the last count if there is one
+        headers = {"Retry-After": str(e.retry_after)}
+        if vehicle.recall_checked_at is None:
+            return jsonify({"message": "Recall lookups are temporarily unavailable."}), 503, headers
+        return jsonify({
+            "vehicle": summary,
+            "count": vehicle.recall_count,
+            "recalls": [],
+            "source": "cached",
+            "stale": True,
+            "recall_checked_at": vehicle.recall_checked_at.isoformat(),
+        }), 200, headers
     except Exception:
         return jsonify({"message": "Failed to fetch recalls."}), 502
 
     return jsonify({
-        "vehicle": {
-            "id": vehicle.id,
-            "year": vehicle.year,
-            "make": vehicle.make,
-            "model": vehicle.model,
-        },
+        "vehicle": summary,
         "count": len(recalls),
         "recalls": recalls,
+        "source": source,
+        "stale": False,
     }), 200
@@ -0,0 +1,158 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, jsonify
+from flask_jwt_extended import get_jwt_identity
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self):
+        """
+        Takes one token. Returns 0 when granted, otherwise the seconds until a
+        token becomes available.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate if self.rate > 0 else 60
+
+
+class AdmissionController:
+    """
+    Per-process admission control for expensive endpoint classes: a concurrency
+    cap per class plus a token bucket per (class, user). Requests that cannot be
+    admitted are rejected immediately instead of queuing behind busy workers.
+    """
+
+    def __init__(self, limits, user_rates, retry_after=1, max_buckets=10000):
+        self.limits = dict(limits)
+        self.user_rates = dict(user_rates)
+        self.retry_after = retry_after
+        self.max_buckets = max_buckets
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()
+        self._stats = {}
+
+    def _class_stats(self, endpoint_class):
+        stats = self._stats.get(endpoint_class)
+        if stats is None:
+            stats = self._stats[endpoint_class] = {
+                "in_flight": 0,
+                "peak_in_flight": 0,
+                "admitted": 0,
+                "rejected_saturated": 0,
+                "rejected_rate_limited": 0,
+            }
+        return stats
+
+    def _bucket(self, endpoint_class, user_id):
+        rate = self.user_rates.get(endpoint_class)
+        if not rate or user_id is None:
+            return None
+
+        key = (endpoint_class, user_id)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(*rate)
+            while len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def try_acquire(self, endpoint_class, user_id=None):
+        """
+        Returns None when admitted (the caller must release), otherwise a
+        (status_code, retry_after_seconds) rejection.
+        """
+        with self._lock:
+            stats = self._class_stats(endpoint_class)
+            limit = self.limits.get(endpoint_class)
+
+            if limit is not None and stats["in_flight"] >= limit:
+                stats["rejected_saturated"] += 1
+                return 503, self.retry_after
+
+            bucket = self._bucket(endpoint_class, user_id)
+            wait = bucket.take() if bucket else 0
+            if wait:
+                stats["rejected_rate_limited"] += 1
+                return 429, max(1, math.ceil(wait))
+
+            stats["in_flight"] += 1
+            stats["admitted"] += 1
+            stats["peak_in_flight"] = max(stats["peak_in_flight"], stats["in_flight"])
+            return None
+
+    def release(self, endpoint_class):
+        with self._lock:
+            stats = self._class_stats(endpoint_class)
+            stats["in_flight"] = max(0, stats["in_flight"] - 1)
+
+    def snapshot(self):
+        with self._lock:
+            classes = set(self.limits) | set(self.user_rates) | set(self._stats)
+            snapshot = {}
+            for endpoint_class in sorted(classes):
+                stats = dict(self._class_stats(endpoint_class))
+                limit = self.limits.get(endpoint_class)
+                stats["limit"] = limit
+                stats["utilization"] = (
+                    round(stats["in_flight"] / limit, 3) if limit else None
+                )
+                snapshot[endpoint_class] = stats
+            return snapshot
+
+
+def init_admission(app):
+    app.extensions["admission"] = AdmissionController(
+        limits=app.config.get("ADMISSION_LIMITS", {}),
+        user_rates=app.config.get("ADMISSION_USER_RATES", {}),
+        retry_after=app.config.get("ADMISSION_RETRY_AFTER", 1),
+    )
+
+
+def admission_controlled(endpoint_class):
+    """
+    Fails fast with 503 (class saturated) or 429 (user over their rate) plus
+    Retry-After. Apply below @jwt_required() so the caller's identity is known.
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            controller = current_app.extensions.get("admission")
+            if controller is None or not current_app.config.get("ADMISSION_CONTROL_ENABLED", True):
+                return fn(*args, **kwargs)
+
+            rejection = controller.try_acquire(endpoint_class, get_jwt_identity())
+            if rejection:
+                status, retry_after = rejection
+                message = (
+                    "Too many requests. Please retry shortly."
+                    if status == 429
+                    else "Service is busy. Please retry shortly."
+                )
+                return jsonify({"message": message}), status, {"Retry-After": str(retry_after)}
+
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                controller.release(endpoint_class)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,84 @@
+"""
+Internal dispatch for POST /batch.
+
+Each sub-request runs through the normal Flask pipeline (URL map, before/after
+request hooks, query budgets, response cache invalidation) in its own request
+context. Pushing a request context inside the batch's app context reuses that
+app context, so sub-requests share `g` and the Flask-SQLAlchemy session with
+the batch request. The batch's already-verified access token is handed to
+sub-requests through BatchJWTManager instead of being decoded again.
+"""
+from flask import current_app, g, has_request_context
+from flask_jwt_extended import JWTManager
+from werkzeug.test import EnvironBuilder
+
+
+class BatchJWTManager(JWTManager):
+    """JWTManager that reuses the batch request's decoded token for its sub-requests."""
+
+    def _decode_jwt_from_config(self, encoded_token, csrf_value=None, allow_expired=False):
+        shared = g.get("batch_jwt") if has_request_context() else None
+        if shared is not None and shared[0] == encoded_token:
+            return dict(shared[1])
+        return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+
+
+class SubResponse:
+    __slots__ = ("status", "body", "queries")
+
+    def __init__(self, status, body, queries=0):
+        self.status = status
+        self.body = body
+        self.queries = queries
+
+    def to_dict(self):
+        return {"status": self.status, "body": self.body}
+
+
+def _response_body(response):
+    if response.direct_passthrough:
+        return None
+    if response.is_json:
+        return response.get_json(silent=True)
+    data = response.get_data(as_text=True)
+    return data or None
+
+
+def dispatch(method, path, body, headers, base_url):
+    """
+    Runs one sub-request and returns a SubResponse. Errors become 500
+    sub-responses (after rolling back the shared session) unless the app
+    propagates exceptions, as in tests.
+    """
+    from app.extensions import db
+
+    outer_stats = g.get("_request_stats")
+    builder = EnvironBuilder(
+        path=path,
+        base_url=base_url,
+        method=method,
+        json=body,
+        headers=headers,
+    )
+    try:
+        with current_app.request_context(builder.get_environ()):
+            try:
+                response = current_app.full_dispatch_request()
+            except Exception as e:
+                response = current_app.make_response(current_app.handle_exception(e))
+            try:
+                stats = g.get("_request_stats")
+                result = SubResponse(
+                    response.status_code,
+                    _response_body(response),
+                    stats.queries if stats is not None and stats is not outer_stats else 0,
+                )
+            finally:
+                response.close()
+    finally:
+        builder.close()
+        g._request_stats = outer_stats
+
+    if result.status >= 500:
+        db.session.rollback()
+    return result
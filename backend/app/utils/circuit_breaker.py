@@ -0,0 +1,242 @@
+"""
+Circuit breakers for external dependencies (the NHTSA APIs).
+
+Each breaker keeps a rolling window of the last CIRCUIT_BREAKER_WINDOW_SECONDS
+of calls in one-second buckets. Once the window holds CIRCUIT_BREAKER_MIN_CALLS
+calls and either the share that failed reaches CIRCUIT_BREAKER_ERROR_RATE or the
+share slower than CIRCUIT_BREAKER_SLOW_CALL_SECONDS reaches
+CIRCUIT_BREAKER_SLOW_CALL_RATE, the breaker opens: calls raise CircuitOpenError
+at once instead of waiting out a 10-15 s timeout. After
+CIRCUIT_BREAKER_OPEN_SECONDS it goes half-open and lets
+CIRCUIT_BREAKER_HALF_OPEN_PROBES calls through. If they all succeed quickly it
+closes with an empty window. If one of them fails or is slow it opens again.
+
+State is per worker process, like admission control. /health reports it and
+/metrics exports servicetrak_circuit_breaker_state and transition counts.
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from flask import current_app, has_app_context
+
+from app.utils.metrics import REGISTRY
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+BREAKER_TRANSITIONS = REGISTRY.counter(
+    "servicetrak_circuit_breaker_transitions_total",
+    "Circuit breaker state changes by breaker and new state.",
+    ("breaker", "state"),
+)
+BREAKER_REJECTIONS = REGISTRY.counter(
+    "servicetrak_circuit_breaker_rejections_total",
+    "Calls failed fast because the breaker was open (or half-open with its probes in flight).",
+    ("breaker",),
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose breaker is open."""
+
+    def __init__(self, breaker, retry_after):
+        super().__init__(f"{breaker} is unavailable; retry in {retry_after}s.")
+        self.breaker = breaker
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name,
+        window_seconds=60,
+        min_calls=10,
+        error_rate=0.5,
+        slow_call_seconds=5.0,
+        slow_call_rate=0.5,
+        open_seconds=30,
+        half_open_probes=1,
+        clock=time.monotonic,
+    ):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.clock = clock
+        self.state = CLOSED
+        self.opened_at = None
+        self.opened_count = 0
+        self._buckets = deque()  # [second, calls, failures, slow]
+        self._probes = 0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+
+    def _transition(self, state):
+        self.state = state
+        if state == OPEN:
+            self.opened_at = self.clock()
+            self.opened_count += 1
+        elif state == HALF_OPEN:
+            self._probes = 0
+            self._probe_successes = 0
+        else:
+            self._buckets.clear()
+        BREAKER_TRANSITIONS.inc(breaker=self.name, state=state)
+
+    def _trim(self, now):
+        cutoff = int(now) - self.window_seconds
+        while self._buckets and self._buckets[0][0] <= cutoff:
+            self._buckets.popleft()
+
+    def _totals(self):
+        calls = failures = slow = 0
+        for _, bucket_calls, bucket_failures, bucket_slow in self._buckets:
+            calls += bucket_calls
+            failures += bucket_failures
+            slow += bucket_slow
+        return calls, failures, slow
+
+    def _retry_after(self, now):
+        return max(1, round(self.opened_at + self.open_seconds - now))
+
+    def acquire(self):
+        """Raises CircuitOpenError unless a call may go ahead; the caller must then record() it."""
+        with self._lock:
+            now = self.clock()
+            if self.state == OPEN:
+                if now - self.opened_at < self.open_seconds:
+                    BREAKER_REJECTIONS.inc(breaker=self.name)
+                    raise CircuitOpenError(self.name, self._retry_after(now))
+                self._transition(HALF_OPEN)
+            if self.state == HALF_OPEN:
+                if self._probes >= self.half_open_probes:
+                    BREAKER_REJECTIONS.inc(breaker=self.name)
+                    raise CircuitOpenError(self.name, 1)
+                self._probes += 1
+
+    def record(self, ok, elapsed):
+        slow = elapsed >= self.slow_call_seconds
+        with self._lock:
+            now = self.clock()
+            if self.state == HALF_OPEN:
+                if not ok or slow:
+                    self._transition(OPEN)
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.half_open_probes:
+                        self._transition(CLOSED)
+                return
+            if self.state == OPEN:
+                # A call admitted before the breaker opened
+                return
+
+            second = int(now)
+            if self._buckets and self._buckets[-1][0] == second:
+                bucket = self._buckets[-1]
+            else:
+                bucket = [second, 0, 0, 0]
+                self._buckets.append(bucket)
+            bucket[1] += 1
+            bucket[2] += 0 if ok else 1
+            bucket[3] += 1 if slow else 0
+            self._trim(now)
+
+            calls, failures, slow_calls = self._totals()
+            if calls >= self.min_calls and (
+                failures / calls >= self.error_rate or slow_calls / calls >= self.slow_call_rate
+            ):
+                self._transition(OPEN)
+
+    def snapshot(self):
+        with self._lock:
+            now = self.clock()
+            self._trim(now)
+            calls, failures, slow = self._totals()
+            return {
+                "state": self.state,
+                "window_calls": calls,
+                "window_failures": failures,
+                "window_slow_calls": slow,
+                "opened_count": self.opened_count,
+                "retry_after": self._retry_after(now) if self.state == OPEN else None,
+            }
+
+
+# Created at startup so /health and /metrics list them before their first call
+KNOWN_BREAKERS = ("nhtsa_vpic", "nhtsa_recalls")
+
+
+def _new_breaker(name, config):
+    return CircuitBreaker(
+        name,
+        window_seconds=config.get("CIRCUIT_BREAKER_WINDOW_SECONDS", 60),
+        min_calls=config.get("CIRCUIT_BREAKER_MIN_CALLS", 10),
+        error_rate=config.get("CIRCUIT_BREAKER_ERROR_RATE", 0.5),
+        slow_call_seconds=config.get("CIRCUIT_BREAKER_SLOW_CALL_SECONDS", 5.0),
+        slow_call_rate=config.get("CIRCUIT_BREAKER_SLOW_CALL_RATE", 0.5),
+        open_seconds=config.get("CIRCUIT_BREAKER_OPEN_SECONDS", 30),
+        half_open_probes=config.get("CIRCUIT_BREAKER_HALF_OPEN_PROBES", 1),
+    )
+
+
+def init_circuit_breakers(app):
+    app.extensions["circuit_breakers"] = {name: _new_breaker(name, app.config) for name in KNOWN_BREAKERS}
+
+
+def breaker(name):
+    """The app's breaker for `name`, created from CIRCUIT_BREAKER_* settings on first use."""
+    breakers = current_app.extensions.setdefault("circuit_breakers", {})
+    found = breakers.get(name)
+    if found is None:
+        found = breakers.setdefault(name, _new_breaker(name, current_app.config))
+    return found
+
+
+@contextmanager
+def guarded(name):
+    """
+    Runs the block through the named breaker: raises CircuitOpenError without
+    running it while the breaker is open, otherwise records its outcome and duration.
+    """
+    if not current_app.config.get("CIRCUIT_BREAKER_ENABLED", True):
+        yield
+        return
+
+    circuit = breaker(name)
+    circuit.acquire()
+    start = time.monotonic()
+    ok = False
+    try:
+        yield
+        ok = True
+    finally:
+        circuit.record(ok, time.monotonic() - start)
+
+
+def breaker_states():
+    """{name: snapshot} for this worker process's breakers."""
+    breakers = current_app.extensions.get("circuit_breakers", {})
+    return {name: circuit.snapshot() for name, circuit in sorted(breakers.items())}
+
+
+def _state_samples():
+    if not has_app_context():
+        return []
+    return [
+        ({"breaker": name}, STATE_VALUES[snapshot["state"]])
+        for name, snapshot in breaker_states().items()
+    ]
+
+
+REGISTRY.gauge(
+    "servicetrak_circuit_breaker_state",
+    "Circuit breaker state: 0 closed, 1 half-open, 2 open.",
+    ("breaker",),
+    callback=_state_samples,
+)
@@ -0,0 +1,172 @@
+"""
+Negotiated response compression (gzip always; br and zstd when the optional
+`brotli` / `zstandard` packages are installed).
+
+Responses are compressed in an after_request hook when the client accepts a
+supported encoding, the mimetype is compressible text and the body is at least
+COMPRESSION_MIN_SIZE bytes. Streamed responses are compressed chunk by chunk
+with a sync flush so they keep streaming. send_file responses (attachments) and
+anything that already has a Content-Encoding are left alone.
+"""
+import zlib
+
+from flask import request
+
+from app.utils.metrics import REGISTRY
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+COMPRESSION_BYTES = REGISTRY.counter(
+    "servicetrak_response_compression_bytes_total",
+    "Response body bytes before (identity) and after compression, by encoding.",
+    ("encoding", "stage"),
+)
+
+
+class _GzipStream:
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, chunk):
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliStream:
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, chunk):
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class _ZstdStream:
+    def __init__(self, level):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, chunk):
+        return self._compressor.compress(chunk) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+def _gzip(data, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+# encoding -> (one-shot compress(data, level), stream class), in server preference order
+ENCODERS = {}
+if brotli is not None:
+    ENCODERS["br"] = (lambda data, level: brotli.compress(data, quality=level), _BrotliStream)
+if zstandard is not None:
+    ENCODERS["zstd"] = (lambda data, level: zstandard.ZstdCompressor(level=level).compress(data), _ZstdStream)
+ENCODERS["gzip"] = (_gzip, _GzipStream)
+
+DEFAULT_LEVELS = {"gzip": 6, "br": 4, "zstd": 3}
+
+
+def parse_accept_encoding(header):
+    """Returns {encoding: q} from an Accept-Encoding header."""
+    accepted = {}
+    for part in (header or "").split(","):
+        token, _, params = part.strip().partition(";")
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[token.strip().lower()] = q
+    return accepted
+
+
+def choose_encoding(header, available=None):
+    """Picks the client's highest-q encoding we support; ties go to server preference."""
+    accepted = parse_accept_encoding(header)
+    best, best_q = None, 0.0
+    for encoding in available or ENCODERS:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress_body(data, encoding, level):
+    return ENCODERS[encoding][0](data, level)
+
+
+def _compress_stream(iterable, stream, encoding):
+    for chunk in iterable:
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        COMPRESSION_BYTES.inc(len(chunk), encoding=encoding, stage="identity")
+        out = stream.compress(chunk)
+        if out:
+            COMPRESSION_BYTES.inc(len(out), encoding=encoding, stage="compressed")
+            yield out
+    out = stream.finish()
+    COMPRESSION_BYTES.inc(len(out), encoding=encoding, stage="compressed")
+    yield out
+
+
+def init_compression(app):
+    if not app.config.get("COMPRESSION_ENABLED", True):
+        return
+
+    available = [e for e in app.config.get("COMPRESSION_ENCODINGS", list(ENCODERS)) if e in ENCODERS]
+    levels = {**DEFAULT_LEVELS, **app.config.get("COMPRESSION_LEVELS", {})}
+    min_size = app.config.get("COMPRESSION_MIN_SIZE", 1024)
+    mimetypes = set(app.config.get("COMPRESSION_MIMETYPES", ("application/json", "text/plain")))
+
+    @app.after_request
+    def _compress_response(response):
+        if response.mimetype not in mimetypes or response.direct_passthrough:
+            return response
+        response.vary.add("Accept-Encoding")
+
+        if (
+            response.status_code < 200
+            or response.status_code in (204, 304)
+            or "Content-Encoding" in response.headers
+            or request.method == "HEAD"
+        ):
+            return response
+
+        encoding = choose_encoding(request.headers.get("Accept-Encoding"), available)
+        if encoding is None:
+            return response
+
+        level = levels[encoding]
+        if response.is_streamed:
+            stream = ENCODERS[encoding][1](level)
+            response.response = _compress_stream(response.response, stream, encoding)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < min_size:
+                return response
+            compressed = compress_body(data, encoding, level)
+            COMPRESSION_BYTES.inc(len(data), encoding=encoding, stage="identity")
+            COMPRESSION_BYTES.inc(len(compressed), encoding=encoding, stage="compressed")
+            response.set_data(compressed)
+
+        response.headers["Content-Encoding"] = encoding
+        return response
@@ -0,0 +1,161 @@
+"""
+Read routing for the Flask-SQLAlchemy session.
+
+GET/HEAD requests read from a replica (DATABASE_REPLICA_URLS) or, for SQLite
+production mode, from the local read-only pool. Everything else, flushes, and
+GET views marked @primary_db use the primary. After a user writes, their
+reads stay on the primary for REPLICA_PIN_SECONDS so they see their own writes
+despite replication lag. With RESPONSE_CACHE_BACKEND=resp the pins are kept in
+that shared backend, so a write on one worker pins reads on every worker;
+otherwise they only hold within the worker process that saw the write.
+"""
+import random
+import threading
+import time
+
+import jwt as pyjwt
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event
+
+from app.utils.response_cache import shared_backend
+
+READ_METHODS = {"GET", "HEAD"}
+
+
+def primary_db(fn):
+    """Marks a GET view that writes, so its session stays on the primary connection."""
+    fn.use_primary_db = True
+    return fn
+
+
+class PrimaryPins:
+    """
+    Map of user id -> time until which their reads go to the primary: in this
+    process, and in the shared backend when there is one.
+    """
+
+    def __init__(self, window, backend=None, prefix="servicetrak"):
+        self.window = window
+        self.backend = backend
+        self.prefix = prefix
+        self._until = {}
+        self._lock = threading.Lock()
+
+    def _key(self, user_id):
+        return f"{self.prefix}:pin:{user_id}"
+
+    def pin(self, user_id):
+        with self._lock:
+            now = time.monotonic()
+            self._until[user_id] = now + self.window
+            if len(self._until) > 10000:
+                self._until = {uid: t for uid, t in self._until.items() if t > now}
+        if self.backend is not None:
+            try:
+                self.backend.set(self._key(user_id), b"1", max(self.window, 0.001))
+            except Exception:
+                current_app.logger.exception("Failed to share the primary pin for user %s", user_id)
+
+    def is_pinned(self, user_id):
+        until = self._until.get(user_id)
+        if until is not None and until > time.monotonic():
+            return True
+        if self.backend is None:
+            return False
+        try:
+            return self.backend.get(self._key(user_id)) is not None
+        except Exception:
+            # Can't tell: the primary is always up to date
+            return True
+
+
+def pin_to_primary(user_id):
+    """Pins a user who wrote without a bearer token (e.g. just registered) to the primary."""
+    pins = current_app.extensions.get("primary_pins")
+    if pins is not None:
+        pins.pin(str(user_id))
+
+
+def request_user_id():
+    """
+    User id from the bearer token, decoded without verification: it only picks
+    a connection, and runs before flask-jwt-extended has verified the token.
+    """
+    if "db_routing_user_id" not in g:
+        user_id = None
+        header = request.headers.get("Authorization", "")
+        if header.startswith("Bearer "):
+            try:
+                user_id = str(pyjwt.decode(header[7:], options={"verify_signature": False}).get("sub"))
+            except pyjwt.PyJWTError:
+                pass
+        g.db_routing_user_id = user_id
+    return g.db_routing_user_id
+
+
+def read_engine_for_request():
+    """The engine GET statements should use for the current request, or None for the primary."""
+    if not has_request_context() or request.method not in READ_METHODS:
+        return None
+
+    replicas = current_app.extensions.get("replica_engines")
+    if replicas:
+        pins = current_app.extensions["primary_pins"]
+        user_id = request_user_id()
+        if user_id is not None and pins.is_pinned(user_id):
+            return None
+        if "db_replica" not in g:
+            g.db_replica = random.choice(replicas)
+        engine = g.db_replica
+    else:
+        engine = current_app.extensions.get("read_engine")
+
+    if engine is None:
+        return None
+    view = current_app.view_functions.get(request.endpoint)
+    if getattr(view, "use_primary_db", False):
+        return None
+    return engine
+
+
+class RoutingSession(Session):
+    """Sends reads issued while handling GET/HEAD requests to a read engine; flushes go to the primary."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing:
+            engine = read_engine_for_request()
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _record_write(session, flush_context):
+    if has_request_context():
+        g.db_wrote = True
+
+
+def init_db_routing(app):
+    urls = app.config.get("DATABASE_REPLICA_URLS") or []
+    if not urls:
+        return
+
+    options = app.config.get("DATABASE_REPLICA_ENGINE_OPTIONS", {})
+    app.extensions["replica_engines"] = [create_engine(url, **options) for url in urls]
+    app.extensions["primary_pins"] = PrimaryPins(
+        app.config.get("REPLICA_PIN_SECONDS", 5), backend=shared_backend(app)
+    )
+
+    @app.before_request
+    def _reset_routing_state():
+        for key in ("db_routing_user_id", "db_replica", "db_wrote"):
+            g.pop(key, None)
+
+    @app.after_request
+    def _pin_writers_to_primary(response):
+        if g.get("db_wrote") and response.status_code < 400:
+            user_id = request_user_id()
+            if user_id is not None:
+                current_app.extensions["primary_pins"].pin(user_id)
+        return response
@@ -0,0 +1,99 @@
+"""
+Sparse fieldsets for read endpoints.
+
+    ?fields=id,title,due_date   only these columns are selected (id is always returned)
+    ?include=attachments        embed a nested object / counter group
+    ?exclude=vehicle            drop an embed that is on by default
+
+Without `fields`, every column and the resource's default embeds are returned.
+With `fields`, embeds are only returned when named in `fields` or `include`.
+"""
+
+
+class FieldsetError(ValueError):
+    pass
+
+
+def _split(value):
+    return [part.strip() for part in (value or "").split(",") if part.strip()]
+
+
+class Fieldset:
+    """
+    columns: output name -> column expression, in output order.
+    derived: output name -> (dependency column names, fn(*values)).
+    joined:  embed name -> {output name -> column} selected in the same query.
+    embeds:  embed names the view loads itself after the query (counters, attachments).
+    """
+
+    def __init__(self, columns, derived=None, joined=None, embeds=(), default_embeds=()):
+        self.columns = dict(columns)
+        self.derived = dict(derived or {})
+        self.joined = dict(joined or {})
+        self.embeds = set(embeds) | set(self.joined)
+        self.default_embeds = set(default_embeds)
+
+    def select(self, args):
+        """Parses fields/include/exclude from request args. Raises FieldsetError on unknown names."""
+        fields = _split(args.get("fields"))
+        include = set(_split(args.get("include")))
+        exclude = set(_split(args.get("exclude")))
+
+        scalar_names = set(self.columns) | set(self.derived)
+        unknown = sorted({name for name in fields if name not in scalar_names | self.embeds})
+        if unknown:
+            raise FieldsetError(f"Unknown field(s): {', '.join(unknown)}.")
+        unknown = sorted((include | exclude) - self.embeds)
+        if unknown:
+            raise FieldsetError(
+                f"Unknown include/exclude value(s): {', '.join(unknown)}. "
+                f"Allowed: {', '.join(sorted(self.embeds))}."
+            )
+
+        if fields:
+            scalars = [name for name in fields if name in scalar_names]
+            embeds = {name for name in fields if name in self.embeds}
+        else:
+            scalars = list(self.columns) + list(self.derived)
+            embeds = set(self.default_embeds)
+
+        return Selection(self, scalars, (embeds | include) - exclude)
+
+
+class Selection:
+    def __init__(self, fieldset, scalars, embeds):
+        self.embeds = embeds
+
+        requested = ["id"] + [name for name in scalars if name != "id"]
+        self._derived = [(name, *fieldset.derived[name]) for name in requested if name in fieldset.derived]
+        names = [name for name in requested if name in fieldset.columns]
+        for _, dependencies, _ in self._derived:
+            names += [name for name in dependencies if name not in names]
+        self._hidden = [name for name in names if name not in requested]
+        self._names = names
+        self._columns = [fieldset.columns[name] for name in names]
+
+        self._joined = []
+        for embed, columns in fieldset.joined.items():
+            if embed in embeds:
+                self._joined.append((embed, tuple(columns)))
+                self._columns += list(columns.values())
+
+    @property
+    def columns(self):
+        """Column expressions to pass to db.session.query(...)."""
+        return self._columns
+
+    def to_dict(self, row):
+        width = len(self._names)
+        item = dict(zip(self._names, row[:width]))
+        for name, dependencies, fn in self._derived:
+            item[name] = fn(*(item[dependency] for dependency in dependencies))
+        for name in self._hidden:
+            del item[name]
+
+        offset = width
+        for embed, keys in self._joined:
+            item[embed] = dict(zip(keys, row[offset:offset + len(keys)]))
+            offset += len(keys)
+        return item
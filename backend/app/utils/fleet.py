@@ -0,0 +1,236 @@
+"""
+Synthetic fleet generator behind `flask seed-fleet`.
+
+Rows are generated per user and written through the model tables in large
+Core executemany batches (or COPY on PostgreSQL/psycopg2). Primary keys are
+assigned up front from the current table maxima, so child rows never need a
+round trip to learn their parent's id.
+"""
+import csv
+import io
+import random
+import string
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import func, text
+
+from app.extensions import db
+from app.models import Reminder, ServiceRecord, ServiceRecordAttachment, User, Vehicle
+from app.utils.validation import vin_check_digit
+
+# WMI -> (make, models)
+MANUFACTURERS = {
+    "1HG": ("Honda", ["Accord", "Civic", "CR-V", "Pilot"]),
+    "2T1": ("Toyota", ["Corolla", "Matrix"]),
+    "4T1": ("Toyota", ["Camry", "Avalon"]),
+    "1FT": ("Ford", ["F-150", "F-250", "Ranger"]),
+    "1G1": ("Chevrolet", ["Malibu", "Impala", "Cruze"]),
+    "5YJ": ("Tesla", ["Model 3", "Model Y", "Model S"]),
+    "WBA": ("BMW", ["330i", "530i", "X3"]),
+    "JN1": ("Nissan", ["Altima", "Sentra", "Leaf"]),
+    "KMH": ("Hyundai", ["Elantra", "Sonata"]),
+    "3VW": ("Volkswagen", ["Jetta", "Golf"]),
+}
+VIN_CHARS = "ABCDEFGHJKLMNPRSTUVWXYZ0123456789"
+MODEL_YEAR_CODES = "ABCDEFGHJKLMNPRSTVWXY123456789"  # 2010..2039
+SERVICES = [
+    ("Oil Change", "Maintenance", 45, 120),
+    ("Tire Rotation", "Tires", 20, 60),
+    ("Brake Pads", "Brakes", 150, 450),
+    ("Air Filter", "Maintenance", 25, 80),
+    ("Battery Replacement", "Electrical", 120, 300),
+    ("Transmission Service", "Drivetrain", 150, 400),
+    ("State Inspection", "Inspection", 20, 70),
+    ("Coolant Flush", "Maintenance", 90, 200),
+]
+REMINDERS = ["Oil change due", "Rotate tires", "Inspection due", "Replace wiper blades", "Brake check"]
+TABLE_ORDER = (User, Vehicle, ServiceRecord, Reminder, ServiceRecordAttachment)
+
+
+def generate_vin(rng, wmi, model_year, serial):
+    vds = "".join(rng.choice(VIN_CHARS) for _ in range(5))
+    year_code = MODEL_YEAR_CODES[(model_year - 2010) % len(MODEL_YEAR_CODES)]
+    plant = rng.choice(string.ascii_uppercase.replace("I", "").replace("O", "").replace("Q", ""))
+    vin = f"{wmi}{vds}0{year_code}{plant}{serial % 1_000_000:06d}"
+    return vin[:8] + vin_check_digit(vin) + vin[9:]
+
+
+class BulkWriter:
+    """Buffers rows per model table and flushes them in dependency order."""
+
+    def __init__(self, batch_size, use_copy=True, on_flush=None):
+        self.batch_size = batch_size
+        self.on_flush = on_flush
+        self.buffers = {model: [] for model in TABLE_ORDER}
+        self.counts = {model.__tablename__: 0 for model in TABLE_ORDER}
+        connection = db.session.connection()
+        self.use_copy = (
+            use_copy
+            and connection.dialect.name == "postgresql"
+            and connection.dialect.driver == "psycopg2"
+        )
+
+    def add(self, model, row):
+        buffer = self.buffers[model]
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        for model in TABLE_ORDER:
+            rows = self.buffers[model]
+            if not rows:
+                continue
+            if self.use_copy:
+                self._copy(model.__table__, rows)
+            else:
+                db.session.execute(model.__table__.insert(), rows)
+            self.counts[model.__tablename__] += len(rows)
+            self.buffers[model] = []
+        if self.on_flush:
+            self.on_flush(dict(self.counts))
+
+    def _copy(self, table, rows):
+        columns = list(rows[0])
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([r"\N" if row[c] is None else row[c] for c in columns])
+        buffer.seek(0)
+
+        cursor = db.session.connection().connection.cursor()
+        cursor.copy_expert(
+            f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+            buffer,
+        )
+
+
+def _next_id(model):
+    return (db.session.query(func.max(model.id)).scalar() or 0) + 1
+
+
+def _reset_sequences():
+    if db.session.connection().dialect.name != "postgresql":
+        return
+    for model in TABLE_ORDER:
+        table = model.__tablename__
+        db.session.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table}), 1))"
+        ))
+
+
+def generate_fleet(
+    users,
+    vehicles_per_user=3,
+    records_per_vehicle=20,
+    reminders_per_vehicle=3,
+    attachment_ratio=0.3,
+    seed=0,
+    batch_size=10000,
+    password_hash="",
+    progress=None,
+):
+    """
+    Generates `users` users with their vehicles, service histories (mileage
+    increasing with service date), reminders and attachment rows. Returns the
+    number of rows written per table.
+    """
+    rng = random.Random(seed)
+    writer = BulkWriter(batch_size, on_flush=progress)
+    now = datetime.utcnow()
+    today = now.date()
+    ids = {model: _next_id(model) for model in TABLE_ORDER}
+    manufacturers = list(MANUFACTURERS.items())
+
+    for _ in range(users):
+        user_id = ids[User]
+        ids[User] += 1
+        writer.add(User, {
+            "id": user_id,
+            "email": f"fleet{user_id}@example.com",
+            "first_name": rng.choice(["Alex", "Sam", "Jordan", "Taylor", "Casey", "Riley"]),
+            "last_name": rng.choice(["Smith", "Garcia", "Chen", "Patel", "Nguyen", "Brown"]),
+            "password_hash": password_hash,
+            "token_version": 1,
+            "created_at": now,
+            "updated_at": now,
+        })
+
+        for _ in range(vehicles_per_user):
+            vehicle_id = ids[Vehicle]
+            ids[Vehicle] += 1
+            wmi, (make, models) = rng.choice(manufacturers)
+            model_year = rng.randint(2010, 2026)
+            writer.add(Vehicle, {
+                "id": vehicle_id,
+                "user_id": user_id,
+                "nickname": f"{make} {rng.choice(['Daily', 'Commuter', 'Weekend', 'Family'])}",
+                "vin": generate_vin(rng, wmi, model_year, vehicle_id),
+                "year": model_year,
+                "make": make,
+                "model": rng.choice(models),
+                "trim": None,
+                "engine": None,
+                "recall_count": 0,
+                "created_at": now,
+                "updated_at": now,
+            })
+
+            # Service history never runs past today, even for this year's models
+            service_date = min(date(model_year, rng.randint(1, 12), rng.randint(1, 28)), today)
+            mileage = rng.randint(5, 500)
+            for _ in range(records_per_vehicle):
+                service_date = min(service_date + timedelta(days=rng.randint(45, 240)), today)
+                mileage += rng.randint(1500, 8000)
+                title, category, low, high = rng.choice(SERVICES)
+                record_id = ids[ServiceRecord]
+                ids[ServiceRecord] += 1
+                writer.add(ServiceRecord, {
+                    "id": record_id,
+                    "vehicle_id": vehicle_id,
+                    "title": title,
+                    "category": category,
+                    "service_date": service_date,
+                    "mileage": mileage,
+                    "cost": Decimal(rng.randint(low * 100, high * 100)) / 100,
+                    "notes": None,
+                    "created_at": now,
+                    "updated_at": now,
+                })
+
+                if rng.random() < attachment_ratio:
+                    attachment_id = ids[ServiceRecordAttachment]
+                    ids[ServiceRecordAttachment] += 1
+                    public_id = f"servicetrak/service-records/{record_id}/receipt-{attachment_id}"
+                    writer.add(ServiceRecordAttachment, {
+                        "id": attachment_id,
+                        "service_record_id": record_id,
+                        "file_name": f"receipt-{attachment_id}.pdf",
+                        "file_url": f"https://res.cloudinary.com/demo/raw/upload/{public_id}.pdf",
+                        "public_id": public_id,
+                        "file_type": "application/pdf",
+                        "created_at": now,
+                        "updated_at": now,
+                    })
+
+            for index in range(reminders_per_vehicle):
+                reminder_id = ids[Reminder]
+                ids[Reminder] += 1
+                writer.add(Reminder, {
+                    "id": reminder_id,
+                    "vehicle_id": vehicle_id,
+                    "title": rng.choice(REMINDERS),
+                    "due_date": service_date + timedelta(days=rng.randint(30, 180)),
+                    "due_mileage": mileage + rng.randint(3000, 7500),
+                    "is_completed": index > 0 and rng.random() < 0.5,
+                    "notes": None,
+                    "created_at": now,
+                    "updated_at": now,
+                })
+
+    writer.flush()
+    _reset_sequences()
+    db.session.commit()
+    return writer.counts
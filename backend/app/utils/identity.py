@@ -0,0 +1,164 @@
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+from flask_jwt_extended import create_access_token, get_jwt
+
+from app.extensions import db, jwt
+from app.models import User
+from app.utils.response_cache import shared_backend
+
+
+class IdentityCache:
+    """
+    Small per-process TTL/LRU cache of user identities keyed by (user_id, version).
+    A token whose version is not the user's current one never gets an entry.
+
+    Without a shared backend, invalidate() only reaches this process: other
+    workers keep serving a revoked token's cached identity for up to `ttl`
+    seconds. With one (RESPONSE_CACHE_BACKEND=resp), invalidate() also bumps a
+    per-user generation there, and entries cached under an older generation are
+    ignored by every worker. Checking it costs one backend GET per request.
+    """
+
+    def __init__(self, ttl=60, max_size=10000, backend=None, prefix="servicetrak"):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.backend = backend
+        self.prefix = prefix
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _generation_key(self, user_id):
+        return f"{self.prefix}:identity:{user_id}"
+
+    def generation(self, user_id):
+        """The user's shared generation: 0 without a backend, None when it can't be read."""
+        if self.backend is None:
+            return 0
+        try:
+            value = self.backend.get(self._generation_key(user_id))
+        except Exception:
+            current_app.logger.exception("Failed to read identity generation for user %s", user_id)
+            return None
+        return int(value) if value is not None else 0
+
+    def get(self, user_id, version, generation=0):
+        if generation is None:
+            return None
+        key = (user_id, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            identity, expires_at, cached_generation = entry
+            if expires_at < time.monotonic() or cached_generation != generation:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return identity
+
+    def set(self, user_id, version, identity, generation=0):
+        if generation is None:
+            return
+        with self._lock:
+            self._entries[(user_id, version)] = (identity, time.monotonic() + self.ttl, generation)
+            self._entries.move_to_end((user_id, version))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+        if self.backend is not None:
+            try:
+                self.backend.incr(self._generation_key(user_id))
+            except Exception:
+                current_app.logger.exception("Failed to share identity invalidation for user %s", user_id)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def init_identity(app):
+    app.extensions["identity_cache"] = IdentityCache(
+        ttl=app.config.get("IDENTITY_CACHE_TTL", 60),
+        max_size=app.config.get("IDENTITY_CACHE_SIZE", 10000),
+        backend=shared_backend(app),
+    )
+
+
+def identity_cache():
+    return current_app.extensions["identity_cache"]
+
+
+def user_identity(user: User):
+    return {
+        "id": user.id,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "email": user.email,
+        "created_at": user.created_at.isoformat() if user.created_at else None,
+        "updated_at": user.updated_at.isoformat() if user.updated_at else None,
+    }
+
+
+def issue_access_token(user: User):
+    """
+    Access tokens carry the stable profile fields and the user's token version,
+    so a version bump (profile or password change) makes older tokens stale.
+    """
+    return create_access_token(
+        identity=str(user.id),
+        additional_claims={
+            "ver": user.token_version or 1,
+            "email": user.email,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+        },
+    )
+
+
+def load_identity(user_id, version):
+    """
+    Returns the identity for a (user_id, token version) pair, or None if the user
+    no longer exists or the version is stale. Hits the database only on a cache miss.
+    """
+    cache = identity_cache()
+    # Read before the row, so an invalidation in between leaves this entry stale
+    generation = cache.generation(user_id)
+    identity = cache.get(user_id, version, generation)
+    if identity is not None:
+        return identity
+
+    user = db.session.get(User, user_id)
+    if not user or (user.token_version or 1) != version:
+        return None
+
+    identity = user_identity(user)
+    cache.set(user_id, version, identity, generation)
+    return identity
+
+
+def current_identity():
+    claims = get_jwt()
+    return load_identity(int(claims["sub"]), claims.get("ver", 1))
+
+
+def bump_token_version(user: User):
+    user.token_version = (user.token_version or 1) + 1
+
+
+def invalidate_identity(user_id):
+    # Call after the version bump is committed so a concurrent miss cannot re-cache the old row
+    identity_cache().invalidate(user_id)
+
+
+@jwt.token_in_blocklist_loader
+def _token_is_stale(jwt_header, jwt_payload):
+    if jwt_payload.get("type") != "access":
+        return False
+    return load_identity(int(jwt_payload["sub"]), jwt_payload.get("ver", 1)) is None
@@ -0,0 +1,317 @@
+"""
+Persistent background jobs.
+
+Jobs are rows in the `jobs` table, so they survive restarts and any process
+can run them: the JOB_WORKERS threads started in each web process (on its
+first request, like the purge worker) or a dedicated `flask run-jobs` process.
+A worker claims the oldest due job with a conditional UPDATE
+(`status = 'queued'` -> `'running'`), so two workers never run the same job.
+Jobs left running by a crashed worker are requeued after JOB_LOCK_TIMEOUT_SECONDS.
+
+Failures retry with exponential backoff up to JOB_MAX_ATTEMPTS; a handler
+raises JobFailed for errors that retrying won't fix. A job with a dedupe_key
+runs at most once at a time: enqueueing the same key while it is queued or
+running returns that job (a queued one takes the new payload), and once it has
+finished, requeues it with the new payload.
+"""
+import threading
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models import Job
+from app.utils.metrics import REGISTRY
+from app.utils.response_cache import invalidate_user
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED = (SUCCEEDED, FAILED)
+
+JOBS_FINISHED = REGISTRY.counter(
+    "servicetrak_jobs_finished_total",
+    "Background job runs by kind and outcome (succeeded, failed, retried).",
+    ("kind", "outcome"),
+)
+
+
+class JobFailed(Exception):
+    """Raised by a handler for a failure that retrying won't fix."""
+
+
+class JobRejected(Exception):
+    """Raised by a kind's submit function when a job can't be enqueued."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class JobKind:
+    __slots__ = ("run", "submit")
+
+    def __init__(self, run, submit=None):
+        self.run = run
+        self.submit = submit
+
+
+# kind -> JobKind. run(job) returns the JSON result; submit(user_id, params) backs
+# POST /jobs and returns the enqueued Job (None for kinds clients can't enqueue).
+JOB_KINDS = {}
+
+
+def register_job_kind(kind, run, submit=None):
+    JOB_KINDS[kind] = JobKind(run, submit)
+
+
+def job_to_dict(job):
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "attempts": job.attempts,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+def enqueue(kind, user_id, payload, dedupe_key=None, check_existing=True):
+    """
+    Adds a job to the session (it is enqueued when the caller commits) and
+    returns it. With a dedupe_key, returns the job already holding that key
+    instead: as is while it runs, with the new payload while it is queued, and
+    requeued with the new payload once it has finished. Pass
+    check_existing=False when the key can't exist yet (e.g. it names a row
+    created in the same transaction).
+    """
+    if dedupe_key is not None and check_existing:
+        existing = Job.query.filter_by(dedupe_key=dedupe_key).first()
+        if existing is not None:
+            if existing.status in FINISHED:
+                _reset(existing, payload)
+            elif existing.status == QUEUED:
+                existing.payload = payload
+            return existing
+
+    job = Job(user_id=user_id, kind=kind, payload=payload, dedupe_key=dedupe_key, status=QUEUED)
+    if dedupe_key is None or not check_existing:
+        db.session.add(job)
+        return job
+
+    # A concurrent request may insert the same key between the lookup and here
+    try:
+        with db.session.begin_nested():
+            db.session.add(job)
+    except IntegrityError:
+        return Job.query.filter_by(dedupe_key=dedupe_key).one()
+    return job
+
+
+def _reset(job, payload):
+    job.status = QUEUED
+    job.payload = payload
+    job.attempts = 0
+    job.error = None
+    job.result = None
+    job.run_after = datetime.utcnow()
+    job.locked_at = None
+    job.finished_at = None
+
+
+def wake_workers():
+    """Call after committing new jobs so this process's idle workers pick them up now."""
+    worker = current_app.extensions.get("job_worker")
+    if worker is not None:
+        worker.wake()
+
+
+def claim_job():
+    """Marks the oldest due queued job running and returns it, or None when there is none."""
+    while True:
+        now = datetime.utcnow()
+        job_id = (
+            db.session.query(Job.id)
+            .filter(Job.status == QUEUED, Job.run_after <= now)
+            .order_by(Job.run_after, Job.id)
+            .limit(1)
+            .scalar()
+        )
+        if job_id is None:
+            db.session.commit()
+            return None
+
+        claimed = db.session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == QUEUED)
+            .values(status=RUNNING, locked_at=now, attempts=Job.attempts + 1)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        if claimed:
+            return db.session.get(Job, job_id)
+        # Another worker got it first; try the next one
+
+
+def run_next_job():
+    """Claims and runs one job. Returns False when no job was due."""
+    job = claim_job()
+    if job is None:
+        return False
+
+    job_id, kind, attempts, user_id = job.id, job.kind, job.attempts, job.user_id
+    job_kind = JOB_KINDS.get(kind)
+    try:
+        if job_kind is None:
+            raise JobFailed(f"Unknown job kind {kind}.")
+        result = job_kind.run(job)
+    except JobFailed as e:
+        db.session.rollback()
+        _finish(job_id, FAILED, error=str(e))
+        JOBS_FINISHED.inc(kind=kind, outcome="failed")
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.exception("Job %s (%s) failed on attempt %s", job_id, kind, attempts)
+        if attempts >= current_app.config.get("JOB_MAX_ATTEMPTS", 3):
+            _finish(job_id, FAILED, error=str(e) or e.__class__.__name__)
+            JOBS_FINISHED.inc(kind=kind, outcome="failed")
+        else:
+            backoff = current_app.config.get("JOB_RETRY_BACKOFF_SECONDS", 5) * 2 ** (attempts - 1)
+            # e.g. an open circuit breaker: no point retrying before it may close
+            backoff = max(backoff, getattr(e, "retry_after", 0) or 0)
+            job = db.session.get(Job, job_id)
+            job.status = QUEUED
+            job.error = str(e) or e.__class__.__name__
+            job.locked_at = None
+            job.run_after = datetime.utcnow() + timedelta(seconds=backoff)
+            db.session.commit()
+            JOBS_FINISHED.inc(kind=kind, outcome="retried")
+    else:
+        # Commits the handler's changes together with the job's result
+        job.status = SUCCEEDED
+        job.result = result
+        job.error = None
+        job.finished_at = datetime.utcnow()
+        job.locked_at = None
+        db.session.commit()
+        JOBS_FINISHED.inc(kind=kind, outcome="succeeded")
+        invalidate_user(str(user_id))
+    return True
+
+
+def _finish(job_id, status, error=None):
+    job = db.session.get(Job, job_id)
+    job.status = status
+    job.error = error
+    job.finished_at = datetime.utcnow()
+    job.locked_at = None
+    db.session.commit()
+
+
+def requeue_stale_jobs():
+    """Requeues jobs whose worker died mid-run. Returns how many were requeued."""
+    timeout = timedelta(seconds=current_app.config.get("JOB_LOCK_TIMEOUT_SECONDS", 300))
+    result = db.session.execute(
+        update(Job)
+        .where(Job.status == RUNNING, Job.locked_at < datetime.utcnow() - timeout)
+        .values(status=QUEUED, locked_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+def prune_jobs():
+    """Deletes jobs that finished more than JOB_RETENTION_DAYS ago."""
+    retention = timedelta(days=current_app.config.get("JOB_RETENTION_DAYS", 7))
+    result = db.session.execute(
+        delete(Job).where(Job.status.in_(FINISHED), Job.finished_at < datetime.utcnow() - retention)
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+def delete_vehicle_jobs(vehicle_id):
+    """Drops the jobs keyed to a purged vehicle, so a reused id starts clean."""
+    db.session.execute(delete(Job).where(Job.dedupe_key.startswith(f"vehicle:{vehicle_id}:")))
+
+
+class JobWorker:
+    """JOB_WORKERS daemon threads that run due jobs, polling every JOB_POLL_SECONDS when idle."""
+
+    def __init__(self, app, threads, poll_interval, maintenance_interval):
+        self.app = app
+        self.threads = threads
+        self.poll_interval = poll_interval
+        self.maintenance_interval = maintenance_interval
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._started = []
+        self._lock = threading.Lock()
+        self._next_maintenance = 0.0
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+            for index in range(self.threads):
+                thread = threading.Thread(target=self.run, name=f"servicetrak-jobs-{index}", daemon=True)
+                thread.start()
+                self._started.append(thread)
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def wake(self):
+        self._wake.set()
+
+    def _maintenance_due(self):
+        with self._lock:
+            now = datetime.utcnow().timestamp()
+            if now < self._next_maintenance:
+                return False
+            self._next_maintenance = now + self.maintenance_interval
+            return True
+
+    def run(self):
+        """Runs jobs until stop(); used by the threads and by `flask run-jobs`."""
+        while not self._stop.is_set():
+            ran = False
+            with self.app.app_context():
+                try:
+                    if self._maintenance_due():
+                        requeue_stale_jobs()
+                        prune_jobs()
+                    ran = run_next_job()
+                except Exception:
+                    db.session.rollback()
+                    self.app.logger.exception("Job worker iteration failed")
+                finally:
+                    db.session.remove()
+            if not ran:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+
+def init_jobs(app):
+    threads = app.config.get("JOB_WORKERS", 2)
+    if threads <= 0:
+        return
+
+    worker = JobWorker(
+        app,
+        threads=threads,
+        poll_interval=app.config.get("JOB_POLL_SECONDS", 1),
+        maintenance_interval=app.config.get("JOB_LOCK_TIMEOUT_SECONDS", 300),
+    )
+    app.extensions["job_worker"] = worker
+
+    # Started from a request rather than here so pre-forking servers start it in each worker
+    @app.before_request
+    def _start_job_worker():
+        worker.start()
@@ -0,0 +1,47 @@
+import decimal
+
+import orjson
+from flask.json.provider import JSONProvider
+
+
+def _default(value):
+    # orjson handles date/datetime/UUID/dataclasses itself; Decimal (Numeric columns) is the gap
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if hasattr(value, "__html__"):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """
+    Flask JSON provider backed by orjson. Dates and datetimes are written as ISO 8601
+    (the same strings `.isoformat()` gives) and Decimal as float, so views can hand
+    raw column values to jsonify instead of converting them in Python.
+    """
+
+    # Same defaults as Flask's provider (sorted keys, compact unless debug)
+    sort_keys = True
+    compact = None
+    mimetype = "application/json"
+
+    def _options(self, indent=None, sort_keys=None):
+        options = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys if sort_keys is None else sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs):
+        options = self._options(kwargs.get("indent"), kwargs.get("sort_keys"))
+        return orjson.dumps(obj, default=_default, option=options).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=_default, option=self._options(indent=pretty))
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
@@ -0,0 +1,271 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + list(extra or [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, documentation, label_names=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, "") for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        key = tuple(labels.get(name, "") for name in self.label_names)
+        return self._values.get(key, 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield self.name, self.label_names, key, None, value
+
+
+class Gauge(Counter):
+    """Gauge whose value is set directly or read from a callback at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name, documentation, label_names=(), callback=None):
+        super().__init__(name, documentation, label_names)
+        self.callback = callback
+
+    def set(self, value, **labels):
+        key = tuple(labels.get(name, "") for name in self.label_names)
+        with self._lock:
+            self._values[key] = value
+
+    def samples(self):
+        if self.callback is not None:
+            for labels, value in self.callback():
+                key = tuple(labels.get(name, "") for name in self.label_names)
+                yield self.name, self.label_names, key, None, value
+            return
+        yield from super().samples()
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, "") for name in self.label_names)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels):
+        key = tuple(labels.get(name, "") for name in self.label_names)
+        series = self._series.get(key)
+        return series[2] if series else 0
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, (list(s[0]), s[1], s[2])) for key, s in self._series.items())
+        for key, (bucket_counts, total, count) in items:
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                yield f"{self.name}_bucket", self.label_names, key, ("le", _format_value(bound)), bucket_count
+            yield f"{self.name}_sum", self.label_names, key, None, total
+            yield f"{self.name}_count", self.label_names, key, None, count
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            # Re-registering (e.g. a second create_app in tests) returns the existing metric
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, documentation, label_names=()):
+        return self.register(Counter(name, documentation, label_names))
+
+    def gauge(self, name, documentation, label_names=(), callback=None):
+        gauge = self.register(Gauge(name, documentation, label_names, callback))
+        if callback is not None:
+            gauge.callback = callback
+        return gauge
+
+    def histogram(self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, label_names, buckets))
+
+    def render(self):
+        """Renders every metric in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, label_names, values, extra, value in metric.samples():
+                labels = _format_labels(label_names, values, [extra] if extra else None)
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+REQUEST_LATENCY = REGISTRY.histogram(
+    "servicetrak_http_request_duration_seconds",
+    "HTTP request latency by endpoint.",
+    ("endpoint", "method", "status"),
+)
+REQUEST_QUERIES = REGISTRY.histogram(
+    "servicetrak_http_request_db_queries",
+    "SQL statements executed per request.",
+    ("endpoint",),
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100, 250),
+)
+REQUEST_DB_TIME = REGISTRY.histogram(
+    "servicetrak_http_request_db_seconds",
+    "Database time per request.",
+    ("endpoint",),
+)
+EXTERNAL_LATENCY = REGISTRY.histogram(
+    "servicetrak_external_call_duration_seconds",
+    "Latency of calls to external services (NHTSA, Cloudinary).",
+    ("service", "operation", "outcome"),
+)
+
+
+# Execution option for coordination statements run on their own connection (e.g.
+# single-flight locks): their time is recorded but they don't count as queries, so
+# waiting on another process doesn't eat into the request's query budget
+UNMETERED = "unmetered"
+
+
+class RequestStats:
+    __slots__ = ("start", "queries", "db_time", "external_time", "statements")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.external_time = 0.0
+        self.statements = []
+
+
+def request_stats():
+    """Returns the current request's stats, or None outside an instrumented request."""
+    if not has_request_context():
+        return None
+    return g.get("_request_stats")
+
+
+@contextmanager
+def external_call(service, operation):
+    """Times a call to an external service and records it for /metrics and Server-Timing."""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        elapsed = time.perf_counter() - start
+        EXTERNAL_LATENCY.observe(elapsed, service=service, operation=operation, outcome=outcome)
+        stats = request_stats()
+        if stats is not None:
+            stats.external_time += elapsed
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("_query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("_query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+
+    stats = request_stats()
+    if stats is not None:
+        stats.db_time += elapsed
+        if context is not None and context.execution_options.get(UNMETERED):
+            return
+        stats.queries += 1
+        stats.statements.append(statement)
+
+
+def _endpoint_label():
+    return request.endpoint or "unmatched"
+
+
+def init_metrics(app):
+    # Per-request stats are always collected; the query budget guard relies on them too
+    @app.before_request
+    def _start_request_stats():
+        g._request_stats = RequestStats()
+
+    @app.after_request
+    def _record_request_stats(response):
+        stats = request_stats()
+        if stats is None or not app.config.get("METRICS_ENABLED", True):
+            return response
+
+        elapsed = time.perf_counter() - stats.start
+        endpoint = _endpoint_label()
+        REQUEST_LATENCY.observe(
+            elapsed, endpoint=endpoint, method=request.method, status=str(response.status_code)
+        )
+        REQUEST_QUERIES.observe(stats.queries, endpoint=endpoint)
+        REQUEST_DB_TIME.observe(stats.db_time, endpoint=endpoint)
+
+        if app.config.get("SERVER_TIMING_ENABLED", True):
+            timings = [
+                f"app;dur={elapsed * 1000:.1f}",
+                f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries"',
+            ]
+            if stats.external_time:
+                timings.append(f"ext;dur={stats.external_time * 1000:.1f}")
+            response.headers.add("Server-Timing", ", ".join(timings))
+
+        return response
@@ -1,15 +1,75 @@
-import requests
+from flask import current_app
+
+from app.utils.circuit_breaker import guarded
+from app.utils.metrics import REGISTRY, external_call
+from app.utils.single_flight import coalesce
+from app.utils.vpic import FIELDS, decode_vin_local
 
 NHTSA_BASE_URL = "https://vpic.nhtsa.dot.gov/api/vehicles/DecodeVinValuesExtended"
 
+VIN_DECODES = REGISTRY.counter(
+    "servicetrak_vin_decodes_total",
+    "VIN decodes by source (local, remote) and result (complete, partial, miss, error).",
+    ("source", "result"),
+)
+
+
+def _is_complete(decoded):
+    return bool(decoded.get("year") and decoded.get("make") and decoded.get("model"))
+
 
 def decode_vin(vin: str):
+    """
+    Decodes a VIN with the sources in VIN_DECODER_ORDER ("local" = the vPIC
+    snapshot, "remote" = the NHTSA API), stopping at the first that resolves
+    year, make and model. Otherwise returns the result that resolved the most
+    fields, or None; a remote error is raised only when no source returned anything.
+    Results carry `source` and `resolved_fields`.
+    """
+    sources = {
+        "local": decode_vin_local,
+        # Concurrent decodes of the same VIN share one API call
+        "remote": lambda v: coalesce("decode_vin", v, lambda: decode_vin_remote(v)),
+    }
+    best = None
+    error = None
+    for name in current_app.config.get("VIN_DECODER_ORDER", ["local", "remote"]):
+        decoder = sources.get(name)
+        if decoder is None:
+            continue
+        try:
+            decoded = decoder(vin)
+        except Exception as e:
+            VIN_DECODES.inc(source=name, result="error")
+            error = e
+            continue
+        if not decoded:
+            VIN_DECODES.inc(source=name, result="miss")
+            continue
+
+        decoded = {**decoded, "source": name}
+        if _is_complete(decoded):
+            VIN_DECODES.inc(source=name, result="complete")
+            return decoded
+        VIN_DECODES.inc(source=name, result="partial")
+        if best is None or len(decoded["resolved_fields"]) > len(best["resolved_fields"]):
+            best = decoded
+
+    if best is None and error is not None:
+        raise error
+    return best
+
+
+def decode_vin_remote(vin: str):
     """
     Calls the NHTSA VIN Decode API and returns normalized vehicle data.
     """
+    import requests  # imported on first lookup; requests/urllib3 are slow to import
+
     url = f"{NHTSA_BASE_URL}/{vin}?format=json"
-    response = requests.get(url, timeout=10)
-    response.raise_for_status()
+    with guarded("nhtsa_vpic"), external_call("nhtsa", "decode_vin"):
+        response = requests.get(url, timeout=10)
+        response.raise_for_status()
 
     results = response.json().get("Results", [])
     if not results:
@@ -17,10 +77,12 @@ def decode_vin(vin: str):
 
     data = results[0]
 
-    return {
+    decoded = {
         "year": int(data["ModelYear"]) if data.get("ModelYear", "").isdigit() else None,
         "make": data.get("Make") or None,
         "model": data.get("Model") or None,
         "trim": data.get("Trim") or None,
         "engine": data.get("EngineModel") or data.get("EngineConfiguration") or None,
     }
+    decoded["resolved_fields"] = [field for field in FIELDS if decoded[field] is not None]
+    return decoded
@@ -0,0 +1,116 @@
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+_executor = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+class PasswordHashUnavailable(Exception):
+    """The hashing pool timed out or its worker died; the request can be retried."""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _get_executor(workers):
+    """
+    Lazily creates (or resizes) the hashing process pool. Spawned children keep
+    the pool safe to create from threaded gunicorn workers.
+    """
+    global _executor, _executor_workers
+
+    if workers <= 0:
+        return None
+
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _executor_workers = workers
+        return _executor
+
+
+def shutdown_executor():
+    global _executor, _executor_workers
+
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+        _executor_workers = 0
+
+
+atexit.register(shutdown_executor)
+
+
+def _discard_executor(executor):
+    """Drops a broken pool so the next call builds a new one."""
+    global _executor, _executor_workers
+
+    with _executor_lock:
+        if _executor is executor:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+            _executor_workers = 0
+
+
+def _run(fn, *args):
+    config = current_app.config
+    executor = _get_executor(config.get("PASSWORD_HASH_WORKERS", 0))
+    if executor is None:
+        return fn(*args)
+
+    try:
+        future = executor.submit(fn, *args)
+        return future.result(timeout=config.get("PASSWORD_HASH_TIMEOUT", 30))
+    except FutureTimeoutError:
+        future.cancel()
+        raise PasswordHashUnavailable("Password hashing timed out.", retry_after=5) from None
+    except BrokenProcessPool:
+        _discard_executor(executor)
+        raise PasswordHashUnavailable("Password hashing worker died.", retry_after=1) from None
+
+
+@lru_cache(maxsize=8)
+def _method_prefix(method, salt_length):
+    # Werkzeug expands defaults ("pbkdf2" -> "pbkdf2:sha256:1000000"), so compare
+    # against the prefix it actually writes rather than the configured string.
+    return generate_password_hash("", method, salt_length).split("$", 1)[0]
+
+
+def hash_password(password):
+    config = current_app.config
+    return _run(
+        generate_password_hash,
+        password,
+        config.get("PASSWORD_HASH_METHOD", "scrypt"),
+        config.get("PASSWORD_SALT_LENGTH", 16),
+    )
+
+
+def verify_password(password_hash, password):
+    if not password_hash:
+        return False
+    return _run(check_password_hash, password_hash, password)
+
+
+def needs_rehash(password_hash):
+    config = current_app.config
+    salt_length = config.get("PASSWORD_SALT_LENGTH", 16)
+    current = _method_prefix(config.get("PASSWORD_HASH_METHOD", "scrypt"), salt_length)
+    # Werkzeug hashes are "method$salt$hash"
+    method, _, rest = (password_hash or "").partition("$")
+    return method != current or len(rest.split("$", 1)[0]) != salt_length
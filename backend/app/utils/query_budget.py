@@ -0,0 +1,68 @@
+import random
+
+from flask import current_app, request
+
+from app.utils.metrics import REGISTRY, request_stats
+
+BUDGET_EXCEEDED = REGISTRY.counter(
+    "servicetrak_query_budget_exceeded_total",
+    "Requests that executed more SQL statements than their endpoint's budget.",
+    ("endpoint",),
+)
+
+
+class QueryBudgetExceeded(AssertionError):
+    def __init__(self, endpoint, budget, statements):
+        self.endpoint = endpoint
+        self.budget = budget
+        self.statements = list(statements)
+        listing = "\n".join(f"  {i}. {s}" for i, s in enumerate(self.statements, 1))
+        super().__init__(
+            f"{endpoint} executed {len(self.statements)} SQL statements "
+            f"(budget {budget}):\n{listing}"
+        )
+
+
+def query_budget(max_queries):
+    """
+    Declares the maximum number of SQL statements a view may execute per request.
+    Only tags the view; enforcement happens in the after_request hook below.
+    """
+
+    def decorator(fn):
+        fn.query_budget = max_queries
+        return fn
+
+    return decorator
+
+
+def endpoint_budget(endpoint):
+    view = current_app.view_functions.get(endpoint)
+    return getattr(view, "query_budget", None)
+
+
+def init_query_budget(app):
+    @app.after_request
+    def _check_query_budget(response):
+        mode = app.config.get("QUERY_BUDGET_MODE", "warn")
+        stats = request_stats()
+        if mode == "off" or stats is None or not request.endpoint:
+            return response
+
+        budget = endpoint_budget(request.endpoint)
+        if budget is None or stats.queries <= budget:
+            return response
+
+        BUDGET_EXCEEDED.inc(endpoint=request.endpoint)
+        if mode == "raise":
+            raise QueryBudgetExceeded(request.endpoint, budget, stats.statements)
+
+        if random.random() < app.config.get("QUERY_BUDGET_SAMPLE_RATE", 0.1):
+            app.logger.warning(
+                "Query budget exceeded for %s: %d statements (budget %d). First statements: %s",
+                request.endpoint,
+                stats.queries,
+                budget,
+                stats.statements[:5],
+            )
+        return response
@@ -0,0 +1,263 @@
+"""
+Local recall database built from NHTSA's recall flat file.
+
+`flask import-recalls FLAT_RCL.zip` streams the tab-delimited file (zipped,
+gzipped or plain) into `recall_campaigns`, one row per RECORD_ID, in batches of
+--batch-size rows. Each row stores a hash of its imported fields, and a
+re-import only inserts new records and updates those whose hash changed.
+Unchanged rows cost a dict lookup and no SQL.
+
+Lookups match on (make_key, model_key, year), where the keys are the make and
+model upper-cased with spaces and punctuation removed, so "Cr-v" finds "CR-V".
+name_key_sql() builds the same key in SQL, and refresh_recall_counts() uses it
+to recount recalls for every vehicle with one correlated UPDATE.
+"""
+import csv
+import gzip
+import hashlib
+import io
+import zipfile
+from datetime import datetime
+
+from sqlalchemy import case, distinct, func, insert, or_, select, update
+
+from app.extensions import db
+from app.models import RecallCampaign, User, Vehicle
+from app.utils.response_cache import invalidate_user
+
+# Characters dropped from makes/models before matching, in Python and in SQL
+KEY_STRIP_CHARS = " -./"
+
+# Column positions in FLAT_RCL.txt (see NHTSA's RCL.txt field list)
+RECORD_ID, CAMPNO, MAKETXT, MODELTXT, YEARTXT = 0, 1, 2, 3, 4
+COMPNAME, MFGNAME, POTAFF, RCDATE = 6, 7, 11, 15
+DESC_DEFECT, CONSEQUENCE_DEFECT, CORRECTIVE_ACTION = 19, 20, 21
+MIN_COLUMNS = CORRECTIVE_ACTION + 1
+UNKNOWN_YEAR = 9999
+
+IMPORTED_FIELDS = (
+    "campaign_number", "make", "model", "make_key", "model_key", "year", "component",
+    "manufacturer", "report_date", "potentially_affected", "summary", "consequence", "remedy",
+)
+
+
+def name_key(value):
+    value = (value or "").upper()
+    for char in KEY_STRIP_CHARS:
+        value = value.replace(char, "")
+    return value
+
+
+def name_key_sql(column):
+    expression = func.upper(column)
+    for char in KEY_STRIP_CHARS:
+        expression = func.replace(expression, char, "")
+    return expression
+
+
+def _open_text(path):
+    if zipfile.is_zipfile(path):
+        archive = zipfile.ZipFile(path)
+        member = next(name for name in archive.namelist() if name.lower().endswith(".txt"))
+        return io.TextIOWrapper(archive.open(member), encoding="cp1252", errors="replace", newline="")
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="cp1252", errors="replace", newline="")
+    return open(path, encoding="cp1252", errors="replace", newline="")
+
+
+def _int(value):
+    value = value.strip()
+    return int(value) if value.isdigit() else None
+
+
+def _date(value):
+    try:
+        return datetime.strptime(value.strip(), "%Y%m%d").date()
+    except ValueError:
+        return None
+
+
+def _text(value, limit=None):
+    value = value.strip()
+    return (value[:limit] if limit else value) or None
+
+
+def parse_row(columns):
+    """Maps one flat-file line to RecallCampaign fields, or None for an unusable line."""
+    if len(columns) < MIN_COLUMNS:
+        return None
+    record_id = _int(columns[RECORD_ID])
+    make, model = _text(columns[MAKETXT], 50), _text(columns[MODELTXT], 60)
+    campaign_number = _text(columns[CAMPNO], 12)
+    if record_id is None or not (make and model and campaign_number):
+        return None
+
+    year = _int(columns[YEARTXT])
+    row = {
+        "record_id": record_id,
+        "campaign_number": campaign_number,
+        "make": make,
+        "model": model,
+        "make_key": name_key(make),
+        "model_key": name_key(model),
+        "year": None if year == UNKNOWN_YEAR else year,
+        "component": _text(columns[COMPNAME], 255),
+        "manufacturer": _text(columns[MFGNAME], 255),
+        "report_date": _date(columns[RCDATE]),
+        "potentially_affected": _int(columns[POTAFF]),
+        "summary": _text(columns[DESC_DEFECT]),
+        "consequence": _text(columns[CONSEQUENCE_DEFECT]),
+        "remedy": _text(columns[CORRECTIVE_ACTION]),
+    }
+    digest = hashlib.blake2b(digest_size=8)
+    for field in IMPORTED_FIELDS:
+        digest.update(repr(row[field]).encode())
+        digest.update(b"\x1f")
+    row["row_hash"] = digest.hexdigest()
+    return row
+
+
+def import_recalls(path, batch_size=5000, prune=False, progress=None):
+    """
+    Upserts the flat file at `path` into recall_campaigns, committing every
+    batch_size written rows. With prune, deletes records missing from the file.
+    Returns counts of inserted, updated, unchanged, skipped and deleted rows.
+    """
+    existing = dict(
+        db.session.execute(select(RecallCampaign.record_id, RecallCampaign.row_hash)).all()
+    )
+    seen = set()
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0, "skipped": 0, "deleted": 0}
+    inserts, updates = [], []
+    now = datetime.utcnow()
+
+    def flush():
+        if inserts:
+            db.session.execute(insert(RecallCampaign), inserts)
+        if updates:
+            db.session.execute(update(RecallCampaign), updates)
+        db.session.commit()
+        counts["inserted"] += len(inserts)
+        counts["updated"] += len(updates)
+        inserts.clear()
+        updates.clear()
+        if progress is not None:
+            progress(counts)
+
+    with _open_text(path) as f:
+        for columns in csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE):
+            row = parse_row(columns)
+            if row is None:
+                counts["skipped"] += 1
+                continue
+
+            record_id = row["record_id"]
+            seen.add(record_id)
+            previous = existing.get(record_id)
+            if previous == row["row_hash"]:
+                counts["unchanged"] += 1
+                continue
+
+            row["imported_at"] = now
+            (inserts if previous is None else updates).append(row)
+            existing[record_id] = row["row_hash"]
+            if len(inserts) + len(updates) >= batch_size:
+                flush()
+    flush()
+
+    if prune:
+        stale = [record_id for record_id in existing if record_id not in seen]
+        for start in range(0, len(stale), batch_size):
+            chunk = stale[start:start + batch_size]
+            db.session.execute(
+                RecallCampaign.__table__.delete().where(RecallCampaign.record_id.in_(chunk))
+            )
+            db.session.commit()
+            counts["deleted"] += len(chunk)
+    return counts
+
+
+def lookup_recalls_local(year, make, model):
+    """
+    Recalls for a year/make/model from recall_campaigns in one indexed query, in
+    the same shape as the live lookup: one entry per campaign, newest first.
+    """
+    rows = db.session.execute(
+        select(
+            RecallCampaign.campaign_number,
+            RecallCampaign.report_date,
+            RecallCampaign.component,
+            RecallCampaign.summary,
+            RecallCampaign.remedy,
+            RecallCampaign.manufacturer,
+        )
+        .where(
+            RecallCampaign.make_key == name_key(make),
+            RecallCampaign.model_key == name_key(model),
+            RecallCampaign.year == year,
+        )
+        .order_by(RecallCampaign.report_date.desc(), RecallCampaign.campaign_number, RecallCampaign.record_id)
+    ).all()
+
+    campaigns = {}
+    for campaign_number, report_date, component, summary, remedy, manufacturer in rows:
+        recall = campaigns.get(campaign_number)
+        if recall is None:
+            campaigns[campaign_number] = {
+                "campaign_number": campaign_number,
+                "report_date": report_date.isoformat() if report_date else None,
+                "component": component,
+                "summary": summary,
+                "remedy": remedy,
+                "manufacturer": manufacturer,
+            }
+        elif component and not recall["component"]:
+            # The campaign's first record had a blank COMPNAME
+            recall["component"] = component
+        elif component and component not in recall["component"].split("; "):
+            recall["component"] = f"{recall['component']}; {component}"
+    return list(campaigns.values())
+
+
+def refresh_recall_counts():
+    """
+    Sets recall_count / recall_checked_at on every vehicle with a year, make and
+    model from recall_campaigns in one UPDATE. Only vehicles whose count changed
+    get a new updated_at (and a sync stamp and cache invalidation for their owner).
+    Returns the number of vehicles whose count changed.
+    """
+    now = datetime.utcnow()
+    campaigns = (
+        select(func.count(distinct(RecallCampaign.campaign_number)))
+        .where(
+            RecallCampaign.make_key == name_key_sql(Vehicle.make),
+            RecallCampaign.model_key == name_key_sql(Vehicle.model),
+            RecallCampaign.year == Vehicle.year,
+        )
+        .scalar_subquery()
+    )
+    changed = or_(Vehicle.recall_count.is_(None), Vehicle.recall_count != campaigns)
+    db.session.execute(
+        update(Vehicle)
+        .where(Vehicle.year.is_not(None), Vehicle.make.is_not(None), Vehicle.model.is_not(None))
+        .values(
+            recall_count=campaigns,
+            recall_checked_at=now,
+            updated_at=case((changed, now), else_=Vehicle.updated_at),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    changed_count = db.session.query(func.count(Vehicle.id)).filter(Vehicle.updated_at == now).scalar()
+    user_ids = select(Vehicle.user_id).where(Vehicle.updated_at == now).distinct()
+    db.session.execute(
+        update(User)
+        .where(User.id.in_(user_ids))
+        .values(sync_changed_at=now, updated_at=User.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    owners = db.session.execute(user_ids).scalars().all()
+    db.session.commit()
+    for user_id in owners:
+        invalidate_user(str(user_id))
+    return changed_count
@@ -0,0 +1,195 @@
+"""
+Minimal RESP2 (Redis protocol) client plus a tiny in-memory server that can
+stand in for Redis/Valkey locally and in tests. Only the handful of commands
+the response cache needs are supported.
+"""
+import queue
+import socket
+import socketserver
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class RespError(Exception):
+    pass
+
+
+def encode_command(*args):
+    parts = [f"*{len(args)}\r\n".encode()]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+    return b"".join(parts)
+
+
+def read_reply(stream):
+    line = stream.readline()
+    if not line:
+        raise ConnectionError("RESP connection closed")
+    kind, payload = line[:1], line[1:-2]
+
+    if kind == b"+":
+        return payload.decode()
+    if kind == b"-":
+        raise RespError(payload.decode())
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        data = stream.read(length + 2)
+        return data[:-2]
+    if kind == b"*":
+        count = int(payload)
+        return None if count < 0 else [read_reply(stream) for _ in range(count)]
+    raise RespError(f"Unexpected RESP reply: {line!r}")
+
+
+class RespClient:
+    """Small pooled RESP client; sockets are reused across threads via a LIFO pool."""
+
+    def __init__(self, url="redis://127.0.0.1:6379/0", timeout=0.5, pool_size=8):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int((parsed.path or "/0").lstrip("/") or 0)
+        self.timeout = timeout
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        conn = (sock, sock.makefile("rb"))
+        if self.password:
+            self._roundtrip(conn, "AUTH", self.password)
+        if self.db:
+            self._roundtrip(conn, "SELECT", self.db)
+        return conn
+
+    def _roundtrip(self, conn, *args):
+        sock, stream = conn
+        sock.sendall(encode_command(*args))
+        return read_reply(stream)
+
+    def execute(self, *args):
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+
+        try:
+            reply = self._roundtrip(conn, *args)
+        except (OSError, ConnectionError):
+            conn[0].close()
+            raise
+        except RespError:
+            self._release(conn)
+            raise
+
+        self._release(conn)
+        return reply
+
+    def _release(self, conn):
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn[0].close()
+
+
+class _Store:
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+        self.lock = threading.Lock()
+
+    def _alive(self, key):
+        expires_at = self.expires.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.data
+
+    def execute(self, command, args):
+        with self.lock:
+            if command in ("PING",):
+                return "PONG"
+            if command in ("AUTH", "SELECT"):
+                return "OK"
+            if command == "GET":
+                return self.data[args[0]] if self._alive(args[0]) else None
+            if command == "SET":
+                key, value = args[0], args[1]
+                self.data[key] = value
+                self.expires.pop(key, None)
+                options = [a.upper() for a in args[2:]]
+                if b"EX" in options:
+                    self.expires[key] = time.monotonic() + int(args[2 + options.index(b"EX") + 1])
+                elif b"PX" in options:
+                    self.expires[key] = time.monotonic() + int(args[2 + options.index(b"PX") + 1]) / 1000
+                return "OK"
+            if command == "INCR":
+                value = int(self.data[args[0]]) + 1 if self._alive(args[0]) else 1
+                self.data[args[0]] = str(value).encode()
+                return value
+            if command == "DEL":
+                removed = 0
+                for key in args:
+                    if self._alive(key):
+                        removed += 1
+                        self.data.pop(key, None)
+                        self.expires.pop(key, None)
+                return removed
+            if command == "FLUSHDB":
+                self.data.clear()
+                self.expires.clear()
+                return "OK"
+        raise RespError(f"ERR unknown command '{command}'")
+
+
+def _encode_reply(value):
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, int):
+        return f":{value}\r\n".encode()
+    if isinstance(value, bytes):
+        return f"${len(value)}\r\n".encode() + value + b"\r\n"
+    return f"+{value}\r\n".encode()
+
+
+class _RespHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            try:
+                args = read_reply(self.rfile)
+            except (ConnectionError, OSError):
+                return
+            if not isinstance(args, list) or not args:
+                return
+            try:
+                reply = _encode_reply(self.server.store.execute(args[0].decode().upper(), args[1:]))
+            except RespError as exc:
+                reply = f"-{exc}\r\n".encode()
+            self.wfile.write(reply)
+
+
+class LocalRespServer(socketserver.ThreadingTCPServer):
+    """In-memory RESP server: `flask cache-server` or tests use it in place of Redis."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host="127.0.0.1", port=6380):
+        super().__init__((host, port), _RespHandler)
+        self.store = _Store()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"redis://{host}:{port}/0"
+
+    def start_background(self):
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,203 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+
+from flask import Response, current_app, request
+from flask_jwt_extended import get_jwt_identity
+
+from app.utils.metrics import REGISTRY
+from app.utils.resp import RespClient
+
+CACHE_REQUESTS = REGISTRY.counter(
+    "servicetrak_response_cache_requests_total",
+    "Response cache lookups by endpoint and result (hit, miss, error).",
+    ("endpoint", "result"),
+)
+# Writes in these blueprints can change what the cached GET endpoints return
+INVALIDATING_BLUEPRINTS = {"vehicles", "service_records", "reminders", "attachments"}
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class LocalCacheBackend:
+    """In-process LRU. Only safe when a single worker process serves each user."""
+
+    def __init__(self, max_entries=5000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            expires_at = time.monotonic() + ttl if ttl else None
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def incr(self, key):
+        with self._lock:
+            value, expires_at = self._entries.get(key, (0, None))
+            value = int(value) + 1
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            return value
+
+
+class RespCacheBackend:
+    """Shared backend speaking the Redis protocol, so all gunicorn workers see one cache."""
+
+    def __init__(self, url, timeout=0.5):
+        self.client = RespClient(url, timeout=timeout)
+
+    def get(self, key):
+        return self.client.execute("GET", key)
+
+    def set(self, key, value, ttl=None):
+        if ttl:
+            self.client.execute("SET", key, value, "PX", max(1, int(ttl * 1000)))
+        else:
+            self.client.execute("SET", key, value)
+
+    def incr(self, key):
+        return self.client.execute("INCR", key)
+
+
+class ResponseCache:
+    def __init__(self, backend, ttl=300, prefix="servicetrak"):
+        self.backend = backend
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _generation_key(self, user_id):
+        return f"{self.prefix}:gen:{user_id}"
+
+    def generation(self, user_id):
+        value = self.backend.get(self._generation_key(user_id))
+        return int(value) if value is not None else 0
+
+    def bump(self, user_id):
+        return self.backend.incr(self._generation_key(user_id))
+
+    def key(self, user_id, generation, endpoint, args):
+        query = urlencode(sorted(args.items(multi=True)))
+        return f"{self.prefix}:resp:{user_id}:{generation}:{endpoint}:{query}"
+
+
+def shared_backend(app):
+    """
+    The RESP backend when RESPONSE_CACHE_BACKEND=resp, also used for state every
+    worker process must see (replica pins, identity invalidations); None otherwise.
+    """
+    if app.config.get("RESPONSE_CACHE_BACKEND", "off") != "resp":
+        return None
+    backend = app.extensions.get("shared_backend")
+    if backend is None:
+        backend = app.extensions["shared_backend"] = RespCacheBackend(
+            app.config.get("RESPONSE_CACHE_URL", "redis://127.0.0.1:6379/0"),
+            timeout=app.config.get("RESPONSE_CACHE_TIMEOUT", 0.5),
+        )
+    return backend
+
+
+def init_response_cache(app):
+    backend_name = app.config.get("RESPONSE_CACHE_BACKEND", "off")
+    if backend_name == "local":
+        backend = LocalCacheBackend(app.config.get("RESPONSE_CACHE_MAX_ENTRIES", 5000))
+    elif backend_name == "resp":
+        backend = shared_backend(app)
+    else:
+        app.extensions["response_cache"] = None
+        return
+
+    app.extensions["response_cache"] = ResponseCache(
+        backend, ttl=app.config.get("RESPONSE_CACHE_TTL", 300)
+    )
+
+    @app.after_request
+    def _bump_generation_on_write(response):
+        if (
+            request.method not in SAFE_METHODS
+            and request.blueprint in INVALIDATING_BLUEPRINTS
+            and response.status_code < 400
+        ):
+            invalidate_user(get_jwt_identity())
+        return response
+
+
+def response_cache():
+    return current_app.extensions.get("response_cache")
+
+
+def invalidate_user(user_id):
+    """Bumps the user's generation so every cached response for them is skipped."""
+    cache = response_cache()
+    if cache is None or user_id is None:
+        return
+    try:
+        cache.bump(user_id)
+    except Exception:
+        current_app.logger.exception("Failed to invalidate response cache for user %s", user_id)
+
+
+def cached_response(fn):
+    """
+    Caches a GET view's 200 JSON body per (user, generation, endpoint, query args).
+    Apply below @jwt_required(). Cache failures fall through to the view.
+    """
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        cache = response_cache()
+        if cache is None:
+            return fn(*args, **kwargs)
+
+        endpoint = request.endpoint
+        user_id = get_jwt_identity()
+        try:
+            key = cache.key(user_id, cache.generation(user_id), endpoint, request.args)
+            body = cache.backend.get(key)
+        except Exception:
+            CACHE_REQUESTS.inc(endpoint=endpoint, result="error")
+            return fn(*args, **kwargs)
+
+        if body is not None:
+            CACHE_REQUESTS.inc(endpoint=endpoint, result="hit")
+            response = Response(body, status=200, mimetype="application/json")
+            response.headers["X-Cache"] = "HIT"
+            return response
+
+        CACHE_REQUESTS.inc(endpoint=endpoint, result="miss")
+        response = current_app.make_response(fn(*args, **kwargs))
+        if response.status_code == 200 and response.mimetype == "application/json":
+            try:
+                cache.backend.set(key, response.get_data(), cache.ttl)
+            except Exception:
+                CACHE_REQUESTS.inc(endpoint=endpoint, result="error")
+        response.headers["X-Cache"] = "MISS"
+        return response
+
+    return wrapper
+
+
+def cache_stats():
+    stats = {}
+    for _, _, (endpoint, result), _, value in CACHE_REQUESTS.samples():
+        stats.setdefault(endpoint, {"hit": 0, "miss": 0, "error": 0})[result] = value
+    for entry in stats.values():
+        lookups = entry["hit"] + entry["miss"]
+        entry["hit_rate"] = round(entry["hit"] / lookups, 3) if lookups else None
+    return stats
@@ -0,0 +1,217 @@
+"""
+Single-flight coalescing for identical concurrent external lookups.
+
+coalesce(name, key, fn) runs fn once per key at a time. Within a process,
+callers that arrive while a call for the same key is in flight wait for it and
+get its result (or its exception) instead of calling out again.
+
+With SINGLE_FLIGHT_BACKEND=table the process that runs the call also takes a
+row in `single_flight_calls`. Callers in other workers find that row and poll
+it every SINGLE_FLIGHT_POLL_SECONDS until the result is written, and the result
+stays readable for SINGLE_FLIGHT_RESULT_SECONDS so stragglers share it too. A
+row still running after SINGLE_FLIGHT_LOCK_SECONDS belongs to a dead worker and
+is taken over. The table is written on its own short transactions, outside
+the request's session, with the UNMETERED option so polling doesn't count
+against query budgets. Results must be JSON-serializable in this mode.
+
+A caller that waits longer than SINGLE_FLIGHT_WAIT_SECONDS stops waiting and
+makes the call itself.
+"""
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models import SingleFlightCall
+from app.utils.metrics import REGISTRY, UNMETERED
+
+SINGLE_FLIGHT_CALLS = REGISTRY.counter(
+    "servicetrak_single_flight_calls_total",
+    "External lookups by name and outcome: executed (made the call), coalesced_local / "
+    "coalesced_shared (shared an in-process / other worker's call), timeout (gave up waiting).",
+    ("name", "outcome"),
+)
+
+RUNNING, DONE, ERROR = "running", "done", "error"
+# How often (seconds) a process deletes long-expired rows
+CLEANUP_INTERVAL = 60
+
+_OWNER_PREFIX = f"{os.getpid()}:"
+
+
+class SharedCallError(Exception):
+    """Another worker's call for the same key failed; carries its message."""
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0  # callers in this process waiting on it
+
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+_last_cleanup = [0.0]
+
+
+def waiting_callers(name, key):
+    """How many callers in this process are waiting on the in-flight call for name and key."""
+    with _inflight_lock:
+        call = _inflight.get(f"{name}:{key}")
+        return call.waiters if call is not None else 0
+
+
+def coalesce(name, key, fn):
+    """Returns fn(), sharing one in-flight call among concurrent callers with the same name and key."""
+    full_key = f"{name}:{key}"
+    wait_seconds = current_app.config.get("SINGLE_FLIGHT_WAIT_SECONDS", 15)
+
+    with _inflight_lock:
+        call = _inflight.get(full_key)
+        leader = call is None
+        if leader:
+            call = _inflight[full_key] = _Call()
+        else:
+            call.waiters += 1
+
+    if not leader:
+        if call.done.wait(wait_seconds):
+            SINGLE_FLIGHT_CALLS.inc(name=name, outcome="coalesced_local")
+            if call.error is not None:
+                raise call.error
+            return call.result
+        SINGLE_FLIGHT_CALLS.inc(name=name, outcome="timeout")
+        return fn()
+
+    try:
+        if current_app.config.get("SINGLE_FLIGHT_BACKEND", "local") == "table":
+            call.result = _shared_call(name, full_key, fn, wait_seconds)
+        else:
+            SINGLE_FLIGHT_CALLS.inc(name=name, outcome="executed")
+            call.result = fn()
+        return call.result
+    except Exception as e:
+        call.error = e
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(full_key, None)
+        call.done.set()
+
+
+def _connection():
+    return db.engine.connect().execution_options(**{UNMETERED: True})
+
+
+def _acquire(key, owner):
+    """
+    Returns ("leader", None) when this process took the row, ("done", result)
+    for a fresh result, or ("wait", None) while another worker's call is running.
+    """
+    config = current_app.config
+    now = datetime.utcnow()
+    lock_until = now + timedelta(seconds=config.get("SINGLE_FLIGHT_LOCK_SECONDS", 30))
+    table = SingleFlightCall.__table__
+
+    with _connection() as conn:
+        row = conn.execute(
+            select(table.c.status, table.c.result, table.c.error, table.c.expires_at).where(table.c.key == key)
+        ).first()
+
+        if row is None:
+            try:
+                conn.execute(
+                    insert(table).values(key=key, owner=owner, status=RUNNING, expires_at=lock_until)
+                )
+                conn.commit()
+                return "leader", None
+            except IntegrityError:
+                conn.rollback()
+                return "wait", None
+
+        if row.expires_at <= now:
+            # Stale result or abandoned lock: take it over unless another worker just did
+            taken = conn.execute(
+                update(table)
+                .where(table.c.key == key, table.c.expires_at == row.expires_at)
+                .values(owner=owner, status=RUNNING, result=None, error=None, expires_at=lock_until)
+            ).rowcount
+            conn.commit()
+            return ("leader", None) if taken else ("wait", None)
+
+        conn.rollback()
+        if row.status == DONE:
+            return "done", row.result
+        if row.status == ERROR:
+            raise SharedCallError(row.error or "Shared call failed.")
+        return "wait", None
+
+
+def _release(key, owner, result=None, error=None):
+    config = current_app.config
+    now = datetime.utcnow()
+    table = SingleFlightCall.__table__
+    with _connection() as conn:
+        conn.execute(
+            update(table)
+            .where(table.c.key == key, table.c.owner == owner)
+            .values(
+                status=ERROR if error is not None else DONE,
+                result=result,
+                error=None if error is None else (str(error) or error.__class__.__name__)[:500],
+                expires_at=now + timedelta(seconds=config.get("SINGLE_FLIGHT_RESULT_SECONDS", 5)),
+            )
+        )
+        if time.monotonic() - _last_cleanup[0] > CLEANUP_INTERVAL:
+            _last_cleanup[0] = time.monotonic()
+            conn.execute(delete(table).where(table.c.expires_at < now - timedelta(seconds=CLEANUP_INTERVAL)))
+        conn.commit()
+
+
+def _abandon(key, owner):
+    table = SingleFlightCall.__table__
+    with _connection() as conn:
+        conn.execute(delete(table).where(table.c.key == key, table.c.owner == owner))
+        conn.commit()
+
+
+def _shared_call(name, key, fn, wait_seconds):
+    owner = f"{_OWNER_PREFIX}{uuid.uuid4().hex[:12]}"
+    poll = current_app.config.get("SINGLE_FLIGHT_POLL_SECONDS", 0.05)
+    deadline = time.monotonic() + wait_seconds
+
+    while True:
+        state, result = _acquire(key, owner)
+        if state == "done":
+            SINGLE_FLIGHT_CALLS.inc(name=name, outcome="coalesced_shared")
+            return result
+        if state == "leader":
+            break
+        if time.monotonic() >= deadline:
+            SINGLE_FLIGHT_CALLS.inc(name=name, outcome="timeout")
+            return fn()
+        time.sleep(poll)
+
+    SINGLE_FLIGHT_CALLS.inc(name=name, outcome="executed")
+    try:
+        result = fn()
+    except Exception as e:
+        if getattr(e, "retry_after", None) is not None:
+            # Refused locally (an open circuit breaker) without calling out: nothing to share
+            _abandon(key, owner)
+        else:
+            _release(key, owner, error=e)
+        raise
+    _release(key, owner, result=result)
+    return result
+
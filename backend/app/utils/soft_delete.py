@@ -0,0 +1,185 @@
+"""
+Soft delete for vehicles and service records.
+
+Deleting sets `deleted_at` with a single-row UPDATE. A do_orm_execute hook adds
+`deleted_at IS NULL` to every ORM SELECT that touches a soft-deletable model,
+including joins and subqueries, so blueprints don't filter by hand. Records
+and reminders of a deleted vehicle are hidden through the vehicle, which every
+one of their queries joins for the ownership check.
+
+The purge worker (started on the first request, or `flask purge-deleted`)
+hard-deletes soft-deleted rows in chunks of PURGE_CHUNK_SIZE, each in its own
+short transaction, and deletes attachment files from storage between
+transactions rather than inside one.
+"""
+import threading
+from datetime import datetime
+
+from sqlalchemy import delete, event, select
+from sqlalchemy.orm import with_loader_criteria
+
+from app.extensions import db
+from app.models import Reminder, ServiceRecord, ServiceRecordAttachment, SoftDeleteMixin, Vehicle
+from app.utils.db_routing import RoutingSession
+from app.utils.jobs import delete_vehicle_jobs
+from app.utils.metrics import REGISTRY
+from app.utils.storage import delete_attachment_files
+from app.utils.sync import prune_tombstones
+
+# Execution option for the few statements that must see soft-deleted rows
+INCLUDE_DELETED = "include_deleted"
+
+PURGED_ROWS = REGISTRY.counter(
+    "servicetrak_purged_rows_total",
+    "Soft-deleted rows (and their dependents) hard-deleted by the purge worker.",
+    ("table",),
+)
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _hide_soft_deleted(execute_state):
+    if (
+        execute_state.is_select
+        and not execute_state.is_column_load
+        and not execute_state.is_relationship_load
+        and not execute_state.execution_options.get(INCLUDE_DELETED, False)
+    ):
+        execute_state.statement = execute_state.statement.options(
+            with_loader_criteria(SoftDeleteMixin, lambda cls: cls.deleted_at.is_(None), include_aliases=True)
+        )
+
+
+def soft_delete(obj):
+    obj.deleted_at = datetime.utcnow()
+
+
+def _ids(statement):
+    return db.session.execute(statement.execution_options(**{INCLUDE_DELETED: True})).scalars().all()
+
+
+def _purge_records(record_ids):
+    attachments = db.session.execute(
+        select(
+            ServiceRecordAttachment.id,
+            ServiceRecordAttachment.public_id,
+            ServiceRecordAttachment.file_type,
+        ).where(ServiceRecordAttachment.service_record_id.in_(record_ids))
+    ).all()
+    # Don't hold a transaction open across remote storage calls
+    db.session.commit()
+    delete_attachment_files(attachments)
+
+    db.session.execute(
+        delete(ServiceRecordAttachment).where(ServiceRecordAttachment.service_record_id.in_(record_ids))
+    )
+    db.session.execute(delete(ServiceRecord).where(ServiceRecord.id.in_(record_ids)))
+    db.session.commit()
+    PURGED_ROWS.inc(len(attachments), table="service_record_attachments")
+    PURGED_ROWS.inc(len(record_ids), table="service_records")
+
+
+def purge_deleted(chunk_size=500, max_chunks=None):
+    """
+    Hard-deletes soft-deleted service records and vehicles (with their records,
+    attachments and reminders), one chunk per transaction. Stops after
+    max_chunks chunks; returns the number of chunks processed.
+    """
+    chunks = 0
+
+    def budget_left():
+        return max_chunks is None or chunks < max_chunks
+
+    while budget_left():
+        record_ids = _ids(
+            select(ServiceRecord.id).where(ServiceRecord.deleted_at.is_not(None)).limit(chunk_size)
+        )
+        if not record_ids:
+            break
+        _purge_records(record_ids)
+        chunks += 1
+
+    while budget_left():
+        vehicle_ids = _ids(select(Vehicle.id).where(Vehicle.deleted_at.is_not(None)).limit(chunk_size))
+        if not vehicle_ids:
+            break
+
+        for vehicle_id in vehicle_ids:
+            while budget_left():
+                record_ids = _ids(
+                    select(ServiceRecord.id).where(ServiceRecord.vehicle_id == vehicle_id).limit(chunk_size)
+                )
+                if not record_ids:
+                    break
+                _purge_records(record_ids)
+                chunks += 1
+
+            while budget_left():
+                reminder_ids = _ids(select(Reminder.id).where(Reminder.vehicle_id == vehicle_id).limit(chunk_size))
+                if not reminder_ids:
+                    break
+                db.session.execute(delete(Reminder).where(Reminder.id.in_(reminder_ids)))
+                db.session.commit()
+                PURGED_ROWS.inc(len(reminder_ids), table="reminders")
+                chunks += 1
+
+            if not budget_left():
+                break
+            delete_vehicle_jobs(vehicle_id)
+            db.session.execute(delete(Vehicle).where(Vehicle.id == vehicle_id))
+            db.session.commit()
+            PURGED_ROWS.inc(table="vehicles")
+            chunks += 1
+
+    return chunks
+
+
+class PurgeWorker:
+    """Daemon thread that runs purge_deleted (and prunes old sync tombstones) every PURGE_INTERVAL_SECONDS."""
+
+    def __init__(self, app, interval, chunk_size, max_chunks):
+        self.app = app
+        self.interval = interval
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="servicetrak-purge", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            with self.app.app_context():
+                try:
+                    purge_deleted(self.chunk_size, self.max_chunks)
+                    prune_tombstones()
+                except Exception:
+                    db.session.rollback()
+                    self.app.logger.exception("Purging soft-deleted rows failed")
+                finally:
+                    db.session.remove()
+
+
+def init_soft_delete(app):
+    if not app.config.get("PURGE_WORKER_ENABLED", True):
+        return
+
+    worker = PurgeWorker(
+        app,
+        interval=app.config.get("PURGE_INTERVAL_SECONDS", 30),
+        chunk_size=app.config.get("PURGE_CHUNK_SIZE", 500),
+        max_chunks=app.config.get("PURGE_MAX_CHUNKS", 20),
+    )
+    app.extensions["purge_worker"] = worker
+
+    # Started from a request rather than here so pre-forking servers start it in each worker
+    @app.before_request
+    def _start_purge_worker():
+        worker.start()
@@ -0,0 +1,65 @@
+"""
+SQLite production mode: WAL journaling plus per-connection pragmas on the
+primary engine, and a separate pool of read-only (query_only) connections
+that GET requests use through app.utils.db_routing.RoutingSession. With WAL,
+those readers never block on, or get blocked by, the single writer.
+"""
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+
+from app.extensions import db
+
+
+def is_file_sqlite(uri):
+    url = make_url(uri)
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def _pragma_listener(app, read_only=False):
+    pragmas = [
+        ("journal_mode", app.config.get("SQLITE_JOURNAL_MODE", "WAL")),
+        ("busy_timeout", app.config.get("SQLITE_BUSY_TIMEOUT_MS", 5000)),
+        ("synchronous", app.config.get("SQLITE_SYNCHRONOUS", "NORMAL")),
+        ("mmap_size", app.config.get("SQLITE_MMAP_SIZE", 268435456)),
+        ("cache_size", app.config.get("SQLITE_CACHE_SIZE", -64000)),
+    ]
+    if read_only:
+        pragmas.append(("query_only", "ON"))
+
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas:
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+        if not read_only and app.config.get("SQLITE_BEGIN_IMMEDIATE", True):
+            # pysqlite's legacy transaction handling opens a transaction only right
+            # before the first INSERT/UPDATE/DELETE; this makes that BEGIN IMMEDIATE,
+            # so the write lock is taken there and waits out busy_timeout. SELECTs
+            # that come earlier (claim_job's, a view's ownership check) run outside
+            # the transaction and hold no lock, so they don't see a consistent
+            # snapshot with the write and the write must re-check what it read (as
+            # claim_job's UPDATE ... WHERE status = 'queued' does). Reads later in
+            # the same transaction hold the write lock until commit.
+            dbapi_connection.isolation_level = "IMMEDIATE"
+
+    return set_pragmas
+
+
+def init_sqlite(app):
+    uri = app.config.get("SQLALCHEMY_DATABASE_URI", "")
+    if not app.config.get("SQLITE_PRODUCTION_MODE") or not is_file_sqlite(uri):
+        return
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "connect", _pragma_listener(app))
+
+    if app.config.get("SQLITE_READ_POOL_SIZE", 4) > 0:
+        # Flask-SQLAlchemy resolves relative paths against the instance folder; reuse its URL
+        read_engine = create_engine(
+            engine.url,
+            pool_size=app.config.get("SQLITE_READ_POOL_SIZE", 4),
+            max_overflow=app.config.get("SQLITE_READ_POOL_OVERFLOW", 4),
+        )
+        event.listen(read_engine, "connect", _pragma_listener(app, read_only=True))
+        app.extensions["read_engine"] = read_engine
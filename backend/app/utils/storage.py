@@ -1,4 +1,38 @@
-import cloudinary.uploader
+import hashlib
+import hmac
+import os
+import time
+import uuid
+
+from flask import current_app, url_for
+
+from app.utils.metrics import external_call
+
+ATTACHMENT_FOLDER = "servicetrak/service-records"
+IMAGE_EXTENSIONS = {"jpg", "jpeg", "png", "webp"}
+ALLOWED_EXTENSIONS = IMAGE_EXTENSIONS | {"pdf"}
+# File extension -> the format storage reports for it
+UPLOAD_FORMATS = {"jpg": "jpg", "jpeg": "jpg", "png": "png", "webp": "webp", "pdf": "pdf"}
+
+
+def file_extension(file_name):
+    return file_name.rsplit(".", 1)[-1].lower() if file_name and "." in file_name else ""
+
+
+def upload_resource_type(file_name):
+    """
+    Returns the storage resource type for an allowed file name, or None if the
+    extension is not accepted.
+    """
+    ext = file_extension(file_name)
+    if ext not in ALLOWED_EXTENSIONS:
+        return None
+    return "image" if ext in IMAGE_EXTENSIONS else "raw"
+
+
+def upload_format(file_name):
+    """The storage format a direct upload of this file name is limited to, or None."""
+    return UPLOAD_FORMATS.get(file_extension(file_name))
 
 
 def attachment_resource_type(attachment):
@@ -7,14 +41,169 @@ def attachment_resource_type(attachment):
     return "image"
 
 
+def record_folder(record_id):
+    return f"{ATTACHMENT_FOLDER}/{record_id}"
+
+
+def storage_backend():
+    return current_app.config.get("ATTACHMENT_STORAGE", "cloudinary")
+
+
+def cloudinary_sdk():
+    """
+    The Cloudinary SDK, imported and configured on first use rather than at
+    startup; most requests never touch it.
+    """
+    import cloudinary
+    import cloudinary.uploader
+    import cloudinary.utils
+
+    if not current_app.extensions.get("cloudinary_configured"):
+        cloudinary.config(
+            cloud_name=current_app.config.get("CLOUDINARY_CLOUD_NAME"),
+            api_key=current_app.config.get("CLOUDINARY_API_KEY"),
+            api_secret=current_app.config.get("CLOUDINARY_API_SECRET"),
+            secure=True,
+        )
+        current_app.extensions["cloudinary_configured"] = True
+    return cloudinary
+
+
+class CloudinarySigner:
+    """
+    Signs direct browser-to-Cloudinary uploads and verifies the signed upload
+    result Cloudinary hands back to the client.
+    """
+
+    def sign_upload(self, public_id, resource_type, file_format):
+        timestamp = int(time.time())
+        # Cloudinary rejects files of any other format; it has no per-upload size
+        # limit, so size is checked against the stored resource in verify_upload
+        params = {"public_id": public_id, "timestamp": timestamp, "allowed_formats": file_format}
+        cloudinary = cloudinary_sdk()
+        config = cloudinary.config()
+        signature = cloudinary.utils.api_sign_request(params, config.api_secret)
+
+        return {
+            "upload_url": cloudinary.utils.cloudinary_api_url(
+                "upload", resource_type=resource_type
+            ),
+            "fields": {**params, "api_key": config.api_key, "signature": signature},
+        }
+
+    def verify_upload(self, result, resource_type):
+        """
+        Returns the stored file's {"format", "bytes"} when the result's signature
+        is valid, else None. Only public_id and version are signed, so the rest
+        comes from Cloudinary rather than the client.
+        """
+        cloudinary = cloudinary_sdk()
+        if not cloudinary.utils.verify_api_response_signature(
+            result.get("public_id"),
+            result.get("version"),
+            result.get("signature"),
+        ):
+            return None
+
+        import cloudinary.api
+
+        with external_call("cloudinary", "resource"):
+            resource = cloudinary.api.resource(result["public_id"], resource_type=resource_type)
+        return {"format": resource.get("format"), "bytes": resource.get("bytes")}
+
+    def file_url(self, public_id, version, resource_type):
+        url, _ = cloudinary_sdk().utils.cloudinary_url(
+            public_id, version=version, resource_type=resource_type, secure=True
+        )
+        return url
+
+
+class LocalSigner:
+    """
+    Stand-in for Cloudinary used in development and tests. Uploads go to the
+    local receiver in ``app.routes.storage`` and land in ATTACHMENT_LOCAL_DIR.
+    """
+
+    def _sign(self, *parts):
+        key = current_app.config["SECRET_KEY"].encode()
+        message = "|".join(str(part) for part in parts).encode()
+        return hmac.new(key, message, hashlib.sha256).hexdigest()
+
+    def sign_upload(self, public_id, resource_type, file_format):
+        timestamp = int(time.time())
+        return {
+            "upload_url": url_for("storage.local_upload", _external=True),
+            "fields": {
+                "public_id": public_id,
+                "resource_type": resource_type,
+                "allowed_formats": file_format,
+                "timestamp": timestamp,
+                "signature": self._sign(public_id, resource_type, file_format, timestamp),
+            },
+        }
+
+    def verify_upload_fields(self, fields, max_age):
+        try:
+            timestamp = int(fields.get("timestamp") or 0)
+        except (TypeError, ValueError):
+            return False
+        expected = self._sign(
+            fields.get("public_id"), fields.get("resource_type"), fields.get("allowed_formats"), timestamp
+        )
+        return (
+            hmac.compare_digest(expected, fields.get("signature") or "")
+            and 0 <= time.time() - timestamp <= max_age
+        )
+
+    def sign_result(self, public_id, version, file_format, size):
+        return self._sign(public_id, version, file_format, size)
+
+    def verify_upload(self, result, resource_type):
+        expected = self.sign_result(
+            result.get("public_id"), result.get("version"), result.get("format"), result.get("bytes")
+        )
+        if not hmac.compare_digest(expected, str(result.get("signature") or "")):
+            return None
+        return {"format": result.get("format"), "bytes": result.get("bytes")}
+
+    def file_url(self, public_id, version, resource_type):
+        return url_for("storage.local_file", public_id=public_id, _external=True)
+
+
+def get_upload_signer():
+    if storage_backend() == "local":
+        return LocalSigner()
+    return CloudinarySigner()
+
+
+def new_public_id(record_id):
+    return f"{record_folder(record_id)}/{uuid.uuid4().hex}"
+
+
+def local_file_path(public_id):
+    root = os.path.abspath(current_app.config["ATTACHMENT_LOCAL_DIR"])
+    path = os.path.abspath(os.path.join(root, public_id))
+    if os.path.commonpath([root, path]) != root:
+        raise ValueError("Invalid public_id.")
+    return path
+
+
+def delete_stored_file(public_id, resource_type):
+    if storage_backend() == "local":
+        path = local_file_path(public_id)
+        if os.path.exists(path):
+            os.remove(path)
+        return
+
+    cloudinary = cloudinary_sdk()
+    with external_call("cloudinary", "destroy"):
+        cloudinary.uploader.destroy(public_id, resource_type=resource_type)
+
+
 def delete_attachment_file(attachment):
     if not attachment or not attachment.public_id:
         return
-
-    cloudinary.uploader.destroy(
-        attachment.public_id,
-        resource_type=attachment_resource_type(attachment),
-    )
+    delete_stored_file(attachment.public_id, attachment_resource_type(attachment))
 
 
 def delete_attachment_files(attachments):
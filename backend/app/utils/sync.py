@@ -0,0 +1,104 @@
+"""
+Delta sync support for GET /sync.
+
+Sync tokens are signed watermarks: "everything up to time T". A sync returns
+rows whose updated_at is after T (indexed (parent, updated_at) scans) plus
+tombstones written by the delete routes. Deleting a vehicle is reported as one
+vehicle tombstone; clients drop its records, reminders and attachments with it
+(and a record's attachments with the record).
+
+Every flush that touches a synced model stamps users.sync_changed_at, so a
+client whose token is newer than that stamp is answered from one primary key
+lookup. New tokens lag the clock by SYNC_OVERLAP_SECONDS so writes that
+committed after a sync read are picked up next time; clients upsert by id, so
+rows repeated from the overlap are harmless.
+"""
+from datetime import datetime, timedelta
+from itertools import chain
+
+from flask import current_app
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy import delete, event, or_, select, update
+
+from app.extensions import db
+from app.models import Reminder, ServiceRecord, ServiceRecordAttachment, Tombstone, User, Vehicle
+from app.utils.db_routing import RoutingSession
+
+TOKEN_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+
+class SyncTokenError(ValueError):
+    pass
+
+
+class SyncTokenExpired(SyncTokenError):
+    """Older than the tombstone retention, so deletions may have been pruned."""
+
+
+def _serializer():
+    return URLSafeSerializer(current_app.config["SECRET_KEY"], salt="sync-token")
+
+
+def issue_token(now=None):
+    now = now or datetime.utcnow()
+    overlap = timedelta(seconds=current_app.config.get("SYNC_OVERLAP_SECONDS", 5))
+    return _serializer().dumps({"t": (now - overlap).strftime(TOKEN_FORMAT)})
+
+
+def read_token(token):
+    """Returns the token's watermark. Raises SyncTokenError for invalid or expired tokens."""
+    try:
+        since = datetime.strptime(_serializer().loads(token)["t"], TOKEN_FORMAT)
+    except (BadSignature, KeyError, TypeError, ValueError):
+        raise SyncTokenError("Invalid sync token.")
+
+    retention = timedelta(days=current_app.config.get("SYNC_TOMBSTONE_RETENTION_DAYS", 30))
+    if since < datetime.utcnow() - retention:
+        raise SyncTokenExpired("Sync token expired; sync again without a token.")
+    return since
+
+
+def record_deletion(user_id, entity, entity_id):
+    """Adds a tombstone to the session; commits with the delete."""
+    db.session.add(Tombstone(user_id=user_id, entity=entity, entity_id=entity_id))
+
+
+def prune_tombstones():
+    retention = timedelta(days=current_app.config.get("SYNC_TOMBSTONE_RETENTION_DAYS", 30))
+    result = db.session.execute(delete(Tombstone).where(Tombstone.deleted_at < datetime.utcnow() - retention))
+    db.session.commit()
+    return result.rowcount
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _stamp_sync_changes(session, flush_context):
+    user_ids, vehicle_ids, record_ids = set(), set(), set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Vehicle):
+            user_ids.add(obj.user_id)
+        elif isinstance(obj, (ServiceRecord, Reminder)):
+            vehicle_ids.add(obj.vehicle_id)
+        elif isinstance(obj, ServiceRecordAttachment):
+            record_ids.add(obj.service_record_id)
+
+    conditions = []
+    if user_ids:
+        conditions.append(User.id.in_(user_ids))
+    if vehicle_ids:
+        conditions.append(User.id.in_(select(Vehicle.user_id).where(Vehicle.id.in_(vehicle_ids))))
+    if record_ids:
+        conditions.append(User.id.in_(
+            select(Vehicle.user_id)
+            .join(ServiceRecord, ServiceRecord.vehicle_id == Vehicle.id)
+            .where(ServiceRecord.id.in_(record_ids))
+        ))
+    if not conditions:
+        return
+
+    session.execute(
+        update(User)
+        .where(or_(*conditions))
+        # Keep the profile's updated_at; this is bookkeeping, not a profile change
+        .values(sync_changed_at=datetime.utcnow(), updated_at=User.updated_at)
+        .execution_options(synchronize_session=False)
+    )
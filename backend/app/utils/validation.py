@@ -38,3 +38,43 @@ def normalize_vin(value):
     if not vin:
         return None
     return vin if len(vin) == 17 else None
+
+
+def parse_id_list(value):
+    if value in (None, ""):
+        return []
+    ids = []
+    for part in str(value).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        parsed = parse_non_negative_int(part)
+        if not parsed:
+            return None
+        if parsed not in ids:
+            ids.append(parsed)
+    return ids
+
+
+VIN_TRANSLITERATION = {
+    **{str(d): d for d in range(10)},
+    "A": 1, "B": 2, "C": 3, "D": 4, "E": 5, "F": 6, "G": 7, "H": 8,
+    "J": 1, "K": 2, "L": 3, "M": 4, "N": 5, "P": 7, "R": 9,
+    "S": 2, "T": 3, "U": 4, "V": 5, "W": 6, "X": 7, "Y": 8, "Z": 9,
+}
+VIN_WEIGHTS = (8, 7, 6, 5, 4, 3, 2, 10, 0, 9, 8, 7, 6, 5, 4, 3, 2)
+
+
+def vin_check_digit(vin):
+    """Returns the expected 9th-position check digit for a 17-character VIN, or None."""
+    vin = (vin or "").upper()
+    if len(vin) != 17 or any(ch not in VIN_TRANSLITERATION for ch in vin):
+        return None
+    total = sum(VIN_TRANSLITERATION[ch] * weight for ch, weight in zip(vin, VIN_WEIGHTS))
+    remainder = total % 11
+    return "X" if remainder == 10 else str(remainder)
+
+
+def has_valid_vin_checksum(vin):
+    check = vin_check_digit(vin)
+    return check is not None and vin[8].upper() == check
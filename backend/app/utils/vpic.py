@@ -0,0 +1,303 @@
+"""
+Offline VIN decoding from a local snapshot of NHTSA vPIC's pattern tables.
+
+`flask load-vpic DUMP` turns a flat export of vPIC's WMI / pattern / element
+tables (one row per pattern element, see load_dump) into a gzipped JSON
+snapshot at VPIC_SNAPSHOT_PATH. The snapshot is loaded on the first decode
+into a per-WMI prefix index over the VIN's descriptor characters (positions
+4-8 and 10-17). A vPIC pattern key such as "CM8[2-6]*|*A" is stored under its
+literal prefix ("CM8"), with the remaining positions checked per pattern, so a
+lookup is at most one hash probe per distinct prefix length plus a few
+character tests. No network is involved; a decode takes microseconds.
+
+Where several patterns match, each field comes from the most specific one
+(fewest wildcards), as vPIC does. Model year comes from position 10 (with
+position 7 choosing the 1980-2009 or 2010-2039 cycle) and the make from the
+WMI unless a pattern sets one.
+"""
+import csv
+import gc
+import gzip
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from flask import current_app
+
+SNAPSHOT_VERSION = 1
+FIELDS = ("year", "make", "model", "trim", "engine")
+
+# vPIC element name -> (field, priority); a lower priority wins within one pattern
+ELEMENT_FIELDS = {
+    "Make": ("make", 0),
+    "Model": ("model", 0),
+    "Trim": ("trim", 0),
+    "Series": ("trim", 1),
+    "Engine Model": ("engine", 0),
+    "Engine Configuration": ("engine", 1),
+}
+
+VIN_CHARS = "ABCDEFGHJKLMNPRSTUVWXYZ0123456789"
+# Position 10; repeats every 30 years
+YEAR_CODES = "ABCDEFGHJKLMNPRSTVWXY123456789"
+KEY_LENGTH = 13
+# How often (seconds) a process checks whether the snapshot file was replaced
+RELOAD_CHECK_SECONDS = 60
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def model_year(vin):
+    """Model year from position 10, or None when it isn't a year code."""
+    index = YEAR_CODES.find(vin[9])
+    if index < 0:
+        return None
+    # Passenger cars and light trucks use a letter in position 7 from 2010
+    return (2010 if vin[6].isalpha() else 1980) + index
+
+
+def wmi_of(vin):
+    # Manufacturers building fewer than 1,000 vehicles a year share WMIs ending in 9
+    # and are told apart by positions 12-14
+    return vin[:3] + vin[11:14] if vin[2] == "9" else vin[:3]
+
+
+def descriptor_key(vin):
+    return vin[3:8] + vin[9:17]
+
+
+def _expand(pattern):
+    """Splits a vPIC key into per-position choices: '*' or a string of allowed characters."""
+    pattern = pattern.replace("|", "")
+    if "[" not in pattern:
+        positions = list(pattern)
+    else:
+        positions = _expand_classes(pattern)
+    if len(positions) > KEY_LENGTH:
+        raise SnapshotError(f"Pattern {pattern!r} is longer than {KEY_LENGTH} characters.")
+    return positions
+
+
+def _expand_classes(pattern):
+    positions = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "[":
+            end = pattern.index("]", i)
+            body = pattern[i + 1:end]
+            chars = set()
+            j = 0
+            while j < len(body):
+                if j + 2 < len(body) and body[j + 1] == "-":
+                    lo, hi = body[j], body[j + 2]
+                    chars.update(c for c in VIN_CHARS if lo <= c <= hi)
+                    j += 3
+                else:
+                    chars.add(body[j])
+                    j += 1
+            positions.append("".join(sorted(chars)))
+            i = end + 1
+        else:
+            positions.append(char)
+            i += 1
+    return positions
+
+
+class VpicIndex:
+    """
+    In-memory index over one snapshot: WMI -> make, and WMI -> (prefix lengths,
+    {literal prefix: [(year_from, year_to, specificity, tail checks, fields)]}).
+    """
+
+    def __init__(self, snapshot):
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            raise SnapshotError("Unsupported vPIC snapshot version.")
+        self.created_at = snapshot.get("created_at")
+        self.makes = {wmi: entry.get("make") for wmi, entry in snapshot.get("wmi", {}).items()}
+        buckets = {}
+        self.pattern_count = 0
+        for wmi, year_from, year_to, keys, fields in snapshot.get("patterns", []):
+            positions = _expand(keys.upper())
+            prefix_length = 0
+            for choice in positions:
+                if len(choice) != 1 or choice == "*":
+                    break
+                prefix_length += 1
+            prefix = "".join(positions[:prefix_length])
+            tail = tuple(
+                (offset, chars)
+                for offset, chars in enumerate(positions[prefix_length:], prefix_length)
+                if chars != "*"
+            )
+            specificity = prefix_length + len(tail)
+            buckets.setdefault(wmi, {}).setdefault(prefix, []).append(
+                (year_from or 0, year_to or 9999, specificity, tail, fields)
+            )
+            self.pattern_count += 1
+
+        self.prefixes = {
+            wmi: (tuple(sorted({len(prefix) for prefix in table})), table)
+            for wmi, table in buckets.items()
+        }
+
+    def _matches(self, wmi, key, year):
+        lengths, table = self.prefixes[wmi]
+        for length in lengths:
+            for year_from, year_to, specificity, tail, fields in table.get(key[:length], ()):
+                if year is not None and not year_from <= year <= year_to:
+                    continue
+                if all(key[offset] in chars for offset, chars in tail):
+                    yield specificity, fields
+
+    def decode(self, vin):
+        """
+        Decodes a 17-character VIN. Returns the five vehicle fields (None when
+        unresolved) plus `resolved_fields`, or None for an unknown WMI.
+        """
+        wmi = wmi_of(vin)
+        make = self.makes.get(wmi)
+        if wmi not in self.prefixes and make is None:
+            return None
+
+        year = model_year(vin)
+        best = {}
+        if wmi in self.prefixes:
+            for specificity, fields in self._matches(wmi, descriptor_key(vin), year):
+                for field, value in fields.items():
+                    if field not in best or specificity > best[field][0]:
+                        best[field] = (specificity, value)
+
+        decoded = {field: best[field][1] if field in best else None for field in FIELDS}
+        decoded["year"] = year
+        decoded["make"] = decoded["make"] or make
+        decoded["resolved_fields"] = [field for field in FIELDS if decoded[field] is not None]
+        return decoded
+
+
+def load_dump(path):
+    """
+    Builds a snapshot from a CSV export of vPIC's pattern tables, one row per
+    pattern element, with the columns
+
+        wmi, make, year_from, year_to, keys, element, value
+
+    (Wmi.Wmi, Make.Name, Wmi_VinSchema.YearFrom/YearTo, Pattern.Keys,
+    Element.Name and the attribute's display value), or reads an existing
+    snapshot (.json / .json.gz) as is.
+    """
+    if path.endswith((".json", ".json.gz")):
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        VpicIndex(snapshot)  # validates
+        return snapshot
+
+    opener = gzip.open if path.endswith(".gz") else open
+    wmis = {}
+    patterns = {}
+    with opener(path, "rt", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            wmi = (row.get("wmi") or "").strip().upper()
+            if not wmi:
+                continue
+            make = (row.get("make") or "").strip()
+            if make:
+                wmis.setdefault(wmi, {"make": make})
+
+            mapped = ELEMENT_FIELDS.get((row.get("element") or "").strip())
+            value = (row.get("value") or "").strip()
+            keys = (row.get("keys") or "").strip().upper()
+            if mapped is None or not value or not keys:
+                continue
+            year_from = int(row["year_from"]) if (row.get("year_from") or "").strip() else None
+            year_to = int(row["year_to"]) if (row.get("year_to") or "").strip() else None
+            fields = patterns.setdefault((wmi, year_from, year_to, keys), {})
+            field, priority = mapped
+            if field not in fields or priority < fields[field][0]:
+                fields[field] = (priority, value)
+
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "created_at": datetime.utcnow().isoformat(),
+        "wmi": wmis,
+        "patterns": [
+            [wmi, year_from, year_to, keys, {field: value for field, (_, value) in fields.items()}]
+            for (wmi, year_from, year_to, keys), fields in sorted(
+                patterns.items(), key=lambda item: (item[0][0], item[0][3], item[0][1] or 0)
+            )
+        ],
+    }
+    VpicIndex(snapshot)
+    return snapshot
+
+
+def write_snapshot(snapshot, path):
+    """Writes the snapshot atomically, so running processes never read a partial file."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(snapshot, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+class _Loaded:
+    __slots__ = ("path", "mtime", "index", "checked_at")
+
+    def __init__(self, path, mtime, index):
+        self.path = path
+        self.mtime = mtime
+        self.index = index
+        self.checked_at = time.monotonic()
+
+
+_lock = threading.Lock()
+
+
+def local_index():
+    """The index for VPIC_SNAPSHOT_PATH, loaded on first use and reloaded when the file changes; None without one."""
+    path = current_app.config.get("VPIC_SNAPSHOT_PATH")
+    if not path:
+        return None
+
+    loaded = current_app.extensions.get("vpic_index")
+    if loaded is not None and loaded.path == path and time.monotonic() - loaded.checked_at < RELOAD_CHECK_SECONDS:
+        return loaded.index
+
+    with _lock:
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            current_app.extensions["vpic_index"] = _Loaded(path, None, None)
+            return None
+        loaded = current_app.extensions.get("vpic_index")
+        if loaded is not None and loaded.path == path and loaded.mtime == mtime:
+            loaded.checked_at = time.monotonic()
+            return loaded.index
+
+        # Hundreds of thousands of small tuples: pausing the cyclic GC halves the load time
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                index = VpicIndex(json.load(f))
+        except (OSError, ValueError):
+            current_app.logger.exception("Failed to load vPIC snapshot %s", path)
+            index = None
+        finally:
+            # Leave the GC off if the host process had turned it off itself
+            if gc_was_enabled:
+                gc.enable()
+        current_app.extensions["vpic_index"] = _Loaded(path, mtime, index)
+        return index
+
+
+def decode_vin_local(vin):
+    index = local_index()
+    if index is None:
+        return None
+    return index.decode(vin.upper())
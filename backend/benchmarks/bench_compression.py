@@ -0,0 +1,68 @@
+"""
+Compression level sweep over real list payloads, to pick COMPRESSION_LEVELS.
+
+    python -m benchmarks.bench_compression --scale 1000 --iterations 5
+
+Fetches the uncompressed vehicle, service record and reminder lists for a
+seeded user, then reports size, ratio and compression time per encoding and
+level (br/zstd only when the optional packages are installed).
+"""
+import argparse
+import os
+import tempfile
+import time
+
+_db_dir = tempfile.mkdtemp(prefix="servicetrak-bench-")
+os.environ.setdefault("FLASK_ENV", "development")
+os.environ.setdefault("JWT_SECRET_KEY", "bench-jwt-secret-with-at-least-32-bytes")
+os.environ.setdefault("RESPONSE_CACHE_BACKEND", "off")
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(_db_dir, "bench.db")
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.utils.compression import ENCODERS, compress_body  # noqa: E402
+from benchmarks.datasets import PASSWORD, seed_user_dataset  # noqa: E402
+
+PAYLOADS = ("/vehicles/", "/service-records/?include=attachments", "/reminders/")
+LEVELS = {"gzip": (1, 3, 6, 9), "br": (1, 4, 6, 9, 11), "zstd": (1, 3, 6, 12, 19)}
+
+
+def fetch_payloads(app, scale):
+    with app.app_context():
+        db.create_all()
+        email = "compression@bench.local"
+        seed_user_dataset(email, scale)
+
+    client = app.test_client()
+    token = client.post("/auth/login", json={"email": email, "password": PASSWORD}).get_json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}", "Accept-Encoding": "identity"}
+    return {path: client.get(path, headers=headers).get_data() for path in PAYLOADS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    payloads = fetch_payloads(create_app(), args.scale)
+
+    for path, data in payloads.items():
+        print(f"{path}  {len(data):,} bytes")
+        for encoding in ENCODERS:
+            for level in LEVELS[encoding]:
+                timings = []
+                for _ in range(args.iterations):
+                    start = time.perf_counter()
+                    compressed = compress_body(data, encoding, level)
+                    timings.append(time.perf_counter() - start)
+                best = min(timings)
+                print(
+                    f"  {encoding:<5} level={level:<3} bytes={len(compressed):>10,} "
+                    f"ratio={len(data) / len(compressed):6.1f}x time={best * 1000:8.2f}ms "
+                    f"throughput={len(data) / best / 1e6:8.1f}MB/s"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+"""
+Endpoint microbenchmarks over seeded datasets.
+
+    python -m benchmarks.bench_endpoints --scales 10,1000,100000 --output results.json
+    python -m benchmarks.bench_endpoints --scales 10,1000 --compare results.json
+    python -m benchmarks.bench_endpoints --scales 1000 --accept-encoding gzip
+
+Every route in the auth, vehicles, service_records, reminders and attachments
+blueprints is exercised through the Flask test client against a SQLite file
+database. NHTSA and Cloudinary are replaced by in-process fakes. Latency comes
+from an untraced pass; allocations (tracemalloc peak) from a separate pass.
+With --accept-encoding, timings include response compression and
+response_bytes is the size on the wire.
+"""
+import argparse
+import io
+import itertools
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+_db_dir = tempfile.mkdtemp(prefix="servicetrak-bench-")
+os.environ.setdefault("FLASK_ENV", "development")
+os.environ.setdefault("JWT_SECRET_KEY", "bench-jwt-secret-with-at-least-32-bytes")
+# Measure the views themselves, not response cache hits
+os.environ.setdefault("RESPONSE_CACHE_BACKEND", "off")
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(_db_dir, "bench.db")
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import ServiceRecordAttachment  # noqa: E402
+
+from benchmarks.datasets import PASSWORD, seed_user_dataset  # noqa: E402
+from benchmarks.fakes import external_fakes  # noqa: E402
+
+_unique = itertools.count(1)
+
+
+class BenchContext:
+    def __init__(self, client, email, scale, accept_encoding="identity"):
+        self.client = client
+        self.email = email
+        self.scale = scale
+        self.accept_encoding = accept_encoding
+        self.token = None
+        self.vehicle_id = None
+        self.record_id = None
+        self.reminder_id = None
+
+    @property
+    def headers(self):
+        return {"Authorization": f"Bearer {self.token}"}
+
+    def api(self, method, path, **kwargs):
+        response = self.client.open(path, method=method, headers=self.headers, **kwargs)
+        if response.status_code >= 400:
+            raise RuntimeError(f"{method} {path} -> {response.status_code}: {response.get_data(as_text=True)}")
+        return response.get_json()
+
+    def new_vin(self):
+        return f"2T1BURHE{next(_unique):09d}"
+
+    def new_vehicle(self):
+        return self.api("POST", "/vehicles/", json={"nickname": "Bench", "vin": self.new_vin()})["vehicle"]["id"]
+
+    def new_record(self):
+        return self.api("POST", "/service-records/", json={
+            "vehicle_id": self.vehicle_id,
+            "title": "Oil Change",
+            "service_date": "2026-01-15",
+            "mileage": "12000",
+            "cost": "89.50",
+        })["service_record"]["id"]
+
+    def new_reminder(self):
+        return self.api("POST", "/reminders/", json={
+            "vehicle_id": self.vehicle_id, "title": "Rotate tires", "due_mileage": "15000",
+        })["reminder"]["id"]
+
+    def new_attachment(self):
+        attachment = ServiceRecordAttachment(
+            service_record_id=self.record_id,
+            file_name="bench.pdf",
+            file_url="https://res.cloudinary.example/bench.pdf",
+            public_id="servicetrak/service-records/bench",
+            file_type="application/pdf",
+        )
+        db.session.add(attachment)
+        db.session.commit()
+        return attachment.id
+
+    def direct_upload_result(self):
+        grant = self.api(
+            "POST",
+            f"/service-records/{self.record_id}/attachments/upload-url",
+            json={"file_name": "bench.pdf", "file_type": "application/pdf"},
+        )
+        result = self.client.post(
+            "/storage/local-upload",
+            data={**grant["fields"], "file": (io.BytesIO(b"%PDF-1.4 bench"), "bench.pdf")},
+            content_type="multipart/form-data",
+        ).get_json()
+        return {"upload_token": grant["upload_token"], "result": result}
+
+
+def _update_token(ctx, response):
+    ctx.token = response.get_json()["access_token"]
+
+
+def _pdf_upload(ctx):
+    return {
+        "data": {"file": (io.BytesIO(b"%PDF-1.4 bench"), "bench.pdf")},
+        "content_type": "multipart/form-data",
+    }
+
+
+# (name, method, path(ctx, prepared), request kwargs(ctx, prepared), prepare(ctx), after(ctx, response))
+SCENARIOS = [
+    ("auth.health", "GET", lambda c, p: "/auth/health", None, None, None),
+    ("auth.register", "POST", lambda c, p: "/auth/register",
+     lambda c, p: {"json": {"email": f"bench-{next(_unique)}@example.com", "password": PASSWORD}}, None, None),
+    ("auth.login", "POST", lambda c, p: "/auth/login",
+     lambda c, p: {"json": {"email": c.email, "password": PASSWORD}}, None, None),
+    ("auth.profile", "GET", lambda c, p: "/auth/profile", None, None, None),
+    ("auth.update", "PUT", lambda c, p: "/auth/update",
+     lambda c, p: {"json": {"first_name": f"Bench{next(_unique)}"}}, None, _update_token),
+
+    ("vehicles.health", "GET", lambda c, p: "/vehicles/health", None, None, None),
+    ("vehicles.create", "POST", lambda c, p: "/vehicles/",
+     lambda c, p: {"json": {"nickname": "Bench", "vin": c.new_vin()}}, None, None),
+    ("vehicles.list", "GET", lambda c, p: "/vehicles/", None, None, None),
+    ("vehicles.get", "GET", lambda c, p: f"/vehicles/{c.vehicle_id}", None, None, None),
+    ("vehicles.overview", "GET", lambda c, p: f"/vehicles/{c.vehicle_id}/overview", None, None, None),
+    ("vehicles.update", "PUT", lambda c, p: f"/vehicles/{c.vehicle_id}",
+     lambda c, p: {"json": {"nickname": f"Bench {next(_unique)}"}}, None, None),
+    ("vehicles.delete", "DELETE", lambda c, p: f"/vehicles/{p}", None, lambda c: c.new_vehicle(), None),
+    ("vehicles.decode_vin", "POST", lambda c, p: f"/vehicles/{c.vehicle_id}/decode-vin", None, None, None),
+    ("vehicles.decode_preview", "POST", lambda c, p: "/vehicles/decode",
+     lambda c, p: {"json": {"vin": "1HGCM82633A004352"}}, None, None),
+    ("vehicles.recalls", "GET", lambda c, p: f"/vehicles/{c.vehicle_id}/recalls", None, None, None),
+
+    ("service_records.health", "GET", lambda c, p: "/service-records/health", None, None, None),
+    ("service_records.create", "POST", lambda c, p: "/service-records/",
+     lambda c, p: {"json": {"vehicle_id": c.vehicle_id, "title": "Oil Change", "service_date": "2026-01-15"}},
+     None, None),
+    ("service_records.list", "GET", lambda c, p: "/service-records/", None, None, None),
+    ("service_records.list_vehicle", "GET", lambda c, p: f"/service-records/?vehicle_id={c.vehicle_id}",
+     None, None, None),
+    ("service_records.list_with_attachments", "GET",
+     lambda c, p: f"/service-records/?vehicle_id={c.vehicle_id}&include=attachments", None, None, None),
+    ("service_records.get", "GET", lambda c, p: f"/service-records/{c.record_id}", None, None, None),
+    ("service_records.update", "PUT", lambda c, p: f"/service-records/{c.record_id}",
+     lambda c, p: {"json": {"notes": f"note {next(_unique)}"}}, None, None),
+    ("service_records.delete", "DELETE", lambda c, p: f"/service-records/{p}", None,
+     lambda c: c.new_record(), None),
+
+    ("reminders.health", "GET", lambda c, p: "/reminders/health", None, None, None),
+    ("reminders.create", "POST", lambda c, p: "/reminders/",
+     lambda c, p: {"json": {"vehicle_id": c.vehicle_id, "title": "Rotate tires", "due_mileage": "15000"}},
+     None, None),
+    ("reminders.list", "GET", lambda c, p: "/reminders/", None, None, None),
+    ("reminders.list_open", "GET", lambda c, p: "/reminders/?completed=false", None, None, None),
+    ("reminders.get", "GET", lambda c, p: f"/reminders/{c.reminder_id}", None, None, None),
+    ("reminders.update", "PUT", lambda c, p: f"/reminders/{c.reminder_id}",
+     lambda c, p: {"json": {"notes": f"note {next(_unique)}"}}, None, None),
+    ("reminders.delete", "DELETE", lambda c, p: f"/reminders/{p}", None, lambda c: c.new_reminder(), None),
+
+    ("attachments.list", "GET", lambda c, p: f"/service-records/{c.record_id}/attachments", None, None, None),
+    ("attachments.list_batch", "GET", lambda c, p: f"/service-records/attachments?vehicle_id={c.vehicle_id}",
+     None, None, None),
+    ("attachments.upload", "POST", lambda c, p: f"/service-records/{c.record_id}/attachments",
+     lambda c, p: _pdf_upload(c), None, None),
+    ("attachments.upload_url", "POST", lambda c, p: f"/service-records/{c.record_id}/attachments/upload-url",
+     lambda c, p: {"json": {"file_name": "bench.pdf", "file_type": "application/pdf"}}, None, None),
+    ("attachments.confirm", "POST", lambda c, p: f"/service-records/{c.record_id}/attachments/confirm",
+     lambda c, p: {"json": p}, lambda c: c.direct_upload_result(), None),
+    ("attachments.delete", "DELETE", lambda c, p: f"/service-records/attachments/{p}", None,
+     lambda c: c.new_attachment(), None),
+]
+
+
+def _query_count(response):
+    match = re.search(r'desc="(\d+) queries"', response.headers.get("Server-Timing", ""))
+    return int(match.group(1)) if match else None
+
+
+def _call(ctx, scenario):
+    name, method, path_fn, kwargs_fn, prepare, after = scenario
+    prepared = prepare(ctx) if prepare else None
+    path = path_fn(ctx, prepared)
+    kwargs = kwargs_fn(ctx, prepared) if kwargs_fn else {}
+
+    headers = {**ctx.headers, "Accept-Encoding": ctx.accept_encoding}
+    start = time.perf_counter()
+    response = ctx.client.open(path, method=method, headers=headers, **kwargs)
+    elapsed = time.perf_counter() - start
+
+    if response.status_code >= 400:
+        raise RuntimeError(f"{name}: {method} {path} -> {response.status_code}: {response.get_data(as_text=True)}")
+    if after:
+        after(ctx, response)
+    return elapsed, response
+
+
+def run_scenario(ctx, scenario, iterations, alloc_iterations):
+    _call(ctx, scenario)  # warm-up
+
+    timings = []
+    queries = None
+    for _ in range(iterations):
+        elapsed, response = _call(ctx, scenario)
+        timings.append(elapsed)
+        queries = _query_count(response)
+
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(alloc_iterations):
+            base, _peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            _call(ctx, scenario)
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    return {
+        "endpoint": scenario[0],
+        "method": scenario[1],
+        "iterations": iterations,
+        "mean_ms": round(statistics.fmean(timings) * 1000, 3),
+        "p50_ms": round(timings[len(timings) // 2] * 1000, 3),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000, 3),
+        "min_ms": round(timings[0] * 1000, 3),
+        "alloc_peak_kb": round(statistics.fmean(peaks) / 1024, 1) if peaks else None,
+        "queries": queries,
+        "response_bytes": len(response.get_data()),
+    }
+
+
+def run_scale(app, scale, iterations, alloc_iterations, only=None, accept_encoding="identity"):
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
+        email = f"bench-{scale}@example.com"
+        seed_user_dataset(email, scale)
+
+        ctx = BenchContext(app.test_client(), email, scale, accept_encoding)
+        login = ctx.client.post("/auth/login", json={"email": email, "password": PASSWORD}).get_json()
+        ctx.token = login["access_token"]
+        ctx.vehicle_id = ctx.api("GET", "/vehicles/")["vehicles"][-1]["id"]
+        ctx.record_id = ctx.new_record()
+        ctx.reminder_id = ctx.new_reminder()
+        ctx.new_attachment()
+
+        results = []
+        for scenario in SCENARIOS:
+            if only and not any(scenario[0].startswith(prefix) for prefix in only):
+                continue
+            result = run_scenario(ctx, scenario, iterations, alloc_iterations)
+            result["scale"] = scale
+            results.append(result)
+            print(
+                f"  {scenario[0]:<42} p50={result['p50_ms']:>9.2f}ms "
+                f"p95={result['p95_ms']:>9.2f}ms alloc={result['alloc_peak_kb']:>9.1f}KB "
+                f"queries={result['queries']} bytes={result['response_bytes']}",
+                flush=True,
+            )
+        return results
+
+
+def compare(results, baseline_path, threshold):
+    with open(baseline_path) as fh:
+        baseline = {(r["scale"], r["endpoint"]): r for r in json.load(fh)["results"]}
+
+    regressions = []
+    for result in results:
+        old = baseline.get((result["scale"], result["endpoint"]))
+        if not old:
+            continue
+        for metric in ("p50_ms", "alloc_peak_kb", "queries", "response_bytes"):
+            before, after = old.get(metric), result.get(metric)
+            if before and after is not None and after > before * (1 + threshold):
+                regressions.append((result["scale"], result["endpoint"], metric, before, after))
+
+    for scale, endpoint, metric, before, after in regressions:
+        print(f"REGRESSION scale={scale} {endpoint} {metric}: {before} -> {after}")
+    if not regressions:
+        print(f"No regressions above {threshold:.0%} against {baseline_path}.")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ServiceTrak endpoint microbenchmarks.")
+    parser.add_argument("--scales", default="10,1000,100000", help="rows per user, comma-separated")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--large-iterations", type=int, default=3, help="iterations for scales >= 10000")
+    parser.add_argument("--alloc-iterations", type=int, default=3)
+    parser.add_argument("--only", default="", help="comma-separated endpoint prefixes, e.g. vehicles.,auth.login")
+    parser.add_argument("--output", default=None, help="JSON results path")
+    parser.add_argument("--compare", default=None, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression")
+    parser.add_argument("--accept-encoding", default="identity",
+                        help="Accept-Encoding sent with every request, e.g. gzip or br")
+    args = parser.parse_args()
+
+    app = create_app()
+    app.config.update(
+        ADMISSION_CONTROL_ENABLED=False,
+        QUERY_BUDGET_MODE="off",
+        ATTACHMENT_STORAGE="local",
+        ATTACHMENT_LOCAL_DIR=os.path.join(_db_dir, "uploads"),
+    )
+    only = [prefix.strip() for prefix in args.only.split(",") if prefix.strip()]
+
+    results = []
+    with external_fakes():
+        for scale in [int(s) for s in args.scales.split(",")]:
+            iterations = args.large_iterations if scale >= 10000 else args.iterations
+            print(f"scale={scale} iterations={iterations}", flush=True)
+            results.extend(run_scale(app, scale, iterations, args.alloc_iterations, only, args.accept_encoding))
+
+    output = args.output or os.path.join(
+        os.path.dirname(__file__), "results", f"endpoints-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as fh:
+        json.dump({
+            "meta": {
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "database": "sqlite",
+                "accept_encoding": args.accept_encoding,
+            },
+            "results": results,
+        }, fh, indent=2)
+    print(f"Wrote {len(results)} results to {output}")
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
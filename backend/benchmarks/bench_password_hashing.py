@@ -0,0 +1,68 @@
+"""
+Login hashing throughput: inline hashing vs the process pool in app.utils.passwords.
+
+    python -m benchmarks.bench_password_hashing --method scrypt --threads 8 --logins 200
+
+Each login is one verify_password call issued from a thread (as a threaded
+gunicorn worker would); the report shows logins per second and per core.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("FLASK_ENV", "development")
+os.environ.setdefault("JWT_SECRET_KEY", "bench-jwt-secret-with-at-least-32-bytes")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from app import create_app  # noqa: E402
+from app.utils import passwords  # noqa: E402
+
+
+def run(app, workers, threads, logins):
+    app.config.update(PASSWORD_HASH_WORKERS=workers)
+
+    with app.app_context():
+        stored = passwords.hash_password("password123")
+
+    def one_login(_):
+        with app.app_context():
+            assert passwords.verify_password(stored, "password123")
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(one_login, range(threads)))  # warm the process pool
+        start = time.perf_counter()
+        list(pool.map(one_login, range(logins)))
+        elapsed = time.perf_counter() - start
+
+    passwords.shutdown_executor()
+    return logins / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--method", default="scrypt")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument(
+        "--workers",
+        default=f"0,{os.cpu_count() or 1}",
+        help="comma-separated pool sizes to compare (0 = inline)",
+    )
+    args = parser.parse_args()
+
+    app = create_app()
+    app.config.update(PASSWORD_HASH_METHOD=args.method)
+
+    print(f"method={args.method} threads={args.threads} logins={args.logins}")
+    for workers in [int(w) for w in args.workers.split(",")]:
+        per_second = run(app, workers, args.threads, args.logins)
+        cores = max(workers, 1)
+        print(
+            f"workers={workers:<3} logins/s={per_second:8.1f} "
+            f"logins/s/core={per_second / cores:8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
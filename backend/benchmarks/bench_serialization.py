@@ -0,0 +1,88 @@
+"""
+Serialization cost of the service record list: ORM objects + service_record_to_dict +
+stdlib json (the old path) vs Row tuples (SERVICE_RECORD_FIELDS) + orjson.
+
+    python -m benchmarks.bench_serialization --rows 10000 --iterations 5
+
+Only query-result handling and encoding is timed per path; both outputs are
+checked to decode to the same document.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+_db_dir = tempfile.mkdtemp(prefix="servicetrak-bench-")
+os.environ.setdefault("FLASK_ENV", "development")
+os.environ.setdefault("JWT_SECRET_KEY", "bench-jwt-secret-with-at-least-32-bytes")
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(_db_dir, "bench.db")
+
+from sqlalchemy.orm import contains_eager  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import ServiceRecord, Vehicle  # noqa: E402
+from app.routes.service_records import SERVICE_RECORD_FIELDS, service_record_to_dict  # noqa: E402
+from benchmarks.datasets import seed_user_dataset  # noqa: E402
+
+
+def orm_path(user_id):
+    records = (
+        ServiceRecord.query.join(Vehicle)
+        .options(contains_eager(ServiceRecord.vehicle))
+        .filter(Vehicle.user_id == user_id)
+        .order_by(ServiceRecord.service_date.desc())
+        .all()
+    )
+    items = [service_record_to_dict(r) for r in records]
+    return json.dumps({"service_records": items}, sort_keys=True, separators=(",", ":")).encode()
+
+
+def row_path(app, user_id):
+    selection = SERVICE_RECORD_FIELDS.select({})
+    rows = (
+        db.session.query(*selection.columns)
+        .select_from(ServiceRecord)
+        .join(Vehicle, ServiceRecord.vehicle_id == Vehicle.id)
+        .filter(Vehicle.user_id == user_id)
+        .order_by(ServiceRecord.service_date.desc())
+        .all()
+    )
+    items = [selection.to_dict(row) for row in rows]
+    return app.json.response({"service_records": items}).get_data()
+
+
+def best_of(fn, iterations):
+    timings = []
+    for _ in range(iterations):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        user_id = seed_user_dataset("serialize@bench.local", args.rows)
+
+        assert json.loads(orm_path(user_id)) == json.loads(row_path(app, user_id))
+
+        orm_time = best_of(lambda: orm_path(user_id), args.iterations)
+        row_time = best_of(lambda: row_path(app, user_id), args.iterations)
+
+    print(f"rows={args.rows}")
+    print(f"orm + to_dict + json   {orm_time * 1000:9.1f} ms")
+    print(f"rows + orjson          {row_time * 1000:9.1f} ms  ({orm_time / row_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Mixed read/write throughput on a SQLite file database.
+
+    python -m benchmarks.bench_sqlite_concurrency --writers 4 --readers 4 --requests 200
+    python -m benchmarks.bench_sqlite_concurrency --modes production --output sqlite.json
+
+Writer threads create reminders while reader threads list them, all through
+the Flask test client of one app, as threads of a gunicorn worker would.
+"production" runs with SQLITE_PRODUCTION_MODE (WAL, pragmas, BEGIN IMMEDIATE
+and the query_only read pool); "default" runs the same load on a plain
+SQLite connection for comparison. Each mode reports requests per second,
+p50/p95 latency for reads and writes, and how many requests failed (e.g.
+"database is locked").
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+_db_dir = tempfile.mkdtemp(prefix="servicetrak-bench-")
+os.environ.setdefault("FLASK_ENV", "development")
+os.environ.setdefault("JWT_SECRET_KEY", "bench-jwt-secret-with-at-least-32-bytes")
+# Measure the database, not response cache hits
+os.environ.setdefault("RESPONSE_CACHE_BACKEND", "off")
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(_db_dir, "bench.db"))
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from config import Config  # noqa: E402
+
+from benchmarks.datasets import PASSWORD  # noqa: E402
+
+
+def _percentile(timings, fraction):
+    if not timings:
+        return None
+    timings = sorted(timings)
+    return round(timings[min(len(timings) - 1, int(len(timings) * fraction))] * 1000, 3)
+
+
+def run_mode(mode, writers, readers, requests_per_thread):
+    Config.SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(_db_dir, f"{mode}.db")
+    Config.SQLITE_PRODUCTION_MODE = mode == "production"
+    app = create_app()
+    app.config.update(ADMISSION_CONTROL_ENABLED=False, QUERY_BUDGET_MODE="off")
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
+    client = app.test_client()
+    token = client.post(
+        "/auth/register", json={"email": f"bench-{mode}@example.com", "password": PASSWORD}
+    ).get_json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    vehicle_id = client.post(
+        "/vehicles/", headers=headers, json={"nickname": "Bench", "vin": "1HGCM82633A004352"}
+    ).get_json()["vehicle"]["id"]
+
+    timings = {"read": [], "write": []}
+    errors = []
+    lock = threading.Lock()
+    start_line = threading.Barrier(writers + readers + 1)
+
+    def worker(kind):
+        thread_client = app.test_client()
+        local_timings, local_errors = [], []
+        start_line.wait()
+        for i in range(requests_per_thread):
+            start = time.perf_counter()
+            try:
+                if kind == "write":
+                    response = thread_client.post("/reminders/", headers=headers, json={
+                        "vehicle_id": vehicle_id, "title": f"Reminder {i}", "due_mileage": "15000",
+                    })
+                else:
+                    response = thread_client.get("/reminders/?fields=title", headers=headers)
+                error = response.get_data(as_text=True) if response.status_code >= 400 else None
+            except Exception as e:
+                error = str(e)
+            local_timings.append(time.perf_counter() - start)
+            if error is not None:
+                local_errors.append(error)
+        with lock:
+            timings[kind].extend(local_timings)
+            errors.extend(local_errors)
+
+    threads = [threading.Thread(target=worker, args=("write",)) for _ in range(writers)]
+    threads += [threading.Thread(target=worker, args=("read",)) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    start_line.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+    if "read_engine" in app.extensions:
+        app.extensions["read_engine"].dispose()
+
+    total = len(threads) * requests_per_thread
+    return {
+        "mode": mode,
+        "writers": writers,
+        "readers": readers,
+        "requests": total,
+        "errors": len(errors),
+        "requests_per_s": round(total / elapsed, 1),
+        "p95_ms": _percentile(timings["read"] + timings["write"], 0.95),
+        "read_p50_ms": _percentile(timings["read"], 0.5),
+        "read_p95_ms": _percentile(timings["read"], 0.95),
+        "write_p50_ms": _percentile(timings["write"], 0.5),
+        "write_p95_ms": _percentile(timings["write"], 0.95),
+        "first_error": errors[0][:200] if errors else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ServiceTrak SQLite mixed read/write benchmark.")
+    parser.add_argument("--modes", default="production,default", help="comma-separated: production, default")
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=100, help="requests per thread")
+    parser.add_argument("--output", default=None, help="JSON results path")
+    args = parser.parse_args()
+
+    results = []
+    for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+        result = run_mode(mode, args.writers, args.readers, args.requests)
+        results.append(result)
+        print(
+            f"  {mode:<11} {result['requests_per_s']:>8.1f} req/s  p95={result['p95_ms']:>8.2f}ms "
+            f"read_p95={result['read_p95_ms']:>8.2f}ms write_p95={result['write_p95_ms']:>8.2f}ms "
+            f"errors={result['errors']}",
+            flush=True,
+        )
+
+    output = args.output or os.path.join(
+        os.path.dirname(__file__), "results", f"sqlite-concurrency-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as fh:
+        json.dump({
+            "meta": {
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "database": "sqlite",
+            },
+            "results": results,
+        }, fh, indent=2)
+    print(f"Wrote {len(results)} results to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Cold-start profile: import time, create_app and time to first request, each
+measured in a fresh interpreter.
+
+    python -m benchmarks.bench_startup --runs 5 --output startup.json
+    python -m benchmarks.bench_startup --compare startup.json --threshold 0.2
+    python -m benchmarks.bench_startup --max-first-request-ms 600
+
+Reports medians over --runs processes, the slowest top-level packages from one
+extra `python -X importtime` run, and any lazily-loaded client (Cloudinary,
+requests, alembic) that was imported before it was needed. Exits non-zero on a
+regression against --compare, a --max-first-request-ms overrun, or an eagerly
+imported lazy client.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Third-party clients that must only load on first use
+LAZY_MODULES = ("cloudinary", "requests", "alembic", "flask_migrate")
+
+METRICS = ("import_ms", "create_app_ms", "first_request_ms", "process_ms")
+
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+app = create_app()
+created = time.perf_counter()
+response = app.test_client().get("/health")
+served = time.perf_counter()
+assert response.status_code == 200, response.status_code
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "create_app_ms": (created - imported) * 1000,
+    "first_request_ms": (served - start) * 1000,
+    "lazy_loaded": [name for name in %r if name in sys.modules],
+}))
+""" % (LAZY_MODULES,)
+
+
+def _child_env(db_dir):
+    env = dict(os.environ)
+    env.setdefault("FLASK_ENV", "development")
+    env.setdefault("JWT_SECRET_KEY", "bench-jwt-secret-with-at-least-32-bytes")
+    env["DATABASE_URL"] = "sqlite:///" + os.path.join(db_dir, "bench.db")
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    return env
+
+
+def run_once(env, importtime=False):
+    args = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", CHILD]
+    start = time.perf_counter()
+    proc = subprocess.run(args, cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+    elapsed = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"startup child failed:\n{proc.stderr}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["process_ms"] = elapsed
+    return result, proc.stderr
+
+
+def slowest_packages(importtime_log, top):
+    """Sums `-X importtime` self time per top-level package."""
+    totals = defaultdict(int)
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        totals[name.strip().split(".")[0]] += int(self_us)
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+    return [{"package": name, "self_ms": round(us / 1000, 2)} for name, us in ranked]
+
+
+def profile(runs, top=10):
+    env = _child_env(tempfile.mkdtemp(prefix="servicetrak-bench-"))
+    samples = [run_once(env)[0] for _ in range(runs)]
+    _, importtime_log = run_once(env, importtime=True)
+
+    result = {metric: round(statistics.median(s[metric] for s in samples), 2) for metric in METRICS}
+    result["lazy_loaded"] = sorted({name for s in samples for name in s["lazy_loaded"]})
+    result["packages"] = slowest_packages(importtime_log, top)
+    return result
+
+
+def compare(result, baseline_path, threshold):
+    with open(baseline_path) as fh:
+        baseline = json.load(fh)["result"]
+
+    regressions = []
+    for metric in METRICS:
+        before, after = baseline.get(metric), result.get(metric)
+        if before and after is not None and after > before * (1 + threshold):
+            regressions.append((metric, before, after))
+
+    for metric, before, after in regressions:
+        print(f"REGRESSION {metric}: {before} -> {after}")
+    if not regressions:
+        print(f"No regressions above {threshold:.0%} against {baseline_path}.")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to time")
+    parser.add_argument("--top", type=int, default=10, help="slowest packages to list")
+    parser.add_argument("--output", default=None, help="JSON results path")
+    parser.add_argument("--compare", default=None, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression")
+    parser.add_argument("--max-first-request-ms", type=float, default=None,
+                        help="absolute budget for import + create_app + first request")
+    args = parser.parse_args()
+
+    result = profile(args.runs, args.top)
+
+    for metric in METRICS:
+        print(f"{metric:<18} {result[metric]:8.1f}")
+    print("slowest packages (self time):")
+    for package in result["packages"]:
+        print(f"  {package['package']:<20} {package['self_ms']:8.1f}ms")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as fh:
+            json.dump({
+                "meta": {
+                    "created_at": datetime.now().isoformat(timespec="seconds"),
+                    "python": sys.version.split()[0],
+                    "platform": platform.platform(),
+                    "runs": args.runs,
+                },
+                "result": result,
+            }, fh, indent=2)
+        print(f"Wrote startup profile to {args.output}")
+
+    failed = False
+    if result["lazy_loaded"]:
+        print(f"EAGER IMPORT of lazy clients: {', '.join(result['lazy_loaded'])}")
+        failed = True
+    if args.max_first_request_ms is not None and result["first_request_ms"] > args.max_first_request_ms:
+        print(f"OVER BUDGET first_request_ms: {result['first_request_ms']} > {args.max_first_request_ms}")
+        failed = True
+    if args.compare and compare(result, args.compare, args.threshold):
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Offline VIN decode latency: the vPIC snapshot index in app.utils.vpic.
+
+    python -m benchmarks.bench_vin_decode --wmis 2000 --patterns-per-wmi 200 --decodes 100000
+
+Builds a synthetic snapshot of the given size (or loads --snapshot), then
+times index construction and decodes of random VINs built around known patterns.
+"""
+import argparse
+import gc
+import os
+import random
+import time
+
+os.environ.setdefault("FLASK_ENV", "development")
+os.environ.setdefault("JWT_SECRET_KEY", "bench-jwt-secret-with-at-least-32-bytes")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from app.utils.vpic import SNAPSHOT_VERSION, VIN_CHARS, YEAR_CODES, VpicIndex, load_dump  # noqa: E402
+
+
+def synthetic_snapshot(wmis, patterns_per_wmi, rng):
+    snapshot = {"version": SNAPSHOT_VERSION, "wmi": {}, "patterns": []}
+    for i in range(wmis):
+        wmi = "".join(rng.choice(VIN_CHARS) for _ in range(2)) + rng.choice(VIN_CHARS.replace("9", ""))
+        snapshot["wmi"][wmi] = {"make": f"MAKE{i}"}
+        for j in range(patterns_per_wmi):
+            # Mostly 3-4 character model keys, some with a class or a wildcard
+            keys = "".join(rng.choice(VIN_CHARS) for _ in range(rng.choice((3, 4))))
+            if j % 7 == 0:
+                keys = keys[:2] + "[A-H]" + keys[3:]
+            elif j % 11 == 0:
+                keys = keys[:1] + "*" + keys[2:]
+            year_from = rng.randint(1990, 2020)
+            snapshot["patterns"].append(
+                [wmi, year_from, year_from + rng.randint(0, 8), keys, {"model": f"M{j}", "trim": f"T{j % 5}"}]
+            )
+    return snapshot
+
+
+def random_vin(patterns, rng):
+    """A VIN built around a random pattern's literal characters, so most decodes resolve a model."""
+    wmi, year_from, _, keys, _ = rng.choice(patterns)
+    literal = [c if c in VIN_CHARS else rng.choice(VIN_CHARS) for c in keys.split("[")[0]]
+    descriptor = "".join(literal + [rng.choice(VIN_CHARS) for _ in range(5 - len(literal))])[:5]
+    year_code = YEAR_CODES[(year_from - 1980) % 30]
+    # A letter in position 7 selects the 2010+ year cycle
+    if year_from >= 2010:
+        descriptor = descriptor[:3] + rng.choice("ABCDEFGH") + descriptor[4:]
+    elif descriptor[3].isalpha():
+        descriptor = descriptor[:3] + rng.choice("0123456789") + descriptor[4:]
+    return wmi + descriptor + "0" + year_code + "".join(rng.choice(VIN_CHARS) for _ in range(7))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--snapshot", help="snapshot or vPIC CSV export to load instead of synthetic data")
+    parser.add_argument("--wmis", type=int, default=2000)
+    parser.add_argument("--patterns-per-wmi", type=int, default=200)
+    parser.add_argument("--decodes", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    if args.snapshot:
+        snapshot = load_dump(args.snapshot)
+    else:
+        snapshot = synthetic_snapshot(args.wmis, args.patterns_per_wmi, rng)
+
+    # As app.utils.vpic.local_index loads it: with the cyclic GC paused
+    gc.disable()
+    start = time.perf_counter()
+    index = VpicIndex(snapshot)
+    build_ms = (time.perf_counter() - start) * 1000
+    gc.enable()
+
+    patterns = [pattern for pattern in snapshot["patterns"] if len(pattern[0]) == 3]
+    vins = [random_vin(patterns, rng) for _ in range(args.decodes)]
+    resolved = 0
+    start = time.perf_counter()
+    for vin in vins:
+        decoded = index.decode(vin)
+        if decoded and decoded["model"]:
+            resolved += 1
+    elapsed = time.perf_counter() - start
+
+    print(f"wmis={len(snapshot['wmi']):,} patterns={index.pattern_count:,} build_ms={build_ms:.0f}")
+    print(
+        f"decodes={len(vins):,} us/decode={elapsed / len(vins) * 1e6:.1f} "
+        f"decodes/s={len(vins) / elapsed:,.0f} model_resolved={resolved / len(vins):.1%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
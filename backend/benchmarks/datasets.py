@@ -0,0 +1,101 @@
+"""
+Bulk seeding of benchmark datasets. A dataset of scale N gives one user N
+service records, N reminders and N attachments spread over max(1, N // 100)
+vehicles, inserted with Core executemany batches rather than the ORM.
+"""
+import random
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from app.extensions import db
+from app.models import Reminder, ServiceRecord, ServiceRecordAttachment, User, Vehicle
+from app.utils.passwords import hash_password
+
+BATCH_SIZE = 5000
+PASSWORD = "password123"
+
+
+def _insert(model, rows):
+    table = model.__table__
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.session.execute(table.insert(), rows[start:start + BATCH_SIZE])
+
+
+def seed_user_dataset(email, scale, seed=0):
+    """Creates one user with a dataset of the given scale and returns the user id."""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+
+    user = User(email=email, first_name="Bench", last_name="User", password_hash=hash_password(PASSWORD))
+    db.session.add(user)
+    db.session.flush()
+
+    vehicle_count = max(1, scale // 100)
+    _insert(Vehicle, [
+        {
+            "user_id": user.id,
+            "nickname": f"Vehicle {i}",
+            "vin": f"1HGCM8{user.id:05d}{i:06d}"[:17],
+            "year": 2010 + i % 15,
+            "make": "Honda",
+            "model": "Accord",
+            "recall_count": 0,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(vehicle_count)
+    ])
+    vehicle_ids = [
+        row.id for row in db.session.query(Vehicle.id).filter(Vehicle.user_id == user.id).order_by(Vehicle.id)
+    ]
+
+    _insert(ServiceRecord, [
+        {
+            "vehicle_id": vehicle_ids[i % vehicle_count],
+            "title": rng.choice(["Oil Change", "Tire Rotation", "Brake Pads", "Inspection"]),
+            "category": "Maintenance",
+            "service_date": date(2015, 1, 1) + timedelta(days=i % 4000),
+            "mileage": 1000 + i * 50,
+            "cost": Decimal(rng.randrange(2000, 90000)) / 100,
+            "notes": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(scale)
+    ])
+    record_ids = [
+        row.id
+        for row in db.session.query(ServiceRecord.id)
+        .join(Vehicle)
+        .filter(Vehicle.user_id == user.id)
+        .order_by(ServiceRecord.id)
+    ]
+
+    _insert(Reminder, [
+        {
+            "vehicle_id": vehicle_ids[i % vehicle_count],
+            "title": "Rotate tires",
+            "due_date": date(2026, 1, 1) + timedelta(days=i % 365),
+            "due_mileage": 5000 + i * 10,
+            "is_completed": i % 3 == 0,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(scale)
+    ])
+
+    _insert(ServiceRecordAttachment, [
+        {
+            "service_record_id": record_id,
+            "file_name": f"receipt-{record_id}.pdf",
+            "file_url": f"https://res.cloudinary.example/receipt-{record_id}.pdf",
+            "public_id": f"servicetrak/service-records/{record_id}/receipt",
+            "file_type": "application/pdf",
+            "created_at": now,
+            "updated_at": now,
+        }
+        for record_id in record_ids
+    ])
+
+    db.session.commit()
+    return user.id
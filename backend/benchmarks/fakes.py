@@ -0,0 +1,76 @@
+"""
+In-process stand-ins for NHTSA and Cloudinary so benchmarks measure our code,
+not the network. Responses follow the shapes the real APIs return.
+"""
+import itertools
+from contextlib import ExitStack, contextmanager
+from unittest import mock
+
+_upload_ids = itertools.count(1)
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self._payload = payload
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def json(self):
+        return self._payload
+
+
+def fake_requests_get(url, params=None, timeout=None):
+    if "DecodeVinValuesExtended" in url:
+        return FakeResponse({
+            "Results": [{
+                "ModelYear": "2020",
+                "Make": "HONDA",
+                "Model": "Accord",
+                "Trim": "EX-L",
+                "EngineModel": "K20C4",
+            }]
+        })
+
+    if "recallsByVehicle" in url:
+        return FakeResponse({
+            "results": [
+                {
+                    "NHTSACampaignNumber": f"20V{i:03d}000",
+                    "ReportReceivedDate": "01/02/2020",
+                    "Component": "FUEL SYSTEM",
+                    "Summary": "Fuel pump may fail.",
+                    "Remedy": "Dealers will replace the fuel pump.",
+                    "Manufacturer": "Honda (American Honda Motor Co.)",
+                }
+                for i in range(3)
+            ]
+        })
+
+    return FakeResponse({}, status_code=404)
+
+
+def fake_upload(file, folder=None, resource_type="image", **options):
+    upload_id = next(_upload_ids)
+    public_id = f"{folder}/bench-{upload_id}"
+    return {
+        "public_id": public_id,
+        "version": 1,
+        "resource_type": resource_type,
+        "secure_url": f"https://res.cloudinary.example/{public_id}",
+    }
+
+
+def fake_destroy(public_id, resource_type="image", **options):
+    return {"result": "ok"}
+
+
+@contextmanager
+def external_fakes():
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch("requests.get", fake_requests_get))
+        stack.enter_context(mock.patch("cloudinary.uploader.upload", fake_upload))
+        stack.enter_context(mock.patch("cloudinary.uploader.destroy", fake_destroy))
+        yield
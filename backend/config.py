@@ -12,6 +12,38 @@ DEFAULT_CORS_ORIGINS = ",".join(
     ]
 )
 
+
+def parse_class_map(value, cast=int):
+    """Parses "name=value,name=value" settings into a dict."""
+    mapping = {}
+    for item in (value or "").split(","):
+        if "=" not in item:
+            continue
+        name, raw = item.split("=", 1)
+        if name.strip() and raw.strip():
+            mapping[name.strip()] = cast(raw.strip())
+    return mapping
+
+
+def engine_pool_options(uri, pool_size, max_overflow, pool_recycle, pool_timeout):
+    """SQLAlchemy pool options for one bind; in-memory SQLite keeps its static pool."""
+    if not uri or uri == "sqlite://" or (uri.startswith("sqlite") and ":memory:" in uri):
+        return {}
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_recycle": pool_recycle,
+        "pool_timeout": pool_timeout,
+        "pool_pre_ping": not uri.startswith("sqlite"),
+    }
+
+
+def parse_rate(value):
+    """Parses "rate:burst" (tokens per second, bucket size)."""
+    rate, _, burst = value.partition(":")
+    return float(rate), float(burst or 1)
+
+
 class Config:
     ENV = os.getenv("FLASK_ENV", "production")
     TESTING = os.getenv("TESTING", "false").lower() == "true"
@@ -35,6 +67,42 @@ class Config:
         "sqlite:///" + os.path.join(BASE_DIR, "instance", "servicetrak.db")
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = engine_pool_options(
+        SQLALCHEMY_DATABASE_URI,
+        pool_size=int(os.getenv("DATABASE_POOL_SIZE", "5")),
+        max_overflow=int(os.getenv("DATABASE_MAX_OVERFLOW", "10")),
+        pool_recycle=int(os.getenv("DATABASE_POOL_RECYCLE", "1800")),
+        pool_timeout=int(os.getenv("DATABASE_POOL_TIMEOUT", "30")),
+    )
+
+    # Optional read replicas: GET requests read from one of these (comma-separated URLs).
+    # A user who writes reads from the primary for REPLICA_PIN_SECONDS afterwards,
+    # on every worker when RESPONSE_CACHE_BACKEND=resp (pins live in that backend).
+    DATABASE_REPLICA_URLS = [
+        url.strip().replace("postgres://", "postgresql://", 1)
+        for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+        if url.strip()
+    ]
+    DATABASE_REPLICA_ENGINE_OPTIONS = engine_pool_options(
+        DATABASE_REPLICA_URLS[0] if DATABASE_REPLICA_URLS else "",
+        pool_size=int(os.getenv("DATABASE_REPLICA_POOL_SIZE", "10")),
+        max_overflow=int(os.getenv("DATABASE_REPLICA_MAX_OVERFLOW", "10")),
+        pool_recycle=int(os.getenv("DATABASE_POOL_RECYCLE", "1800")),
+        pool_timeout=int(os.getenv("DATABASE_POOL_TIMEOUT", "30")),
+    )
+    REPLICA_PIN_SECONDS = float(os.getenv("REPLICA_PIN_SECONDS", "5"))
+
+    # SQLite production mode (file databases only, opt-in): WAL + pragmas on every
+    # connection, and a pool of read-only connections that GET requests read from.
+    SQLITE_PRODUCTION_MODE = os.getenv("SQLITE_PRODUCTION_MODE", "false").lower() == "true"
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-64000"))  # negative = KiB
+    SQLITE_BEGIN_IMMEDIATE = os.getenv("SQLITE_BEGIN_IMMEDIATE", "true").lower() == "true"
+    SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "4"))
+    SQLITE_READ_POOL_OVERFLOW = int(os.getenv("SQLITE_READ_POOL_OVERFLOW", "4"))
 
     CORS_ORIGINS = [
         origin.strip()
@@ -45,3 +113,131 @@ class Config:
     CLOUDINARY_CLOUD_NAME = os.getenv("CLOUDINARY_CLOUD_NAME")
     CLOUDINARY_API_KEY = os.getenv("CLOUDINARY_API_KEY")
     CLOUDINARY_API_SECRET = os.getenv("CLOUDINARY_API_SECRET")
+
+    # "cloudinary" or "local" (development/test stand-in that stores files under instance/)
+    ATTACHMENT_STORAGE = os.getenv("ATTACHMENT_STORAGE", "cloudinary").lower()
+    ATTACHMENT_LOCAL_DIR = os.getenv(
+        "ATTACHMENT_LOCAL_DIR", os.path.join(BASE_DIR, "instance", "uploads")
+    )
+    # Seconds a signed direct-upload grant stays valid
+    ATTACHMENT_UPLOAD_URL_TTL = int(os.getenv("ATTACHMENT_UPLOAD_URL_TTL", "600"))
+    # Largest file (bytes) a direct upload may confirm
+    ATTACHMENT_MAX_BYTES = int(os.getenv("ATTACHMENT_MAX_BYTES", str(10 * 1024 * 1024)))
+
+    # Werkzeug hash method string, e.g. "scrypt:32768:8:1" or "pbkdf2:sha256:1000000".
+    # Changing it rehashes passwords on the next successful login.
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt")
+    PASSWORD_SALT_LENGTH = int(os.getenv("PASSWORD_SALT_LENGTH", "16"))
+    # Size of the process pool used for hashing; 0 hashes on the request thread
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "0" if IS_DEV else "2"))
+    # Seconds to wait for the pool; past it (or if a pool worker dies) login and
+    # register return 503 with Retry-After
+    PASSWORD_HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", "30"))
+
+    # Per-process cache of token identities keyed by (user_id, token version).
+    # Revocations reach other workers at once with RESPONSE_CACHE_BACKEND=resp,
+    # otherwise only when their entry expires (up to IDENTITY_CACHE_TTL seconds)
+    IDENTITY_CACHE_TTL = int(os.getenv("IDENTITY_CACHE_TTL", "60"))
+    IDENTITY_CACHE_SIZE = int(os.getenv("IDENTITY_CACHE_SIZE", "10000"))
+
+    # Admission control for expensive endpoint classes ("nhtsa", "upload").
+    # Limits are concurrent requests per worker process; rates are per-user
+    # token buckets as "tokens_per_second:burst".
+    ADMISSION_CONTROL_ENABLED = os.getenv("ADMISSION_CONTROL_ENABLED", "true").lower() == "true"
+    ADMISSION_LIMITS = parse_class_map(os.getenv("ADMISSION_LIMITS", "nhtsa=4,upload=4"))
+    ADMISSION_USER_RATES = parse_class_map(
+        os.getenv("ADMISSION_USER_RATES", "nhtsa=0.5:10,upload=0.5:10"), parse_rate
+    )
+    ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "1"))
+
+    # Circuit breakers around the NHTSA APIs (app.utils.circuit_breaker): a breaker
+    # opens when, over the last WINDOW_SECONDS and at least MIN_CALLS calls, the
+    # error rate or the share of calls slower than SLOW_CALL_SECONDS reaches its
+    # threshold; it fails calls fast for OPEN_SECONDS, then lets HALF_OPEN_PROBES through
+    CIRCUIT_BREAKER_ENABLED = os.getenv("CIRCUIT_BREAKER_ENABLED", "true").lower() == "true"
+    CIRCUIT_BREAKER_WINDOW_SECONDS = int(os.getenv("CIRCUIT_BREAKER_WINDOW_SECONDS", "60"))
+    CIRCUIT_BREAKER_MIN_CALLS = int(os.getenv("CIRCUIT_BREAKER_MIN_CALLS", "10"))
+    CIRCUIT_BREAKER_ERROR_RATE = float(os.getenv("CIRCUIT_BREAKER_ERROR_RATE", "0.5"))
+    CIRCUIT_BREAKER_SLOW_CALL_SECONDS = float(os.getenv("CIRCUIT_BREAKER_SLOW_CALL_SECONDS", "5"))
+    CIRCUIT_BREAKER_SLOW_CALL_RATE = float(os.getenv("CIRCUIT_BREAKER_SLOW_CALL_RATE", "0.5"))
+    CIRCUIT_BREAKER_OPEN_SECONDS = int(os.getenv("CIRCUIT_BREAKER_OPEN_SECONDS", "30"))
+    CIRCUIT_BREAKER_HALF_OPEN_PROBES = int(os.getenv("CIRCUIT_BREAKER_HALF_OPEN_PROBES", "1"))
+
+    # Request/SQL/external-call instrumentation exposed at /metrics and in Server-Timing
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+
+    # Per-endpoint SQL statement budgets: "raise" (tests), "warn" (sampled log) or "off"
+    QUERY_BUDGET_MODE = os.getenv("QUERY_BUDGET_MODE", "warn").lower()
+    QUERY_BUDGET_SAMPLE_RATE = float(os.getenv("QUERY_BUDGET_SAMPLE_RATE", "0.1"))
+
+    # Per-user cache for the GET list endpoints: "local" (in-process LRU, single
+    # worker only), "resp" (Redis/Valkey or `flask cache-server`, shared by all
+    # workers) or "off". Writes bump a per-user generation instead of deleting keys.
+    RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "local" if IS_DEV else "off").lower()
+    RESPONSE_CACHE_URL = os.getenv("RESPONSE_CACHE_URL", "redis://127.0.0.1:6379/0")
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "300"))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "5000"))
+    RESPONSE_CACHE_TIMEOUT = float(os.getenv("RESPONSE_CACHE_TIMEOUT", "0.5"))
+
+    # Background hard-delete of soft-deleted vehicles/service records (and their
+    # files), at most PURGE_MAX_CHUNKS chunks of PURGE_CHUNK_SIZE rows per run
+    PURGE_WORKER_ENABLED = os.getenv("PURGE_WORKER_ENABLED", "true").lower() == "true"
+    PURGE_INTERVAL_SECONDS = float(os.getenv("PURGE_INTERVAL_SECONDS", "30"))
+    PURGE_CHUNK_SIZE = int(os.getenv("PURGE_CHUNK_SIZE", "500"))
+    PURGE_MAX_CHUNKS = int(os.getenv("PURGE_MAX_CHUNKS", "20"))
+
+    # GET /sync: tokens lag the clock by SYNC_OVERLAP_SECONDS; tombstones (and so
+    # tokens) older than SYNC_TOMBSTONE_RETENTION_DAYS are dropped
+    SYNC_OVERLAP_SECONDS = float(os.getenv("SYNC_OVERLAP_SECONDS", "5"))
+    SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30"))
+
+    # VIN decoding: sources tried in order ("local" = vPIC snapshot built by
+    # `flask load-vpic`, "remote" = NHTSA API) until one resolves year/make/model
+    VIN_DECODER_ORDER = [s.strip() for s in os.getenv("VIN_DECODER_ORDER", "local,remote").split(",") if s.strip()]
+    VPIC_SNAPSHOT_PATH = os.getenv(
+        "VPIC_SNAPSHOT_PATH", os.path.join(BASE_DIR, "instance", "vpic_snapshot.json.gz")
+    )
+
+    # GET /vehicles/<id>/recalls: "remote" (live NHTSA API) or "local" (the
+    # recall_campaigns table loaded by `flask import-recalls`)
+    RECALLS_SOURCE = os.getenv("RECALLS_SOURCE", "remote").lower()
+
+    # Single-flight for NHTSA lookups (app.utils.single_flight): "local" shares
+    # concurrent identical calls within a process, "table" also across workers via
+    # the single_flight_calls table. How long a caller waits for another's call,
+    # when a running call is presumed dead, how long a result stays shared, and
+    # how often waiters poll the table
+    SINGLE_FLIGHT_BACKEND = os.getenv("SINGLE_FLIGHT_BACKEND", "local").lower()
+    SINGLE_FLIGHT_WAIT_SECONDS = float(os.getenv("SINGLE_FLIGHT_WAIT_SECONDS", "15"))
+    SINGLE_FLIGHT_LOCK_SECONDS = float(os.getenv("SINGLE_FLIGHT_LOCK_SECONDS", "30"))
+    SINGLE_FLIGHT_RESULT_SECONDS = float(os.getenv("SINGLE_FLIGHT_RESULT_SECONDS", "5"))
+    SINGLE_FLIGHT_POLL_SECONDS = float(os.getenv("SINGLE_FLIGHT_POLL_SECONDS", "0.05"))
+
+    # Background jobs (app.utils.jobs): worker threads per web process (0 to run
+    # them only in `flask run-jobs`), idle poll interval, retries with exponential
+    # backoff, and when a running job is presumed abandoned / a finished one pruned
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1"))
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_RETRY_BACKOFF_SECONDS = float(os.getenv("JOB_RETRY_BACKOFF_SECONDS", "5"))
+    JOB_LOCK_TIMEOUT_SECONDS = float(os.getenv("JOB_LOCK_TIMEOUT_SECONDS", "300"))
+    JOB_RETENTION_DAYS = int(os.getenv("JOB_RETENTION_DAYS", "7"))
+
+    # POST /batch limits: sub-requests per batch, and total SQL statements / seconds
+    # after which the remaining sub-requests are answered with 429 without running
+    BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", "30"))
+    BATCH_MAX_QUERIES = int(os.getenv("BATCH_MAX_QUERIES", "300"))
+    BATCH_MAX_SECONDS = float(os.getenv("BATCH_MAX_SECONDS", "10"))
+
+    # Negotiated response compression. br/zstd need the optional brotli/zstandard
+    # packages; encodings are tried in the listed order when the client's q-values tie.
+    COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_ENCODINGS = [e.strip() for e in os.getenv("COMPRESSION_ENCODINGS", "br,zstd,gzip").split(",") if e.strip()]
+    COMPRESSION_LEVELS = parse_class_map(os.getenv("COMPRESSION_LEVELS", "gzip=6,br=4,zstd=3"))
+    COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_MIMETYPES = [
+        m.strip()
+        for m in os.getenv("COMPRESSION_MIMETYPES", "application/json,text/plain,text/csv,text/html").split(",")
+        if m.strip()
+    ]
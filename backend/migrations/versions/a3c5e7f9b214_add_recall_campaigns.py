@@ -0,0 +1,49 @@
+"""Add recall_campaigns table for local recall lookups
+
+Revision ID: a3c5e7f9b214
+Revises: f4b8c2d6e190
+Create Date: 2026-10-19 18:37:12.640518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c5e7f9b214'
+down_revision = 'f4b8c2d6e190'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('recall_campaigns',
+    sa.Column('record_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('campaign_number', sa.String(length=12), nullable=False),
+    sa.Column('make', sa.String(length=50), nullable=False),
+    sa.Column('model', sa.String(length=60), nullable=False),
+    sa.Column('make_key', sa.String(length=50), nullable=False),
+    sa.Column('model_key', sa.String(length=60), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=True),
+    sa.Column('component', sa.String(length=255), nullable=True),
+    sa.Column('manufacturer', sa.String(length=255), nullable=True),
+    sa.Column('report_date', sa.Date(), nullable=True),
+    sa.Column('potentially_affected', sa.Integer(), nullable=True),
+    sa.Column('summary', sa.Text(), nullable=True),
+    sa.Column('consequence', sa.Text(), nullable=True),
+    sa.Column('remedy', sa.Text(), nullable=True),
+    sa.Column('row_hash', sa.String(length=16), nullable=False),
+    sa.Column('imported_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('record_id')
+    )
+    with op.batch_alter_table('recall_campaigns', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_recall_campaigns_campaign_number'), ['campaign_number'], unique=False)
+        batch_op.create_index('ix_recall_campaigns_make_model_year', ['make_key', 'model_key', 'year'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('recall_campaigns', schema=None) as batch_op:
+        batch_op.drop_index('ix_recall_campaigns_make_model_year')
+        batch_op.drop_index(batch_op.f('ix_recall_campaigns_campaign_number'))
+
+    op.drop_table('recall_campaigns')
@@ -0,0 +1,40 @@
+"""Add soft delete to vehicles and service records
+
+Revision ID: b7d3e91c5a24
+Revises: 9c1f4e7a2b60
+Create Date: 2026-10-19 10:04:52.118306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d3e91c5a24'
+down_revision = '9c1f4e7a2b60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('vehicles', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('deleted_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_vehicles_deleted_at'), ['deleted_at'], unique=False)
+        batch_op.create_index('ix_vehicles_user_id_deleted_at', ['user_id', 'deleted_at'], unique=False)
+
+    with op.batch_alter_table('service_records', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('deleted_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_service_records_deleted_at'), ['deleted_at'], unique=False)
+        batch_op.create_index('ix_service_records_vehicle_id_deleted_at', ['vehicle_id', 'deleted_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('service_records', schema=None) as batch_op:
+        batch_op.drop_index('ix_service_records_vehicle_id_deleted_at')
+        batch_op.drop_index(batch_op.f('ix_service_records_deleted_at'))
+        batch_op.drop_column('deleted_at')
+
+    with op.batch_alter_table('vehicles', schema=None) as batch_op:
+        batch_op.drop_index('ix_vehicles_user_id_deleted_at')
+        batch_op.drop_index(batch_op.f('ix_vehicles_deleted_at'))
+        batch_op.drop_column('deleted_at')
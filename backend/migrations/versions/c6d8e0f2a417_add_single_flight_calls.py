@@ -0,0 +1,37 @@
+"""Add single_flight_calls table for cross-worker lookup coalescing
+
+Revision ID: c6d8e0f2a417
+Revises: a3c5e7f9b214
+Create Date: 2026-10-19 19:52:04.118230
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6d8e0f2a417'
+down_revision = 'a3c5e7f9b214'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('single_flight_calls',
+    sa.Column('key', sa.String(length=200), nullable=False),
+    sa.Column('owner', sa.String(length=64), nullable=False),
+    sa.Column('status', sa.String(length=10), nullable=False),
+    sa.Column('result', sa.JSON(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    with op.batch_alter_table('single_flight_calls', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_single_flight_calls_expires_at'), ['expires_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('single_flight_calls', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_single_flight_calls_expires_at'))
+
+    op.drop_table('single_flight_calls')
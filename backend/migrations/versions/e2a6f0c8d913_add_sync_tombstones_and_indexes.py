@@ -0,0 +1,69 @@
+"""Add sync tombstones, users.sync_changed_at and updated_at indexes
+
+Revision ID: e2a6f0c8d913
+Revises: b7d3e91c5a24
+Create Date: 2026-10-19 14:21:07.530942
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a6f0c8d913'
+down_revision = 'b7d3e91c5a24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('entity', sa.String(length=40), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('tombstones', schema=None) as batch_op:
+        batch_op.create_index('ix_tombstones_user_id_deleted_at', ['user_id', 'deleted_at'], unique=False)
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('sync_changed_at', sa.DateTime(), nullable=True))
+
+    with op.batch_alter_table('vehicles', schema=None) as batch_op:
+        batch_op.create_index('ix_vehicles_user_id_updated_at', ['user_id', 'updated_at'], unique=False)
+
+    with op.batch_alter_table('service_records', schema=None) as batch_op:
+        batch_op.create_index('ix_service_records_vehicle_id_updated_at', ['vehicle_id', 'updated_at'], unique=False)
+
+    with op.batch_alter_table('reminders', schema=None) as batch_op:
+        batch_op.create_index('ix_reminders_vehicle_id_updated_at', ['vehicle_id', 'updated_at'], unique=False)
+
+    with op.batch_alter_table('service_record_attachments', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_service_record_attachments_record_id_updated_at', ['service_record_id', 'updated_at'], unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('service_record_attachments', schema=None) as batch_op:
+        batch_op.drop_index('ix_service_record_attachments_record_id_updated_at')
+
+    with op.batch_alter_table('reminders', schema=None) as batch_op:
+        batch_op.drop_index('ix_reminders_vehicle_id_updated_at')
+
+    with op.batch_alter_table('service_records', schema=None) as batch_op:
+        batch_op.drop_index('ix_service_records_vehicle_id_updated_at')
+
+    with op.batch_alter_table('vehicles', schema=None) as batch_op:
+        batch_op.drop_index('ix_vehicles_user_id_updated_at')
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('sync_changed_at')
+
+    with op.batch_alter_table('tombstones', schema=None) as batch_op:
+        batch_op.drop_index('ix_tombstones_user_id_deleted_at')
+
+    op.drop_table('tombstones')
@@ -5,17 +5,29 @@ os.environ["SECRET_KEY"] = "test-secret"
 os.environ["JWT_SECRET_KEY"] = "test-jwt-secret-with-at-least-32-bytes"
 os.environ["DATABASE_URL"] = "sqlite:///:memory:"
 os.environ["CORS_ORIGINS"] = "http://localhost:5173"
+os.environ["PURGE_WORKER_ENABLED"] = "false"
+os.environ["JOB_WORKERS"] = "0"
+
+import re
+from contextlib import contextmanager
 
 import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
 from app import create_app
 from app.extensions import db
+from app.models import ServiceRecordAttachment
 
 
 @pytest.fixture()
 def app():
     app = create_app()
-    app.config.update(TESTING=True, SQLALCHEMY_DATABASE_URI="sqlite:///:memory:")
+    app.config.update(
+        TESTING=True,
+        SQLALCHEMY_DATABASE_URI="sqlite:///:memory:",
+        QUERY_BUDGET_MODE="raise",
+    )
 
     with app.app_context():
         db.create_all()
@@ -29,6 +41,42 @@ def client(app):
     return app.test_client()
 
 
+@pytest.fixture()
+def assert_max_queries():
+    """
+    Context manager that fails with the offending statements when the block runs
+    more SQL than allowed:
+
+        with assert_max_queries(2):
+            client.get("/vehicles/", headers=...)
+    """
+    from app.utils.query_budget import QueryBudgetExceeded
+
+    @contextmanager
+    def _assert_max_queries(max_queries):
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(Engine, "after_cursor_execute", _record)
+        try:
+            yield statements
+        finally:
+            event.remove(Engine, "after_cursor_execute", _record)
+
+        if len(statements) > max_queries:
+            raise QueryBudgetExceeded("block", max_queries, statements)
+
+    return _assert_max_queries
+
+
+def query_count(response):
+    """Number of SQL statements the request ran, read from its Server-Timing header."""
+    match = re.search(r'desc="(\d+) queries"', response.headers.get("Server-Timing", ""))
+    return int(match.group(1))
+
+
 def register_user(client, email="user@example.com", password="password123"):
     response = client.post(
         "/auth/register",
@@ -45,3 +93,52 @@ def register_user(client, email="user@example.com", password="password123"):
 
 def auth_header(token):
     return {"Authorization": f"Bearer {token}"}
+
+
+def create_vehicle(client, token, vin="1HGCM82633A004352"):
+    response = client.post(
+        "/vehicles/",
+        headers=auth_header(token),
+        json={"nickname": "Daily", "vin": vin, "year": "2020", "make": "Honda", "model": "Accord"},
+    )
+    assert response.status_code == 201
+    return response.get_json()["vehicle"]
+
+
+def create_service_record(client, token, vehicle_id):
+    response = client.post(
+        "/service-records/",
+        headers=auth_header(token),
+        json={
+            "vehicle_id": vehicle_id,
+            "title": "Oil Change",
+            "service_date": "2026-01-15",
+            "mileage": "12000",
+            "cost": "89.50",
+        },
+    )
+    assert response.status_code == 201
+    return response.get_json()["service_record"]
+
+
+def create_reminder(client, token, vehicle_id):
+    response = client.post(
+        "/reminders/",
+        headers=auth_header(token),
+        json={"vehicle_id": vehicle_id, "title": "Rotate tires", "due_mileage": "15000"},
+    )
+    assert response.status_code == 201
+    return response.get_json()["reminder"]
+
+
+def create_attachment(record_id, file_name="receipt.pdf"):
+    attachment = ServiceRecordAttachment(
+        service_record_id=record_id,
+        file_name=file_name,
+        file_url=f"https://example.com/{file_name}",
+        public_id=f"{file_name}-public-id",
+        file_type="application/pdf",
+    )
+    db.session.add(attachment)
+    db.session.commit()
+    return attachment.id
@@ -0,0 +1,43 @@
+from app.utils.admission import init_admission
+
+from conftest import auth_header, register_user
+
+
+def test_saturated_endpoint_class_fails_fast_with_503(client, app):
+    app.config.update(ADMISSION_LIMITS={"nhtsa": 1}, ADMISSION_USER_RATES={})
+    init_admission(app)
+    token = register_user(client)
+
+    controller = app.extensions["admission"]
+    assert controller.try_acquire("nhtsa") is None  # simulate an in-flight NHTSA call
+
+    response = client.post("/vehicles/decode", headers=auth_header(token), json={"vin": "short"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+    snapshot = client.get("/admission").get_json()["classes"]["nhtsa"]
+    assert snapshot["in_flight"] == 1
+    assert snapshot["utilization"] == 1.0
+    assert snapshot["rejected_saturated"] == 1
+
+    controller.release("nhtsa")
+    response = client.post("/vehicles/decode", headers=auth_header(token), json={"vin": "short"})
+    assert response.status_code == 400
+
+
+def test_per_user_token_bucket_returns_429(client, app):
+    app.config.update(ADMISSION_LIMITS={}, ADMISSION_USER_RATES={"nhtsa": (0.01, 1)})
+    init_admission(app)
+    first = register_user(client, "first@example.com")
+    second = register_user(client, "second@example.com")
+
+    response = client.post("/vehicles/decode", headers=auth_header(first), json={"vin": "short"})
+    assert response.status_code == 400
+
+    response = client.post("/vehicles/decode", headers=auth_header(first), json={"vin": "short"})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 1
+
+    # Buckets are per user
+    response = client.post("/vehicles/decode", headers=auth_header(second), json={"vin": "short"})
+    assert response.status_code == 400
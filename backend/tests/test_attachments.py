@@ -0,0 +1,163 @@
+import io
+
+from conftest import (
+    auth_header,
+    create_attachment,
+    create_service_record,
+    create_vehicle,
+    register_user,
+)
+
+
+def test_batch_attachment_listing_groups_by_record(client):
+    token = register_user(client)
+    vehicle = create_vehicle(client, token)
+    first = create_service_record(client, token, vehicle["id"])
+    second = create_service_record(client, token, vehicle["id"])
+    create_attachment(first["id"], "a.pdf")
+    create_attachment(first["id"], "b.pdf")
+
+    response = client.get(
+        f"/service-records/attachments?record_ids={first['id']},{second['id']}",
+        headers=auth_header(token),
+    )
+    assert response.status_code == 200
+    grouped = response.get_json()["attachments"]
+    assert [a["file_name"] for a in grouped[str(first["id"])]] == ["a.pdf", "b.pdf"]
+    assert grouped[str(second["id"])] == []
+
+    response = client.get(
+        f"/service-records/attachments?vehicle_id={vehicle['id']}",
+        headers=auth_header(token),
+    )
+    assert set(response.get_json()["attachments"]) == {str(first["id"]), str(second["id"])}
+
+
+def test_batch_attachment_listing_skips_other_users_records(client):
+    owner_token = register_user(client, "owner@example.com")
+    other_token = register_user(client, "other@example.com")
+    vehicle = create_vehicle(client, owner_token)
+    record = create_service_record(client, owner_token, vehicle["id"])
+    create_attachment(record["id"])
+
+    response = client.get(
+        f"/service-records/attachments?record_ids={record['id']}",
+        headers=auth_header(other_token),
+    )
+    assert response.status_code == 200
+    assert response.get_json()["attachments"] == {}
+
+    response = client.get("/service-records/attachments?record_ids=1,x", headers=auth_header(owner_token))
+    assert response.status_code == 400
+
+
+def test_service_record_list_can_embed_attachments(client):
+    token = register_user(client)
+    vehicle = create_vehicle(client, token)
+    record = create_service_record(client, token, vehicle["id"])
+    create_attachment(record["id"])
+
+    response = client.get("/service-records/?include=attachments", headers=auth_header(token))
+    records = response.get_json()["service_records"]
+    assert records[0]["attachments"][0]["file_name"] == "receipt.pdf"
+
+    response = client.get("/service-records/", headers=auth_header(token))
+    assert "attachments" not in response.get_json()["service_records"][0]
+
+
+def test_direct_upload_flow_with_local_storage(client, app, tmp_path):
+    app.config.update(ATTACHMENT_STORAGE="local", ATTACHMENT_LOCAL_DIR=str(tmp_path))
+    token = register_user(client)
+    vehicle = create_vehicle(client, token)
+    record = create_service_record(client, token, vehicle["id"])
+
+    response = client.post(
+        f"/service-records/{record['id']}/attachments/upload-url",
+        headers=auth_header(token),
+        json={"file_name": "receipt.pdf", "file_type": "application/pdf"},
+    )
+    assert response.status_code == 200
+    grant = response.get_json()
+    assert grant["fields"]["public_id"].startswith(f"servicetrak/service-records/{record['id']}/")
+
+    response = client.post(
+        "/storage/local-upload",
+        data={**grant["fields"], "file": (io.BytesIO(b"%PDF-1.4"), "receipt.pdf")},
+        content_type="multipart/form-data",
+    )
+    assert response.status_code == 200
+    result = response.get_json()
+
+    tampered = {**result, "signature": "bad"}
+    response = client.post(
+        f"/service-records/{record['id']}/attachments/confirm",
+        headers=auth_header(token),
+        json={"upload_token": grant["upload_token"], "result": tampered},
+    )
+    assert response.status_code == 400
+
+    # The stored URL is built on the server; the client's secure_url is ignored
+    response = client.post(
+        f"/service-records/{record['id']}/attachments/confirm",
+        headers=auth_header(token),
+        json={"upload_token": grant["upload_token"], "result": {**result, "secure_url": "https://evil.example"}},
+    )
+    assert response.status_code == 201
+    attachment = response.get_json()["attachment"]
+    assert attachment["file_name"] == "receipt.pdf"
+    assert attachment["file_url"] == result["secure_url"]
+    assert client.get(attachment["file_url"]).data == b"%PDF-1.4"
+
+
+def test_direct_upload_is_limited_to_the_granted_format_and_size(client, app, tmp_path):
+    app.config.update(ATTACHMENT_STORAGE="local", ATTACHMENT_LOCAL_DIR=str(tmp_path), ATTACHMENT_MAX_BYTES=8)
+    token = register_user(client)
+    record = create_service_record(client, token, create_vehicle(client, token)["id"])
+
+    def grant_and_upload(file_name, content):
+        grant = client.post(
+            f"/service-records/{record['id']}/attachments/upload-url",
+            headers=auth_header(token),
+            json={"file_name": "receipt.pdf"},
+        ).get_json()
+        assert grant["fields"]["allowed_formats"] == "pdf"
+        response = client.post(
+            "/storage/local-upload",
+            data={**grant["fields"], "file": (io.BytesIO(content), file_name)},
+            content_type="multipart/form-data",
+        )
+        return grant, response
+
+    _, response = grant_and_upload("payload.html", b"<script>")
+    assert response.status_code == 400
+
+    grant, response = grant_and_upload("receipt.pdf", b"%PDF-1.4 and then some")
+    assert response.status_code == 200
+    response = client.post(
+        f"/service-records/{record['id']}/attachments/confirm",
+        headers=auth_header(token),
+        json={"upload_token": grant["upload_token"], "result": response.get_json()},
+    )
+    assert response.status_code == 400
+    assert not [path for path in tmp_path.rglob("*") if path.is_file()]
+
+
+def test_direct_upload_grant_is_scoped_to_owner(client):
+    owner_token = register_user(client, "owner@example.com")
+    other_token = register_user(client, "other@example.com")
+    vehicle = create_vehicle(client, owner_token)
+    record = create_service_record(client, owner_token, vehicle["id"])
+
+    response = client.post(
+        f"/service-records/{record['id']}/attachments/upload-url",
+        headers=auth_header(other_token),
+        json={"file_name": "receipt.pdf"},
+    )
+    assert response.status_code == 404
+
+    response = client.post(
+        f"/service-records/{record['id']}/attachments/upload-url",
+        headers=auth_header(owner_token),
+        json={"file_name": "malware.exe"},
+    )
+    assert response.status_code == 400
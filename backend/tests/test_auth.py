@@ -0,0 +1,191 @@
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app import create_app
+from app.extensions import db
+from app.models import User
+from app.utils import passwords
+from app.utils.resp import LocalRespServer
+from config import Config
+
+from conftest import register_user
+
+
+def login(client, email="user@example.com", password="password123"):
+    return client.post("/auth/login", json={"email": email, "password": password})
+
+
+def test_login_rehashes_when_hash_parameters_change(client, app):
+    app.config.update(PASSWORD_HASH_METHOD="pbkdf2:sha256:1000")
+    register_user(client)
+    old_hash = User.query.filter_by(email="user@example.com").one().password_hash
+    assert old_hash.startswith("pbkdf2:sha256:1000$")
+
+    app.config.update(PASSWORD_HASH_METHOD="pbkdf2:sha256:2000")
+    assert login(client).status_code == 200
+
+    db.session.expire_all()
+    new_hash = User.query.filter_by(email="user@example.com").one().password_hash
+    assert new_hash.startswith("pbkdf2:sha256:2000$")
+    assert login(client).status_code == 200
+    assert login(client, password="wrong").status_code == 401
+
+
+def test_password_hashing_runs_in_process_pool(client, app):
+    app.config.update(PASSWORD_HASH_METHOD="pbkdf2:sha256:1000", PASSWORD_HASH_WORKERS=1)
+    try:
+        register_user(client)
+        assert passwords._executor is not None
+        assert login(client).status_code == 200
+        assert login(client, password="wrong").status_code == 401
+    finally:
+        passwords.shutdown_executor()
+
+
+def test_login_rehashes_when_the_salt_length_changes(client, app):
+    app.config.update(PASSWORD_HASH_METHOD="pbkdf2:sha256:1000", PASSWORD_SALT_LENGTH=8)
+    register_user(client)
+    app.config.update(PASSWORD_SALT_LENGTH=16)
+    assert login(client).status_code == 200
+
+    db.session.expire_all()
+    salt = User.query.filter_by(email="user@example.com").one().password_hash.split("$")[1]
+    assert len(salt) == 16
+
+
+class FailingExecutor:
+    def __init__(self, error):
+        self.error = error
+        self.shut_down = False
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_exception(self.error)
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+def test_hashing_timeouts_return_503_with_retry_after(client, app, monkeypatch):
+    app.config.update(PASSWORD_HASH_METHOD="pbkdf2:sha256:1000")
+    register_user(client)
+    app.config.update(PASSWORD_HASH_WORKERS=1)
+    monkeypatch.setattr(passwords, "_executor", FailingExecutor(TimeoutError()))
+    monkeypatch.setattr(passwords, "_executor_workers", 1)
+
+    for response in (login(client), client.post("/auth/register", json={
+        "email": "other@example.com", "password": "password123",
+    })):
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "5"
+
+
+def test_a_broken_hashing_pool_returns_503_and_is_rebuilt(client, app, monkeypatch):
+    app.config.update(PASSWORD_HASH_METHOD="pbkdf2:sha256:1000")
+    register_user(client)
+    app.config.update(PASSWORD_HASH_WORKERS=1)
+    broken = FailingExecutor(BrokenProcessPool())
+    monkeypatch.setattr(passwords, "_executor", broken)
+    monkeypatch.setattr(passwords, "_executor_workers", 1)
+
+    response = login(client)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert broken.shut_down and passwords._executor is None
+    try:
+        assert login(client).status_code == 200
+        assert passwords._executor is not None
+    finally:
+        passwords.shutdown_executor()
+
+
+def test_profile_update_invalidates_old_tokens(client):
+    token = register_user(client)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get("/auth/profile", headers=headers)
+    assert response.get_json()["user"]["first_name"] == "Test"
+
+    response = client.put("/auth/update", headers=headers, json={"first_name": "Renamed"})
+    assert response.status_code == 200
+    new_token = response.get_json()["access_token"]
+
+    assert client.get("/auth/profile", headers=headers).status_code == 401
+    assert client.get("/vehicles/", headers=headers).status_code == 401
+
+    response = client.get("/auth/profile", headers={"Authorization": f"Bearer {new_token}"})
+    assert response.status_code == 200
+    assert response.get_json()["user"]["first_name"] == "Renamed"
+
+
+def test_profile_is_served_from_identity_cache(client, app):
+    token = register_user(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/auth/profile", headers=headers).status_code == 200
+
+    # A direct DB change without a version bump is not visible until the entry expires
+    user = User.query.filter_by(email="user@example.com").one()
+    user.first_name = "Changed"
+    db.session.commit()
+    assert client.get("/auth/profile", headers=headers).get_json()["user"]["first_name"] == "Test"
+
+    app.extensions["identity_cache"].clear()
+    assert client.get("/auth/profile", headers=headers).get_json()["user"]["first_name"] == "Changed"
+
+
+@pytest.fixture()
+def two_workers(tmp_path, monkeypatch):
+    """Two apps (gunicorn workers) over one SQLite file; configure the backend, then call."""
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'app.db'}")
+    apps = []
+
+    def start(**config):
+        for key, value in config.items():
+            monkeypatch.setattr(Config, key, value)
+        apps.extend([create_app(), create_app()])
+        with apps[0].app_context():
+            db.create_all()
+        return apps
+
+    yield start
+    for app in apps:
+        with app.app_context():
+            db.engine.dispose()
+
+
+def _first_name(app, headers):
+    response = app.test_client().get("/auth/profile", headers=headers)
+    return response.status_code, (response.get_json().get("user") or {}).get("first_name")
+
+
+def test_revocation_reaches_other_workers_through_the_resp_backend(two_workers):
+    server = LocalRespServer(port=0)
+    server.start_background()
+    try:
+        worker_a, worker_b = two_workers(RESPONSE_CACHE_BACKEND="resp", RESPONSE_CACHE_URL=server.url)
+        token = register_user(worker_a.test_client())
+        headers = {"Authorization": f"Bearer {token}"}
+        assert _first_name(worker_b, headers) == (200, "Test")  # cached on worker B
+
+        response = worker_a.test_client().put("/auth/update", headers=headers, json={"first_name": "Renamed"})
+        assert response.status_code == 200
+        assert _first_name(worker_b, headers)[0] == 401
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_without_a_shared_backend_other_workers_revoke_after_the_ttl(two_workers):
+    worker_a, worker_b = two_workers(RESPONSE_CACHE_BACKEND="off")
+    token = register_user(worker_a.test_client())
+    headers = {"Authorization": f"Bearer {token}"}
+    assert _first_name(worker_b, headers) == (200, "Test")
+
+    worker_a.test_client().put("/auth/update", headers=headers, json={"first_name": "Renamed"})
+    # Worker B still has the old identity cached, for up to IDENTITY_CACHE_TTL
+    assert _first_name(worker_b, headers) == (200, "Test")
+    worker_b.extensions["identity_cache"].clear()  # the entry expiring
+    assert _first_name(worker_b, headers)[0] == 401
@@ -0,0 +1,51 @@
+from unittest import mock
+
+from flask_jwt_extended import JWTManager
+
+from conftest import auth_header, create_vehicle, register_user
+
+
+def test_batch_runs_sub_requests_in_order_with_the_callers_identity(client):
+    token = register_user(client)
+    vehicle_id = create_vehicle(client, token)["id"]
+
+    decode_jwt = JWTManager._decode_jwt_from_config
+    with mock.patch.object(JWTManager, "_decode_jwt_from_config", autospec=True, side_effect=decode_jwt) as decode:
+        response = client.post("/batch", headers=auth_header(token), json={"requests": [
+            {"method": "POST", "path": "/service-records/", "body": {
+                "vehicle_id": vehicle_id, "title": "Oil Change", "service_date": "2026-01-15",
+            }},
+            {"method": "GET", "path": f"/service-records/?vehicle_id={vehicle_id}&fields=title"},
+            {"method": "GET", "path": "/vehicles/999999"},
+            {"method": "GET", "path": "/auth/profile"},
+        ]})
+    assert response.status_code == 200
+    assert decode.call_count == 1
+
+    created, listed, missing, profile = response.get_json()["responses"]
+    assert created["status"] == 201
+    assert listed["status"] == 200
+    assert [r["title"] for r in listed["body"]["service_records"]] == ["Oil Change"]
+    assert missing == {"status": 404, "body": {"message": "Vehicle not found."}}
+    assert profile["body"]["user"]["email"] == "user@example.com"
+
+
+def test_batch_rejects_bad_input_and_enforces_limits(app, client):
+    token = register_user(client)
+
+    assert client.post("/batch", json={"requests": [{"path": "/vehicles/"}]}).status_code == 401
+    assert client.post("/batch", headers=auth_header(token), json={"requests": []}).status_code == 400
+
+    app.config["BATCH_MAX_REQUESTS"] = 2
+    too_many = client.post("/batch", headers=auth_header(token), json={"requests": [{"path": "/vehicles/"}] * 3})
+    assert too_many.status_code == 400
+
+    app.config.update(BATCH_MAX_REQUESTS=30, BATCH_MAX_QUERIES=1)
+    response = client.post("/batch", headers=auth_header(token), json={"requests": [
+        {"method": "GET", "path": "/batch"},
+        {"method": "TRACE", "path": "/vehicles/"},
+        {"method": "GET", "path": "/vehicles/?exclude=counts"},
+        {"method": "GET", "path": "/vehicles/"},
+    ]})
+    statuses = [r["status"] for r in response.get_json()["responses"]]
+    assert statuses == [400, 400, 200, 429]
@@ -0,0 +1,108 @@
+import pytest
+import requests
+
+from app.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+from conftest import auth_header, create_vehicle, register_user
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_opens_on_error_or_slow_rate_and_closes_after_a_good_probe():
+    clock = FakeClock()
+    circuit = CircuitBreaker("nhtsa", min_calls=4, error_rate=0.5, slow_call_seconds=2, open_seconds=30, clock=clock)
+
+    for ok in (True, True, False):
+        circuit.acquire()
+        circuit.record(ok, 0.1)
+    assert circuit.state == CLOSED  # below min_calls
+    circuit.acquire()
+    circuit.record(False, 0.1)
+    assert circuit.state == OPEN
+
+    with pytest.raises(CircuitOpenError) as error:
+        circuit.acquire()
+    assert error.value.retry_after == 30
+
+    clock.now += 30
+    circuit.acquire()  # the half-open probe
+    assert circuit.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        circuit.acquire()
+    circuit.record(True, 0.1)
+    assert circuit.state == CLOSED
+    assert circuit.snapshot()["window_calls"] == 0
+
+    # Successful but slow calls trip it too, and a slow probe reopens it
+    for _ in range(4):
+        circuit.acquire()
+        circuit.record(True, 3)
+    assert circuit.state == OPEN
+    clock.now += 30
+    circuit.acquire()
+    circuit.record(True, 3)
+    assert circuit.state == OPEN
+
+
+def test_old_calls_leave_the_window():
+    clock = FakeClock()
+    circuit = CircuitBreaker("nhtsa", window_seconds=60, min_calls=2, clock=clock)
+    circuit.acquire()
+    circuit.record(False, 0.1)
+    clock.now += 61
+    circuit.acquire()
+    circuit.record(False, 0.1)
+    assert circuit.state == CLOSED
+    assert circuit.snapshot()["window_failures"] == 1
+
+
+class FakeResponse:
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"results": [{"NHTSACampaignNumber": "23V001000", "Component": "AIR BAGS"}]}
+
+
+def test_open_recall_breaker_serves_the_last_count_as_stale(app, client, monkeypatch):
+    app.extensions["circuit_breakers"]["nhtsa_recalls"] = CircuitBreaker("nhtsa_recalls", min_calls=3)
+    token = register_user(client)
+    vehicle_id = create_vehicle(client, token)["id"]
+    unchecked_id = create_vehicle(client, token, vin="2HGFC2F59JH000001")["id"]
+    calls = []
+
+    def fake_get(url, **kwargs):
+        calls.append(url)
+        if len(calls) == 1:
+            return FakeResponse()
+        raise requests.ConnectionError("NHTSA unreachable")
+
+    monkeypatch.setattr(requests, "get", fake_get)
+    url = f"/vehicles/{vehicle_id}/recalls"
+    fresh = client.get(url, headers=auth_header(token)).get_json()
+    assert (fresh["count"], fresh["stale"]) == (1, False)
+    assert [client.get(url, headers=auth_header(token)).status_code for _ in range(2)] == [502, 502]
+
+    response = client.get(url, headers=auth_header(token))
+    assert response.status_code == 200
+    assert int(response.headers["Retry-After"]) > 0
+    body = response.get_json()
+    assert (body["count"], body["stale"], body["source"]) == (1, True, "cached")
+    assert body["recall_checked_at"] is not None
+    assert len(calls) == 3  # failed fast without calling NHTSA
+
+    response = client.get(f"/vehicles/{unchecked_id}/recalls", headers=auth_header(token))
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
+
+    health = client.get("/health").get_json()
+    assert health["status"] == "degraded"
+    assert health["dependencies"]["nhtsa_recalls"]["state"] == OPEN
+    assert health["dependencies"]["nhtsa_vpic"]["state"] == CLOSED
+    assert 'servicetrak_circuit_breaker_state{breaker="nhtsa_recalls"} 2' in client.get("/metrics").get_data(as_text=True)
@@ -0,0 +1,89 @@
+import gzip
+import io
+import json
+import zlib
+
+import pytest
+from flask import Response, send_file
+
+from app.utils.compression import choose_encoding
+
+from conftest import auth_header, create_service_record, create_vehicle, register_user
+
+
+def _seed_records(client, count=8):
+    token = register_user(client)
+    vehicle_id = create_vehicle(client, token)["id"]
+    for _ in range(count):
+        create_service_record(client, token, vehicle_id)
+    return token
+
+
+def test_large_json_is_gzipped_when_accepted(client):
+    token = _seed_records(client)
+
+    plain = client.get("/service-records/", headers=auth_header(token))
+    assert "Content-Encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["Vary"]
+
+    response = client.get(
+        "/service-records/", headers={**auth_header(token), "Accept-Encoding": "gzip, deflate"}
+    )
+    assert response.headers["Content-Encoding"] == "gzip"
+    body = gzip.decompress(response.get_data())
+    assert len(response.get_data()) < len(body)
+    assert json.loads(body) == plain.get_json()
+
+
+def test_small_or_refused_responses_are_not_compressed(client):
+    token = _seed_records(client)
+
+    small = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in small.headers
+
+    refused = client.get("/service-records/", headers={**auth_header(token), "Accept-Encoding": "gzip;q=0, identity"})
+    assert "Content-Encoding" not in refused.headers
+
+
+def test_streamed_responses_are_compressed_chunk_by_chunk(app, client):
+    def stream():
+        for i in range(200):
+            yield f"line {i}\n"
+
+    app.add_url_rule("/_stream", "stream", lambda: Response(stream(), mimetype="text/plain"))
+
+    response = client.get("/_stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    assert zlib.decompress(response.get_data(), 31).decode() == "".join(stream())
+
+
+def test_files_and_precompressed_bodies_are_passed_through(app, client):
+    text = b"receipt " * 500
+    app.add_url_rule(
+        "/_file", "file", lambda: send_file(io.BytesIO(text), mimetype="text/plain", download_name="r.txt")
+    )
+    app.add_url_rule(
+        "/_precompressed", "precompressed",
+        lambda: Response(gzip.compress(text), mimetype="text/plain", headers={"Content-Encoding": "gzip"}),
+    )
+
+    assert client.get("/_file", headers={"Accept-Encoding": "gzip"}).get_data() == text
+    precompressed = client.get("/_precompressed", headers={"Accept-Encoding": "gzip"})
+    assert gzip.decompress(precompressed.get_data()) == text
+
+
+def test_encoding_negotiation_honours_q_values():
+    assert choose_encoding("gzip;q=0.5, br;q=0.9", ["br", "gzip"]) == "br"
+    assert choose_encoding("br;q=0.1, gzip", ["br", "gzip"]) == "gzip"
+    assert choose_encoding("*", ["br", "gzip"]) == "br"
+    assert choose_encoding("identity", ["br", "gzip"]) is None
+
+
+def test_brotli_is_used_when_installed(client):
+    brotli = pytest.importorskip("brotli")
+    token = _seed_records(client)
+
+    response = client.get("/service-records/", headers={**auth_header(token), "Accept-Encoding": "gzip, br"})
+    assert response.headers["Content-Encoding"] == "br"
+    assert json.loads(brotli.decompress(response.get_data()))["service_records"]
@@ -0,0 +1,96 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from conftest import (
+    auth_header,
+    create_attachment,
+    create_reminder,
+    create_service_record,
+    create_vehicle,
+    query_count,
+    register_user,
+)
+
+
+def _select_statements(client, url, token):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "after_cursor_execute", _record)
+    try:
+        response = client.get(url, headers=auth_header(token))
+    finally:
+        event.remove(Engine, "after_cursor_execute", _record)
+    return response, statements
+
+
+def test_fields_narrow_the_payload_and_the_select(client):
+    token = register_user(client)
+    vehicle_id = create_vehicle(client, token)["id"]
+    create_reminder(client, token, vehicle_id)
+
+    response, statements = _select_statements(
+        client, "/reminders/?fields=id,title,due_date,is_completed", token
+    )
+    assert response.status_code == 200
+    assert set(response.get_json()["reminders"][0]) == {"id", "title", "due_date", "is_completed"}
+    assert len(statements) == 1
+    assert "reminders.notes" not in statements[0]
+    assert "vehicles.nickname" not in statements[0]
+
+
+def test_include_and_exclude_toggle_embeds(client):
+    token = register_user(client)
+    vehicle_id = create_vehicle(client, token)["id"]
+    record_id = create_service_record(client, token, vehicle_id)["id"]
+    create_attachment(record_id)
+
+    response = client.get("/vehicles/?exclude=counts", headers=auth_header(token))
+    assert "service_record_count" not in response.get_json()["vehicles"][0]
+    assert query_count(response) == 1
+
+    response = client.get("/vehicles/?fields=nickname,is_decoded", headers=auth_header(token))
+    assert response.get_json()["vehicles"] == [{"id": vehicle_id, "nickname": "Daily", "is_decoded": True}]
+
+    records = client.get(
+        "/service-records/?fields=title&include=attachments,vehicle", headers=auth_header(token)
+    ).get_json()["service_records"]
+    assert set(records[0]) == {"id", "title", "attachments", "vehicle"}
+    assert len(records[0]["attachments"]) == 1
+
+    records = client.get("/service-records/?exclude=vehicle", headers=auth_header(token)).get_json()
+    assert "vehicle" not in records["service_records"][0]
+    assert "cost" in records["service_records"][0]
+
+
+def test_detail_endpoints_accept_fieldsets(client):
+    token = register_user(client)
+    vehicle_id = create_vehicle(client, token)["id"]
+    record_id = create_service_record(client, token, vehicle_id)["id"]
+    reminder_id = create_reminder(client, token, vehicle_id)["id"]
+
+    vehicle = client.get(f"/vehicles/{vehicle_id}?fields=vin,counts", headers=auth_header(token)).get_json()
+    assert vehicle["vehicle"]["service_record_count"] == 1
+    assert "nickname" not in vehicle["vehicle"]
+
+    record = client.get(f"/service-records/{record_id}?fields=vehicle", headers=auth_header(token)).get_json()
+    assert record["service_record"] == {"id": record_id, "vehicle": {
+        "id": vehicle_id, "nickname": "Daily", "year": 2020, "make": "Honda", "model": "Accord",
+    }}
+
+    reminder = client.get(f"/reminders/{reminder_id}?exclude=vehicle", headers=auth_header(token)).get_json()
+    assert "vehicle" not in reminder["reminder"]
+    assert client.get("/reminders/999?fields=title", headers=auth_header(token)).status_code == 404
+
+
+def test_unknown_fields_are_rejected(client):
+    token = register_user(client)
+
+    response = client.get("/reminders/?fields=title,password_hash", headers=auth_header(token))
+    assert response.status_code == 400
+    assert "password_hash" in response.get_json()["message"]
+
+    response = client.get("/vehicles/?include=attachments", headers=auth_header(token))
+    assert response.status_code == 400
@@ -0,0 +1,120 @@
+import app.routes.vehicles as vehicles_module
+from app.extensions import db
+from app.models import Job
+from app.utils.jobs import run_next_job
+
+from conftest import auth_header, query_count, register_user
+
+VIN = "1HGCM82633A004352"
+DECODED = {"year": 2003, "make": "HONDA", "model": "Accord", "trim": "EX", "engine": "J30A4"}
+
+
+def _create(client, token, **fields):
+    response = client.post(
+        "/vehicles/",
+        headers=auth_header(token),
+        json={"nickname": "Daily", "vin": VIN, "decode_vin": True, **fields},
+    )
+    assert response.status_code == 201
+    return response
+
+
+def test_create_enqueues_decode_and_worker_fills_blank_fields(client, monkeypatch):
+    calls = []
+    monkeypatch.setattr(vehicles_module, "decode_vin", lambda vin: calls.append(vin) or DECODED)
+    token = register_user(client)
+
+    body = _create(client, token, model="Accord Coupe").get_json()
+    vehicle, job = body["vehicle"], body["job"]
+    assert job["status"] == "queued"
+    assert vehicle["make"] is None
+    assert calls == []
+
+    pending = client.get(f"/jobs/{job['id']}/result", headers=auth_header(token))
+    assert pending.status_code == 202
+
+    assert run_next_job() is True
+    assert run_next_job() is False
+    assert calls == [VIN]
+
+    result = client.get(f"/jobs/{job['id']}/result", headers=auth_header(token))
+    assert result.status_code == 200
+    assert result.get_json()["job"]["status"] == "succeeded"
+
+    refreshed = client.get(f"/vehicles/{vehicle['id']}", headers=auth_header(token)).get_json()["vehicle"]
+    assert (refreshed["year"], refreshed["make"], refreshed["trim"]) == (2003, "HONDA", "EX")
+    # Entered by the user, so the automatic decode keeps it
+    assert refreshed["model"] == "Accord Coupe"
+
+
+def test_decode_jobs_are_not_duplicated(client, monkeypatch):
+    monkeypatch.setattr(vehicles_module, "decode_vin", lambda vin: DECODED)
+    token = register_user(client)
+    body = _create(client, token).get_json()
+    vehicle_id, job_id = body["vehicle"]["id"], body["job"]["id"]
+
+    for _ in range(2):
+        response = client.post(
+            "/jobs/", headers=auth_header(token), json={"kind": "decode_vin", "vehicle_id": vehicle_id}
+        )
+        assert response.status_code == 202
+        assert response.get_json()["job"]["id"] == job_id
+    assert db.session.query(Job).count() == 1
+
+    status = client.get(f"/jobs/{job_id}", headers=auth_header(token))
+    assert status.status_code == 200
+    assert query_count(status) <= 2
+
+    other = register_user(client, email="other@example.com")
+    assert client.get(f"/jobs/{job_id}", headers=auth_header(other)).status_code == 404
+    response = client.post("/jobs/", headers=auth_header(other), json={"kind": "decode_vin", "vehicle_id": vehicle_id})
+    assert response.status_code == 404
+    assert client.post("/jobs/", headers=auth_header(token), json={"kind": "nope"}).status_code == 400
+
+
+def test_failures_retry_then_fail(app, client, monkeypatch):
+    def unavailable(vin):
+        raise ConnectionError("NHTSA unavailable")
+
+    monkeypatch.setattr(vehicles_module, "decode_vin", unavailable)
+    app.config.update(JOB_MAX_ATTEMPTS=2, JOB_RETRY_BACKOFF_SECONDS=0)
+    token = register_user(client)
+    job_id = _create(client, token).get_json()["job"]["id"]
+
+    assert run_next_job() is True
+    job = db.session.get(Job, job_id)
+    assert (job.status, job.attempts) == ("queued", 1)
+
+    assert run_next_job() is True
+    response = client.get(f"/jobs/{job_id}/result", headers=auth_header(token))
+    assert response.status_code == 409
+    assert response.get_json()["job"]["attempts"] == 2
+
+    # Enqueueing a failed job's key again requeues that job
+    monkeypatch.setattr(vehicles_module, "decode_vin", lambda vin: DECODED)
+    vehicle_id = job.payload["vehicle_id"]
+    response = client.post("/jobs/", headers=auth_header(token), json={"kind": "decode_vin", "vehicle_id": vehicle_id})
+    job = response.get_json()["job"]
+    assert (job["id"], job["status"], job["attempts"]) == (job_id, "queued", 0)
+    assert run_next_job() is True
+    assert db.session.get(Job, job_id).status == "succeeded"
+
+
+def test_enqueueing_a_finished_job_again_runs_it_with_the_new_payload(client, monkeypatch):
+    monkeypatch.setattr(vehicles_module, "decode_vin", lambda vin: DECODED)
+    token = register_user(client)
+    body = _create(client, token, model="Accord Coupe").get_json()
+    vehicle_id, job_id = body["vehicle"]["id"], body["job"]["id"]
+    assert run_next_job() is True
+    assert db.session.get(Job, job_id).payload["overwrite"] is False
+
+    response = client.post(
+        "/jobs/", headers=auth_header(token), json={"kind": "decode_vin", "vehicle_id": vehicle_id, "overwrite": True}
+    )
+    job = response.get_json()["job"]
+    assert (job["id"], job["status"], job["attempts"]) == (job_id, "queued", 0)
+    assert run_next_job() is True
+
+    vehicle = client.get(f"/vehicles/{vehicle_id}", headers=auth_header(token)).get_json()["vehicle"]
+    assert vehicle["model"] == "Accord"
+    assert db.session.query(Job).count() == 1
@@ -0,0 +1,34 @@
+from app.utils.metrics import external_call
+
+from conftest import auth_header, create_vehicle, register_user
+
+
+def test_requests_are_timed_and_queries_counted(client):
+    token = register_user(client)
+    create_vehicle(client, token)
+
+    response = client.get("/vehicles/", headers=auth_header(token))
+    server_timing = response.headers["Server-Timing"]
+    assert server_timing.startswith("app;dur=")
+    assert "queries" in server_timing
+
+    body = client.get("/metrics").get_data(as_text=True)
+    assert "# TYPE servicetrak_http_request_duration_seconds histogram" in body
+    assert 'servicetrak_http_request_duration_seconds_count{endpoint="vehicles.list_vehicles",method="GET",status="200"}' in body
+    assert 'servicetrak_http_request_db_queries_bucket{endpoint="vehicles.list_vehicles",le="+Inf"}' in body
+
+
+def test_external_calls_are_recorded_with_outcome():
+    try:
+        with external_call("nhtsa", "test_op"):
+            raise RuntimeError("down")
+    except RuntimeError:
+        pass
+
+    with external_call("nhtsa", "test_op"):
+        pass
+
+    from app.utils.metrics import EXTERNAL_LATENCY
+
+    assert EXTERNAL_LATENCY.count(service="nhtsa", operation="test_op", outcome="error") == 1
+    assert EXTERNAL_LATENCY.count(service="nhtsa", operation="test_op", outcome="ok") == 1
@@ -0,0 +1,98 @@
+import pytest
+
+from app.routes.vehicles import vehicle_counts
+from app.utils.query_budget import QueryBudgetExceeded
+
+from conftest import (
+    auth_header,
+    create_attachment,
+    create_reminder,
+    create_service_record,
+    create_vehicle,
+    query_count,
+    register_user,
+)
+
+
+def seed(client, vehicles, records_per_vehicle):
+    token = register_user(client)
+    vehicle_ids = []
+    for i in range(vehicles):
+        vehicle = create_vehicle(client, token, vin=f"1HGCM82633A{i:06d}")
+        vehicle_ids.append(vehicle["id"])
+        for _ in range(records_per_vehicle):
+            record = create_service_record(client, token, vehicle["id"])
+            create_attachment(record["id"])
+            create_reminder(client, token, vehicle["id"])
+    return token, vehicle_ids
+
+
+def read_query_counts(client, token, vehicle_id):
+    headers = auth_header(token)
+    paths = [
+        "/vehicles/",
+        f"/vehicles/{vehicle_id}",
+        f"/vehicles/{vehicle_id}/overview",
+        "/service-records/",
+        "/service-records/?include=attachments",
+        f"/service-records/attachments?vehicle_id={vehicle_id}",
+        "/reminders/",
+        "/auth/profile",
+    ]
+    counts = {}
+    for path in paths:
+        response = client.get(path, headers=headers)
+        assert response.status_code == 200, path
+        counts[path.replace(str(vehicle_id), "<id>")] = query_count(response)
+    return counts
+
+
+def test_every_route_declares_a_query_budget(app):
+    missing = [
+        endpoint
+        for endpoint, view in app.view_functions.items()
+        if "." in endpoint and getattr(view, "query_budget", None) is None
+    ]
+    assert missing == []
+
+
+@pytest.mark.parametrize("vehicles,records_per_vehicle", [(1, 1), (4, 5)])
+def test_read_query_counts_do_not_grow_with_data(client, vehicles, records_per_vehicle):
+    token, vehicle_ids = seed(client, vehicles, records_per_vehicle)
+
+    # Budgets are enforced in "raise" mode for every request the suite makes
+    assert read_query_counts(client, token, vehicle_ids[0]) == {
+        "/vehicles/": 3,
+        "/vehicles/<id>": 3,
+        "/vehicles/<id>/overview": 4,
+        "/service-records/": 1,
+        "/service-records/?include=attachments": 2,
+        "/service-records/attachments?vehicle_id=<id>": 2,
+        "/reminders/": 1,
+        "/auth/profile": 0,
+    }
+
+
+def test_budget_violation_lists_statements(client, monkeypatch):
+    token, _ = seed(client, 1, 1)
+    view = client.application.view_functions["vehicles.list_vehicles"]
+    monkeypatch.setattr(view, "query_budget", 1)
+
+    with pytest.raises(QueryBudgetExceeded) as excinfo:
+        client.get("/vehicles/", headers=auth_header(token))
+
+    assert excinfo.value.budget == 1
+    assert len(excinfo.value.statements) == 3
+    assert "FROM vehicles" in str(excinfo.value)
+
+
+def test_assert_max_queries_fixture(client, app, assert_max_queries):
+    seed(client, 3, 2)
+
+    with assert_max_queries(2) as statements:
+        vehicle_counts([1, 2, 3])
+    assert len(statements) == 2
+
+    with pytest.raises(QueryBudgetExceeded):
+        with assert_max_queries(1):
+            vehicle_counts([1, 2, 3])
@@ -0,0 +1,132 @@
+import sqlite3
+
+import pytest
+
+from app import create_app
+from app.extensions import db
+from app.utils.resp import LocalRespServer
+from config import Config
+
+from conftest import auth_header, create_vehicle, register_user
+
+
+@pytest.fixture()
+def replica_app(tmp_path, monkeypatch):
+    primary, replica = tmp_path / "primary.db", tmp_path / "replica.db"
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{primary}")
+    monkeypatch.setattr(Config, "DATABASE_REPLICA_URLS", [f"sqlite:///{replica}"])
+    monkeypatch.setattr(Config, "RESPONSE_CACHE_BACKEND", "off")
+    app = create_app()
+
+    def replicate():
+        """Stands in for streaming replication: copies the primary file over the replica."""
+        for engine in app.extensions["replica_engines"]:
+            engine.dispose()
+        with sqlite3.connect(primary) as source, sqlite3.connect(replica) as target:
+            source.backup(target)
+
+    with app.app_context():
+        db.create_all()
+        replicate()
+        app.replicate = replicate
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+def _vehicle_count(client, token):
+    return len(client.get("/vehicles/", headers=auth_header(token)).get_json()["vehicles"])
+
+
+def test_reads_go_to_the_replica_and_writes_to_the_primary(replica_app):
+    client = replica_app.test_client()
+    token = register_user(client)
+    replica_app.replicate()
+    replica_app.extensions["primary_pins"]._until.clear()
+
+    create_vehicle(client, token)
+    replica_app.extensions["primary_pins"]._until.clear()
+
+    # Not replicated yet: the replica doesn't have the vehicle, the primary does
+    assert _vehicle_count(client, token) == 0
+    replica_app.replicate()
+    assert _vehicle_count(client, token) == 1
+
+
+def test_writers_read_their_own_writes_until_the_pin_expires(replica_app):
+    client = replica_app.test_client()
+    alice = register_user(client, "alice@example.com")
+    bob = register_user(client, "bob@example.com")
+    replica_app.replicate()
+    pins = replica_app.extensions["primary_pins"]
+    pins._until.clear()
+
+    create_vehicle(client, alice)
+    assert _vehicle_count(client, alice) == 1  # pinned to the primary
+    assert pins.is_pinned("1")
+    assert not pins.is_pinned("2")
+
+    pins.window = 0
+    create_vehicle(client, alice, vin="2T1BURHE0JC123456")
+    assert _vehicle_count(client, alice) == 0  # pin expired, replica still behind
+    assert _vehicle_count(client, bob) == 0
+
+
+def test_new_users_are_pinned_so_their_token_works_before_replication(replica_app):
+    client = replica_app.test_client()
+    token = register_user(client)
+
+    response = client.get("/vehicles/", headers=auth_header(token))
+    assert response.status_code == 200
+
+
+def test_pins_are_shared_between_workers_through_the_resp_backend(tmp_path, monkeypatch):
+    server = LocalRespServer(port=0)
+    server.start_background()
+    primary, replica = tmp_path / "primary.db", tmp_path / "replica.db"
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{primary}")
+    monkeypatch.setattr(Config, "DATABASE_REPLICA_URLS", [f"sqlite:///{replica}"])
+    monkeypatch.setattr(Config, "RESPONSE_CACHE_BACKEND", "resp")
+    monkeypatch.setattr(Config, "RESPONSE_CACHE_URL", server.url)
+    # Two gunicorn workers: separate apps, one database and one RESP server
+    worker_a, worker_b = create_app(), create_app()
+
+    def replicate():
+        for app in (worker_a, worker_b):
+            for engine in app.extensions["replica_engines"]:
+                engine.dispose()
+        with sqlite3.connect(primary) as source, sqlite3.connect(replica) as target:
+            source.backup(target)
+
+    try:
+        with worker_a.app_context():
+            db.create_all()
+        token = register_user(worker_a.test_client())
+        replicate()
+        server.store.execute("FLUSHDB", [])
+
+        create_vehicle(worker_a.test_client(), token)
+        assert _vehicle_count(worker_b.test_client(), token) == 1  # pinned by worker A's write
+
+        server.store.execute("FLUSHDB", [])
+        assert _vehicle_count(worker_b.test_client(), token) == 0  # unpinned: the lagging replica
+    finally:
+        server.shutdown()
+        server.server_close()
+        for app in (worker_a, worker_b):
+            with app.app_context():
+                db.engine.dispose()
+
+
+def test_sync_reads_from_the_primary_so_its_token_skips_nothing(replica_app):
+    client = replica_app.test_client()
+    token = register_user(client)
+    sync_token = client.get("/sync", headers=auth_header(token)).get_json()["sync_token"]
+    replica_app.replicate()
+
+    create_vehicle(client, token)
+    replica_app.extensions["primary_pins"]._until.clear()
+
+    # The replica is behind, but the delta still carries the new vehicle
+    body = client.get(f"/sync?token={sync_token}", headers=auth_header(token)).get_json()
+    assert [vehicle["vin"] for vehicle in body["vehicles"]] == ["1HGCM82633A004352"]
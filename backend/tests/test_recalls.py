@@ -0,0 +1,101 @@
+import zipfile
+
+from app.extensions import db
+from app.models import RecallCampaign, Vehicle
+from app.utils.recalls import lookup_recalls_local, refresh_recall_counts
+
+from conftest import auth_header, query_count, register_user
+
+
+def flat_row(record_id, campaign, make, model, year, component, remedy="Dealers will replace the part."):
+    columns = [""] * 27
+    columns[0], columns[1], columns[2], columns[3], columns[4] = str(record_id), campaign, make, model, str(year)
+    columns[6], columns[7], columns[11], columns[15] = component, "Honda (American Honda Motor Co.)", "1200", "20230105"
+    columns[19], columns[20], columns[21] = "The part may fail.", "Increased risk of a crash.", remedy
+    return "\t".join(columns)
+
+
+ROWS = [
+    flat_row(1, "23V001000", "HONDA", "CR-V", 2020, "AIR BAGS"),
+    flat_row(2, "23V001000", "HONDA", "CR-V", 2020, "SEAT BELTS"),
+    flat_row(3, "23V002000", "HONDA", "CR-V", 2021, "STEERING"),
+    flat_row(4, "22V900000", "HONDA", "CIVIC", 9999, "ENGINE"),
+]
+
+
+def write_flat_file(tmp_path, rows):
+    path = tmp_path / "FLAT_RCL.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("FLAT_RCL.txt", "\r\n".join(rows) + "\r\n")
+    return str(path)
+
+
+def run_import(app, path, *args):
+    result = app.test_cli_runner().invoke(args=["import-recalls", path, *args])
+    assert result.exit_code == 0, result.output
+    return result.output
+
+
+def test_reimports_only_write_changed_records(app, tmp_path):
+    output = run_import(app, write_flat_file(tmp_path, ROWS))
+    assert "inserted=4, updated=0, unchanged=0" in output
+    assert db.session.get(RecallCampaign, 4).year is None
+
+    output = run_import(app, write_flat_file(tmp_path, ROWS))
+    assert "inserted=0, updated=0, unchanged=4" in output
+
+    changed = [
+        flat_row(1, "23V001000", "HONDA", "CR-V", 2020, "AIR BAGS", remedy="Updated remedy."),
+        *ROWS[1:3],
+        flat_row(5, "23V003000", "HONDA", "CR-V", 2020, "BRAKES"),
+    ]
+    output = run_import(app, write_flat_file(tmp_path, changed), "--prune")
+    assert "inserted=1, updated=1, unchanged=2, skipped=0, deleted=1" in output
+    assert db.session.get(RecallCampaign, 1).remedy == "Updated remedy."
+    assert db.session.get(RecallCampaign, 4) is None
+
+
+def test_recalls_endpoint_answers_from_local_table(app, client, tmp_path):
+    run_import(app, write_flat_file(tmp_path, ROWS))
+    app.config["RECALLS_SOURCE"] = "local"
+    token = register_user(client)
+    vehicle_id = client.post(
+        "/vehicles/", headers=auth_header(token), json={"year": 2020, "make": "Honda", "model": "Cr-v"}
+    ).get_json()["vehicle"]["id"]
+
+    response = client.get(f"/vehicles/{vehicle_id}/recalls", headers=auth_header(token))
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["source"] == "local"
+    assert body["count"] == 1
+    assert body["recalls"][0]["campaign_number"] == "23V001000"
+    assert body["recalls"][0]["component"] == "AIR BAGS; SEAT BELTS"
+    assert body["recalls"][0]["report_date"] == "2023-01-05"
+    assert query_count(response) <= 4
+
+
+def test_local_lookup_fills_a_blank_first_component(app, tmp_path):
+    rows = [
+        flat_row(1, "23V004000", "HONDA", "PILOT", 2022, ""),
+        flat_row(2, "23V004000", "HONDA", "PILOT", 2022, "FUEL SYSTEM"),
+        flat_row(3, "23V004000", "HONDA", "PILOT", 2022, "ENGINE"),
+    ]
+    run_import(app, write_flat_file(tmp_path, rows))
+
+    recalls = lookup_recalls_local(2022, "Honda", "Pilot")
+    assert [recall["component"] for recall in recalls] == ["FUEL SYSTEM; ENGINE"]
+
+
+def test_refresh_counts_every_vehicle_with_one_update(app, client, tmp_path, assert_max_queries):
+    run_import(app, write_flat_file(tmp_path, ROWS), "--no-refresh-vehicles")
+    token = register_user(client)
+    for year, model in ((2020, "CR-V"), (2021, "cr v"), (2019, "Pilot")):
+        client.post("/vehicles/", headers=auth_header(token), json={"year": year, "make": "honda", "model": model})
+
+    with assert_max_queries(5):
+        assert refresh_recall_counts() == 2
+    counts = dict(db.session.query(Vehicle.model, Vehicle.recall_count))
+    assert counts == {"CR-V": 1, "cr v": 1, "Pilot": 0}
+
+    # Nothing changed: the vehicles keep their updated_at
+    assert refresh_recall_counts() == 0
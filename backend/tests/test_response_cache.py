@@ -0,0 +1,106 @@
+import pytest
+
+from app.utils.resp import LocalRespServer
+from app.utils.response_cache import RespCacheBackend, ResponseCache
+
+from conftest import auth_header, create_reminder, create_service_record, create_vehicle, query_count, register_user
+
+
+@pytest.fixture()
+def resp_server():
+    server = LocalRespServer(port=0)
+    server.start_background()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_list_is_served_from_cache_until_a_write(client):
+    token = register_user(client)
+    vehicle_id = create_vehicle(client, token)["id"]
+
+    first = client.get("/vehicles/", headers=auth_header(token))
+    second = client.get("/vehicles/", headers=auth_header(token))
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert query_count(second) == 0
+    assert second.get_json() == first.get_json()
+
+    client.put(f"/vehicles/{vehicle_id}", json={"nickname": "Renamed"}, headers=auth_header(token))
+    third = client.get("/vehicles/", headers=auth_header(token))
+    assert third.headers["X-Cache"] == "MISS"
+    assert third.get_json()["vehicles"][0]["nickname"] == "Renamed"
+
+
+def test_writes_in_other_blueprints_invalidate_related_lists(client):
+    token = register_user(client)
+    vehicle_id = create_vehicle(client, token)["id"]
+
+    client.get("/vehicles/", headers=auth_header(token))
+    client.get("/service-records/", headers=auth_header(token))
+    client.get("/reminders/", headers=auth_header(token))
+
+    create_service_record(client, token, vehicle_id)
+    create_reminder(client, token, vehicle_id)
+
+    vehicles = client.get("/vehicles/", headers=auth_header(token)).get_json()["vehicles"]
+    assert vehicles[0]["service_record_count"] == 1
+    assert len(client.get("/service-records/", headers=auth_header(token)).get_json()["service_records"]) == 1
+    assert len(client.get("/reminders/", headers=auth_header(token)).get_json()["reminders"]) == 1
+
+
+def test_cache_is_keyed_by_user_and_query_args(client):
+    alice = register_user(client, "alice@example.com")
+    bob = register_user(client, "bob@example.com")
+    create_vehicle(client, alice)
+
+    client.get("/service-records/", headers=auth_header(alice))
+    filtered = client.get("/service-records/?include=attachments", headers=auth_header(alice))
+    assert filtered.headers["X-Cache"] == "MISS"
+
+    client.get("/vehicles/", headers=auth_header(alice))
+    other = client.get("/vehicles/", headers=auth_header(bob))
+    assert other.headers["X-Cache"] == "MISS"
+    assert other.get_json() == {"vehicles": []}
+
+
+def test_resp_backend_shares_entries_through_a_local_server(app, client, resp_server):
+    app.extensions["response_cache"] = ResponseCache(RespCacheBackend(resp_server.url))
+    token = register_user(client)
+    create_vehicle(client, token)
+
+    assert client.get("/vehicles/", headers=auth_header(token)).headers["X-Cache"] == "MISS"
+    assert client.get("/vehicles/", headers=auth_header(token)).headers["X-Cache"] == "HIT"
+    assert any(key.startswith(b"servicetrak:resp:") for key in resp_server.store.data)
+
+    create_vehicle(client, token, vin="2T1BURHE0JC123456")
+    response = client.get("/vehicles/", headers=auth_header(token))
+    assert response.headers["X-Cache"] == "MISS"
+    assert len(response.get_json()["vehicles"]) == 2
+
+
+def test_unreachable_backend_falls_through_to_the_view(app, client, resp_server):
+    url = resp_server.url
+    resp_server.shutdown()
+    resp_server.server_close()
+    app.extensions["response_cache"] = ResponseCache(RespCacheBackend(url, timeout=0.1))
+
+    token = register_user(client)
+    create_vehicle(client, token)
+    response = client.get("/vehicles/", headers=auth_header(token))
+    assert response.status_code == 200
+    assert len(response.get_json()["vehicles"]) == 1
+
+
+def test_hit_rates_are_exposed(client):
+    token = register_user(client)
+    client.get("/reminders/", headers=auth_header(token))
+    client.get("/reminders/", headers=auth_header(token))
+
+    stats = client.get("/cache").get_json()
+    assert stats["backend"] == "local"
+    assert stats["endpoints"]["reminders.list_reminders"]["hit"] >= 1
+    assert stats["endpoints"]["reminders.list_reminders"]["hit_rate"] > 0
+
+    body = client.get("/metrics").get_data(as_text=True)
+    assert 'servicetrak_response_cache_requests_total{endpoint="reminders.list_reminders",result="hit"}' in body
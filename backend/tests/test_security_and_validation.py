@@ -1,43 +1,13 @@
 from app.models import ServiceRecordAttachment
 from app.extensions import db
 
-from conftest import auth_header, register_user
-
-
-def create_vehicle(client, token, vin="1HGCM82633A004352"):
-    response = client.post(
-        "/vehicles/",
-        headers=auth_header(token),
-        json={"nickname": "Daily", "vin": vin, "year": "2020", "make": "Honda", "model": "Accord"},
-    )
-    assert response.status_code == 201
-    return response.get_json()["vehicle"]
-
-
-def create_service_record(client, token, vehicle_id):
-    response = client.post(
-        "/service-records/",
-        headers=auth_header(token),
-        json={
-            "vehicle_id": vehicle_id,
-            "title": "Oil Change",
-            "service_date": "2026-01-15",
-            "mileage": "12000",
-            "cost": "89.50",
-        },
-    )
-    assert response.status_code == 201
-    return response.get_json()["service_record"]
-
-
-def create_reminder(client, token, vehicle_id):
-    response = client.post(
-        "/reminders/",
-        headers=auth_header(token),
-        json={"vehicle_id": vehicle_id, "title": "Rotate tires", "due_mileage": "15000"},
-    )
-    assert response.status_code == 201
-    return response.get_json()["reminder"]
+from conftest import (
+    auth_header,
+    create_reminder,
+    create_service_record,
+    create_vehicle,
+    register_user,
+)
 
 
 def test_user_cannot_access_another_users_vehicle(client):
@@ -0,0 +1,56 @@
+from datetime import datetime
+
+from app.models import ServiceRecord, ServiceRecordAttachment, User, Vehicle
+from app.utils.validation import has_valid_vin_checksum
+
+
+def test_vin_checksum():
+    assert has_valid_vin_checksum("1HGCM82633A004352")
+    assert not has_valid_vin_checksum("1HGCM82643A004352")
+
+
+def test_seed_fleet_generates_consistent_history(app):
+    result = app.test_cli_runner().invoke(args=[
+        "seed-fleet", "--users", "3", "--vehicles-per-user", "2", "--records-per-vehicle", "5",
+        "--reminders-per-vehicle", "2", "--attachment-ratio", "1", "--batch-size", "7",
+    ])
+    assert result.exit_code == 0, result.output
+
+    assert User.query.count() == 3
+    assert Vehicle.query.count() == 6
+    assert ServiceRecord.query.count() == 30
+    assert ServiceRecordAttachment.query.count() == 30
+
+    for vehicle in Vehicle.query.all():
+        assert has_valid_vin_checksum(vehicle.vin)
+        records = sorted(vehicle.service_records, key=lambda r: r.service_date)
+        mileages = [r.mileage for r in records]
+        assert mileages == sorted(mileages)
+        assert len(set(mileages)) == len(mileages)
+
+
+def test_seed_fleet_service_dates_stop_at_today(app):
+    # A long history for each vehicle runs past today unless it is capped
+    result = app.test_cli_runner().invoke(args=[
+        "seed-fleet", "--users", "1", "--vehicles-per-user", "2", "--records-per-vehicle", "100", "--seed", "1",
+    ])
+    assert result.exit_code == 0, result.output
+
+    today = datetime.utcnow().date()
+    dates = [record.service_date for record in ServiceRecord.query.all()]
+    assert max(dates) == today
+    assert all(service_date <= today for service_date in dates)
+
+
+def test_seed_fleet_appends_after_existing_rows(app, client):
+    from conftest import create_vehicle, register_user
+
+    token = register_user(client)
+    create_vehicle(client, token)
+
+    result = app.test_cli_runner().invoke(args=["seed-fleet", "--users", "1", "--seed", "7"])
+    assert result.exit_code == 0, result.output
+    assert User.query.count() == 2
+    assert client.post(
+        "/auth/login", json={"email": "fleet2@example.com", "password": "password123"}
+    ).status_code == 200
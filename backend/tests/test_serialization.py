@@ -0,0 +1,49 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from app.extensions import db
+from app.models import Reminder, ServiceRecord, ServiceRecordAttachment, Vehicle
+from app.routes.attachments import attachment_to_dict
+from app.routes.reminders import reminder_to_dict
+from app.routes.service_records import service_record_to_dict
+from app.routes.vehicles import vehicle_to_dict
+
+from conftest import auth_header, create_attachment, create_reminder, create_service_record, create_vehicle, register_user
+
+
+def test_provider_encodes_dates_and_decimals_natively(app):
+    body = app.json.response({
+        "b": Decimal("45.10"),
+        "a": date(2026, 1, 2),
+        "c": datetime(2026, 1, 2, 3, 4, 5, 678900),
+        "d": datetime(2026, 1, 2, 3, 4, 5),
+    }).get_data(as_text=True)
+
+    assert body == '{"a":"2026-01-02","b":45.1,"c":"2026-01-02T03:04:05.678900","d":"2026-01-02T03:04:05"}\n'
+    assert app.json.loads(app.json.dumps({1: "x"})) == {"1": "x"}
+
+
+def test_row_serializers_match_orm_serializers(client):
+    token = register_user(client)
+    vehicle_id = create_vehicle(client, token)["id"]
+    client.put(f"/vehicles/{vehicle_id}", json={"trim": "EX-L"}, headers=auth_header(token))
+    record_id = create_service_record(client, token, vehicle_id)["id"]
+    client.put(f"/service-records/{record_id}", json={"cost": "89.90", "notes": "Synthetic"}, headers=auth_header(token))
+    create_reminder(client, token, vehicle_id)
+    create_attachment(record_id)
+
+    vehicles = client.get("/vehicles/", headers=auth_header(token)).get_json()["vehicles"]
+    records = client.get("/service-records/?include=attachments", headers=auth_header(token)).get_json()
+    reminders = client.get("/reminders/", headers=auth_header(token)).get_json()["reminders"]
+
+    db.session.expire_all()
+    record = db.session.get(ServiceRecord, record_id)
+    expected_record = service_record_to_dict(record)
+    expected_record["attachments"] = [
+        attachment_to_dict(a) for a in ServiceRecordAttachment.query.filter_by(service_record_id=record_id)
+    ]
+
+    assert vehicles == [vehicle_to_dict(db.session.get(Vehicle, vehicle_id))]
+    assert records["service_records"] == [expected_record]
+    assert records["service_records"][0]["cost"] == 89.9
+    assert reminders == [reminder_to_dict(r) for r in Reminder.query.all()]
@@ -0,0 +1,120 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import create_app
+from app.extensions import db
+from app.models import SingleFlightCall
+from app.routes import vehicles
+from app.utils.recalls import name_key
+from app.utils.single_flight import SINGLE_FLIGHT_CALLS, SharedCallError, coalesce, waiting_callers
+from config import Config
+
+from conftest import auth_header, create_vehicle, query_count, register_user
+
+
+@pytest.fixture()
+def file_app(tmp_path, monkeypatch):
+    # Request threads need their own connections, which in-memory SQLite can't give them
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'app.db'}")
+    monkeypatch.setattr(Config, "SINGLE_FLIGHT_POLL_SECONDS", 0.01)
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_concurrent_recall_checks_share_one_nhtsa_call(file_app, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow_lookup(year, make, model):
+        calls.append((year, make, model))
+        started.set()
+        release.wait(5)
+        return [{"campaign_number": "23V001000"}]
+
+    monkeypatch.setattr(vehicles, "lookup_recalls", slow_lookup)
+    client = file_app.test_client()
+    tokens = [register_user(client, email=f"owner{i}@example.com") for i in range(4)]
+    vehicle_ids = [create_vehicle(client, token)["id"] for token in tokens]
+    before = SINGLE_FLIGHT_CALLS.value(name="recalls", outcome="coalesced_local")
+    responses = [None] * 4
+
+    def check(i):
+        responses[i] = file_app.test_client().get(
+            f"/vehicles/{vehicle_ids[i]}/recalls", headers=auth_header(tokens[i])
+        )
+
+    threads = [threading.Thread(target=check, args=(i,)) for i in range(4)]
+    threads[0].start()
+    assert started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    # Return only once the other three are waiting on the in-flight call
+    key = f"2020:{name_key('Honda')}:{name_key('Accord')}"
+    deadline = time.monotonic() + 5
+    while waiting_callers("recalls", key) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert waiting_callers("recalls", key) == 3
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert [response.status_code for response in responses] == [200] * 4
+    assert all(response.get_json()["count"] == 1 for response in responses)
+    assert SINGLE_FLIGHT_CALLS.value(name="recalls", outcome="coalesced_local") - before == 3
+    assert max(query_count(response) for response in responses) <= 5
+
+
+def test_waits_for_another_workers_call_and_shares_its_result(file_app):
+    file_app.config["SINGLE_FLIGHT_BACKEND"] = "table"
+    # A row as another worker would leave it while its call is in flight
+    db.session.add(SingleFlightCall(
+        key="decode_vin:VIN1", owner="other", status="running",
+        expires_at=datetime.utcnow() + timedelta(seconds=30),
+    ))
+    db.session.commit()
+
+    def finish():
+        time.sleep(0.1)
+        with file_app.app_context():
+            call = db.session.get(SingleFlightCall, "decode_vin:VIN1")
+            call.status, call.result = "done", {"make": "HONDA"}
+            db.session.commit()
+
+    thread = threading.Thread(target=finish)
+    thread.start()
+    result = coalesce("decode_vin", "VIN1", lambda: pytest.fail("called despite a shared result"))
+    thread.join()
+    assert result == {"make": "HONDA"}
+
+
+def test_takes_over_an_expired_lock_and_shares_errors(file_app):
+    file_app.config["SINGLE_FLIGHT_BACKEND"] = "table"
+    db.session.add(SingleFlightCall(
+        key="recalls:2020:HONDA:CRV", owner="dead", status="running",
+        expires_at=datetime.utcnow() - timedelta(seconds=1),
+    ))
+    db.session.commit()
+
+    assert coalesce("recalls", "2020:HONDA:CRV", lambda: [{"campaign_number": "23V001000"}]) == [
+        {"campaign_number": "23V001000"}
+    ]
+    db.session.expire_all()
+    call = db.session.get(SingleFlightCall, "recalls:2020:HONDA:CRV")
+    assert call.status == "done" and call.owner != "dead"
+
+    def unavailable():
+        raise RuntimeError("NHTSA unavailable")
+
+    with pytest.raises(RuntimeError):
+        coalesce("recalls", "2021:HONDA:CRV", unavailable)
+    # A caller in another worker inside the result window gets the same failure without calling
+    with pytest.raises(SharedCallError, match="NHTSA unavailable"):
+        coalesce("recalls", "2021:HONDA:CRV", lambda: pytest.fail("called despite a shared error"))
@@ -0,0 +1,89 @@
+from unittest import mock
+
+from sqlalchemy import func, select
+
+from app.extensions import db
+from app.models import Reminder, ServiceRecord, ServiceRecordAttachment, Vehicle
+from app.utils.soft_delete import INCLUDE_DELETED, purge_deleted
+
+from conftest import (
+    auth_header,
+    create_attachment,
+    create_reminder,
+    create_service_record,
+    create_vehicle,
+    query_count,
+    register_user,
+)
+
+
+def _count_all(model):
+    statement = select(func.count()).select_from(model).execution_options(**{INCLUDE_DELETED: True})
+    return db.session.execute(statement).scalar()
+
+
+def _seed(client, records=3):
+    token = register_user(client)
+    vehicle = create_vehicle(client, token)
+    record_ids = [create_service_record(client, token, vehicle["id"])["id"] for _ in range(records)]
+    for record_id in record_ids:
+        create_attachment(record_id)
+    create_reminder(client, token, vehicle["id"])
+    return token, vehicle, record_ids
+
+
+def test_deleted_vehicle_disappears_from_every_read(client):
+    token, vehicle, record_ids = _seed(client)
+    headers = auth_header(token)
+
+    response = client.delete(f"/vehicles/{vehicle['id']}", headers=headers)
+    assert response.status_code == 200
+    assert query_count(response) <= 4
+
+    assert client.get("/vehicles/", headers=headers).get_json()["vehicles"] == []
+    assert client.get(f"/vehicles/{vehicle['id']}", headers=headers).status_code == 404
+    assert client.get(f"/vehicles/{vehicle['id']}/overview", headers=headers).status_code == 404
+    assert client.get("/service-records/", headers=headers).get_json()["service_records"] == []
+    assert client.get(f"/service-records/{record_ids[0]}", headers=headers).status_code == 404
+    assert client.get("/reminders/", headers=headers).get_json()["reminders"] == []
+    attachments = client.get(f"/service-records/attachments?record_ids={record_ids[0]}", headers=headers)
+    assert attachments.get_json()["attachments"] == {}
+
+    # Rows stay until purged; the VIN can be added again right away
+    assert _count_all(ServiceRecord) == 3
+    assert create_vehicle(client, token, vin=vehicle["vin"])["vin"] == vehicle["vin"]
+
+
+def test_deleted_service_record_is_hidden_and_counted_out(client):
+    token, vehicle, record_ids = _seed(client)
+    headers = auth_header(token)
+
+    assert client.delete(f"/service-records/{record_ids[0]}", headers=headers).status_code == 200
+
+    listed = client.get("/service-records/", headers=headers).get_json()["service_records"]
+    assert sorted(r["id"] for r in listed) == sorted(record_ids[1:])
+    assert client.get(f"/vehicles/{vehicle['id']}", headers=headers).get_json()["vehicle"]["service_record_count"] == 2
+    overview = client.get(f"/vehicles/{vehicle['id']}/overview", headers=headers).get_json()
+    assert overview["vehicle"]["service_record_count"] == 2
+    assert client.get(f"/service-records/{record_ids[0]}/attachments", headers=headers).status_code == 404
+
+
+def test_purge_hard_deletes_in_chunks_and_removes_files(client):
+    token, vehicle, record_ids = _seed(client, records=5)
+    headers = auth_header(token)
+    client.delete(f"/service-records/{record_ids[0]}", headers=headers)
+    client.delete(f"/vehicles/{vehicle['id']}", headers=headers)
+
+    with mock.patch("app.utils.soft_delete.delete_attachment_files") as delete_files:
+        assert purge_deleted(chunk_size=2, max_chunks=2) == 2
+        assert _count_all(ServiceRecord) == 2
+        assert _count_all(Vehicle) == 1
+
+        purge_deleted(chunk_size=2)
+
+    deleted_public_ids = [row.public_id for call in delete_files.call_args_list for row in call.args[0]]
+    assert len(deleted_public_ids) == 5
+    assert _count_all(ServiceRecord) == 0
+    assert _count_all(ServiceRecordAttachment) == 0
+    assert _count_all(Reminder) == 0
+    assert _count_all(Vehicle) == 0
@@ -0,0 +1,115 @@
+import sqlite3
+import threading
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+
+from app import create_app
+from app.extensions import db
+from config import Config
+
+from conftest import auth_header, create_vehicle, register_user
+
+
+@pytest.fixture()
+def sqlite_app(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'servicetrak.db'}")
+    monkeypatch.setattr(Config, "SQLITE_PRODUCTION_MODE", True)
+    monkeypatch.setattr(Config, "RESPONSE_CACHE_BACKEND", "off")
+    app = create_app()
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+    app.extensions["read_engine"].dispose()
+
+
+def test_connections_get_wal_and_pragmas(sqlite_app):
+    with db.engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+        assert conn.exec_driver_sql("PRAGMA cache_size").scalar() == -64000
+
+    with sqlite_app.extensions["read_engine"].connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA query_only").scalar() == 1
+        with pytest.raises(OperationalError):
+            conn.execute(text("DELETE FROM users"))
+
+
+def test_write_lock_is_taken_at_the_first_write_not_the_first_read(sqlite_app):
+    other = sqlite3.connect(db.engine.url.database, timeout=0, isolation_level=None)
+    try:
+        with db.engine.connect() as conn:
+            conn.execute(text("SELECT COUNT(*) FROM users")).scalar()
+            # The SELECT ran outside any transaction: another writer can still start
+            other.execute("BEGIN IMMEDIATE")
+            other.execute("ROLLBACK")
+
+            conn.execute(text("UPDATE users SET first_name = first_name"))
+            with pytest.raises(sqlite3.OperationalError, match="locked"):
+                other.execute("BEGIN IMMEDIATE")
+            conn.commit()
+            other.execute("BEGIN IMMEDIATE")
+            other.execute("ROLLBACK")
+    finally:
+        other.close()
+
+
+def test_get_requests_read_from_the_read_pool(sqlite_app):
+    client = sqlite_app.test_client()
+    token = register_user(client)
+    create_vehicle(client, token)
+
+    checkouts = []
+    event.listen(sqlite_app.extensions["read_engine"], "checkout", lambda *args: checkouts.append(1))
+
+    response = client.get("/vehicles/", headers=auth_header(token))
+    assert response.status_code == 200
+    assert len(response.get_json()["vehicles"]) == 1
+    assert checkouts
+
+    reads = len(checkouts)
+    create_vehicle(client, token, vin="2T1BURHE0JC123456")
+    assert len(checkouts) == reads
+    assert sqlite_app.view_functions["vehicles.get_vehicle_recalls"].use_primary_db
+
+
+def test_mixed_reads_and_writes_do_not_lock(sqlite_app):
+    # Throughput for the same load: python -m benchmarks.bench_sqlite_concurrency
+    client = sqlite_app.test_client()
+    token = register_user(client)
+    vehicle_id = create_vehicle(client, token)["id"]
+
+    writers, readers, per_thread = 4, 4, 25
+    errors = []
+
+    def write():
+        thread_client = sqlite_app.test_client()
+        for i in range(per_thread):
+            response = thread_client.post("/reminders/", headers=auth_header(token), json={
+                "vehicle_id": vehicle_id, "title": f"Reminder {i}", "due_mileage": "15000",
+            })
+            if response.status_code != 201:
+                errors.append(response.get_data(as_text=True))
+
+    def read():
+        thread_client = sqlite_app.test_client()
+        for _ in range(per_thread):
+            response = thread_client.get("/reminders/?fields=title", headers=auth_header(token))
+            if response.status_code != 200:
+                errors.append(response.get_data(as_text=True))
+
+    threads = [threading.Thread(target=write) for _ in range(writers)]
+    threads += [threading.Thread(target=read) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    reminders = client.get("/reminders/", headers=auth_header(token)).get_json()["reminders"]
+    assert len(reminders) == writers * per_thread
@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+
+from app import create_app
+from app.extensions import db
+from app.utils import storage
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_create_app_does_not_import_lazy_clients():
+    code = (
+        "import sys\n"
+        "from app import create_app\n"
+        "create_app().test_client().get('/health')\n"
+        "print(','.join(m for m in ('cloudinary', 'requests', 'alembic') if m in sys.modules))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, env=dict(os.environ),
+        capture_output=True, text=True, check=True,
+    )
+    assert proc.stdout.strip() == ""
+
+
+def test_flask_migrate_is_set_up_when_a_db_command_runs():
+    app = create_app()
+    assert "migrate" not in app.extensions
+
+    result = app.test_cli_runner().invoke(args=["db", "--help"])
+    assert result.exit_code == 0
+    assert "upgrade" in result.output
+    assert app.extensions["migrate"].db is db
+
+
+def test_cloudinary_is_configured_on_first_use(app):
+    app.config.update(CLOUDINARY_CLOUD_NAME="demo", CLOUDINARY_API_KEY="key", CLOUDINARY_API_SECRET="secret")
+
+    signed = storage.CloudinarySigner().sign_upload("servicetrak/service-records/1/abc", "image", "jpg")
+    assert "/demo/image/upload" in signed["upload_url"]
+    assert signed["fields"]["api_key"] == "key"
+    assert signed["fields"]["allowed_formats"] == "jpg"
+    assert storage.CloudinarySigner().file_url("servicetrak/service-records/1/abc", 1700000000, "image") == (
+        "https://res.cloudinary.com/demo/image/upload/v1700000000/servicetrak/service-records/1/abc"
+    )
+    assert app.extensions["cloudinary_configured"]
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+
+from app.extensions import db
+from app.models import Tombstone
+from app.utils.sync import issue_token, prune_tombstones
+
+from conftest import (
+    auth_header,
+    create_reminder,
+    create_service_record,
+    create_vehicle,
+    query_count,
+    register_user,
+)
+
+
+def _sync(client, token, sync_token=None):
+    path = f"/sync?token={sync_token}" if sync_token else "/sync"
+    response = client.get(path, headers=auth_header(token))
+    assert response.status_code == 200
+    return response
+
+
+def test_full_sync_then_only_deltas(app, client):
+    app.config["SYNC_OVERLAP_SECONDS"] = 0
+    token = register_user(client)
+    vehicle_id = create_vehicle(client, token)["id"]
+    record_id = create_service_record(client, token, vehicle_id)["id"]
+    reminder_id = create_reminder(client, token, vehicle_id)["id"]
+
+    full = _sync(client, token).get_json()
+    assert full["full"] is True
+    assert [v["id"] for v in full["vehicles"]] == [vehicle_id]
+    assert [r["id"] for r in full["service_records"]] == [record_id]
+    assert [r["id"] for r in full["reminders"]] == [reminder_id]
+
+    # Nothing changed: one primary key lookup
+    unchanged = _sync(client, token, full["sync_token"])
+    assert query_count(unchanged) == 1
+    assert unchanged.get_json()["vehicles"] == []
+
+    client.put(f"/reminders/{reminder_id}", headers=auth_header(token), json={"is_completed": True})
+    client.delete(f"/service-records/{record_id}", headers=auth_header(token))
+
+    delta = _sync(client, token, unchanged.get_json()["sync_token"]).get_json()
+    assert delta["full"] is False
+    assert delta["vehicles"] == []
+    assert [r["id"] for r in delta["reminders"]] == [reminder_id]
+    assert delta["reminders"][0]["is_completed"] is True
+    assert delta["deleted"]["service_records"] == [record_id]
+
+    client.delete(f"/vehicles/{vehicle_id}", headers=auth_header(token))
+    delta = _sync(client, token, delta["sync_token"]).get_json()
+    assert delta["deleted"]["vehicles"] == [vehicle_id]
+
+
+def test_changes_are_scoped_to_the_user(client):
+    token = register_user(client)
+    other = register_user(client, email="other@example.com")
+    sync_token = _sync(client, token).get_json()["sync_token"]
+
+    create_vehicle(client, other)
+    delta = _sync(client, token, sync_token).get_json()
+    assert delta["vehicles"] == []
+
+
+def test_bad_and_expired_tokens(app, client):
+    token = register_user(client)
+    assert client.get("/sync?token=garbage", headers=auth_header(token)).status_code == 400
+
+    expired = issue_token(datetime.utcnow() - timedelta(days=31))
+    assert client.get(f"/sync?token={expired}", headers=auth_header(token)).status_code == 410
+
+    db.session.add(Tombstone(user_id=1, entity="vehicle", entity_id=1, deleted_at=datetime.utcnow() - timedelta(days=31)))
+    db.session.commit()
+    assert prune_tombstones() == 1
@@ -0,0 +1,53 @@
+from conftest import (
+    auth_header,
+    create_attachment,
+    create_reminder,
+    create_service_record,
+    create_vehicle,
+    query_count,
+    register_user,
+)
+
+
+def test_overview_matches_the_separate_endpoints(client):
+    token = register_user(client)
+    vehicle_id = create_vehicle(client, token)["id"]
+    records = [create_service_record(client, token, vehicle_id) for _ in range(3)]
+    create_attachment(records[0]["id"])
+    create_attachment(records[2]["id"])
+    reminder = create_reminder(client, token, vehicle_id)
+    done = create_reminder(client, token, vehicle_id)
+    client.put(f"/reminders/{done['id']}", headers=auth_header(token), json={"is_completed": True})
+
+    response = client.get(f"/vehicles/{vehicle_id}/overview?records_limit=2", headers=auth_header(token))
+    assert response.status_code == 200
+    assert query_count(response) == 4
+    body = response.get_json()
+
+    vehicle = client.get(f"/vehicles/{vehicle_id}", headers=auth_header(token)).get_json()["vehicle"]
+    assert body["vehicle"] == vehicle
+    assert body["vehicle"]["service_record_count"] == 3
+    assert body["vehicle"]["open_reminder_count"] == 1
+
+    assert len(body["service_records"]) == 2
+    assert body["has_more_service_records"] is True
+    assert "vehicle" not in body["service_records"][0]
+    # Same service date, so newest id first: the oldest record is past the limit
+    attachment_counts = {r["id"]: r["attachment_count"] for r in body["service_records"]}
+    assert attachment_counts == {records[2]["id"]: 1, records[1]["id"]: 0}
+    assert records[0]["id"] not in attachment_counts
+
+    assert [r["id"] for r in body["open_reminders"]] == [reminder["id"]]
+    assert body["recalls"] == {"count": 0, "checked_at": None}
+
+
+def test_overview_checks_ownership_and_limits(client):
+    owner = register_user(client)
+    vehicle_id = create_vehicle(client, owner)["id"]
+    other = register_user(client, email="other@example.com")
+
+    response = client.get(f"/vehicles/{vehicle_id}/overview", headers=auth_header(other))
+    assert response.status_code == 404
+
+    response = client.get(f"/vehicles/{vehicle_id}/overview?records_limit=500", headers=auth_header(owner))
+    assert response.status_code == 400
@@ -0,0 +1,103 @@
+import csv
+import gc
+
+import pytest
+
+from app.utils import nhtsa
+from app.utils.vpic import load_dump, local_index, model_year, wmi_of
+
+VIN = "1HGCM82633A004352"
+
+DUMP_ROWS = [
+    # wmi, make, year_from, year_to, keys, element, value
+    ("1HG", "HONDA", "2003", "2007", "CM8", "Model", "Accord"),
+    ("1HG", "HONDA", "2003", "2007", "CM8", "Engine Configuration", "V-Shaped"),
+    ("1HG", "HONDA", "2003", "2007", "CM8[2-4]", "Series", "LX"),
+    ("1HG", "HONDA", "2003", "2007", "CM8[2-4]", "Trim", "EX"),
+    ("1HG", "HONDA", "2003", "2007", "CM82*|*A", "Engine Model", "J30A4"),
+    ("1HG", "HONDA", "1990", "1995", "CM8", "Model", "Prelude"),
+    ("1HG", "HONDA", "2003", "2007", "ES1", "Model", "Civic"),
+]
+
+
+@pytest.fixture()
+def snapshot(app, tmp_path):
+    dump = tmp_path / "vpic.csv"
+    with open(dump, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["wmi", "make", "year_from", "year_to", "keys", "element", "value"])
+        writer.writerows(DUMP_ROWS)
+
+    path = tmp_path / "vpic_snapshot.json.gz"
+    result = app.test_cli_runner().invoke(args=["load-vpic", str(dump), "--output", str(path)])
+    assert result.exit_code == 0, result.output
+    assert "1 WMIs and 5 patterns" in result.output
+
+    app.config.update(VPIC_SNAPSHOT_PATH=str(path), VIN_DECODER_ORDER=["local", "remote"])
+    return path
+
+
+def test_vin_positions():
+    assert model_year(VIN) == 2003
+    assert model_year("5YJ3E1EA7LF000001") == 2020
+    assert wmi_of(VIN) == "1HG"
+    assert wmi_of("1G9AB12345X123456") == "1G9123"
+
+
+def test_local_decode_picks_the_most_specific_pattern(app, snapshot, monkeypatch):
+    monkeypatch.setattr(nhtsa, "decode_vin_remote", lambda vin: pytest.fail("remote called"))
+
+    decoded = nhtsa.decode_vin(VIN)
+    assert decoded == {
+        "year": 2003,
+        "make": "HONDA",
+        "model": "Accord",
+        "trim": "EX",
+        "engine": "J30A4",
+        "resolved_fields": ["year", "make", "model", "trim", "engine"],
+        "source": "local",
+    }
+
+
+def test_falls_back_to_remote_and_keeps_partial_local_results(app, snapshot, monkeypatch):
+    # Known WMI, no pattern for this descriptor: only year and make resolve locally
+    vin = "1HGZZ12345A000001"
+    remote = {"year": 2005, "make": "HONDA", "model": "Element", "trim": None, "engine": None,
+              "resolved_fields": ["year", "make", "model"]}
+    monkeypatch.setattr(nhtsa, "decode_vin_remote", lambda v: remote)
+    assert nhtsa.decode_vin(vin) == {**remote, "source": "remote"}
+
+    def unavailable(v):
+        raise ConnectionError("NHTSA unavailable")
+
+    monkeypatch.setattr(nhtsa, "decode_vin_remote", unavailable)
+    decoded = nhtsa.decode_vin(vin)
+    assert decoded["source"] == "local"
+    assert decoded["resolved_fields"] == ["year", "make"]
+
+    # Unknown WMI and no remote: the remote error surfaces
+    with pytest.raises(ConnectionError):
+        nhtsa.decode_vin("WVWZZZ1JZXW000001")
+
+    app.config["VIN_DECODER_ORDER"] = ["remote", "local"]
+    monkeypatch.setattr(nhtsa, "decode_vin_remote", lambda v: None)
+    assert nhtsa.decode_vin(VIN)["source"] == "local"
+
+
+def test_snapshot_round_trips_through_loader(snapshot):
+    reloaded = load_dump(str(snapshot))
+    assert reloaded["wmi"] == {"1HG": {"make": "HONDA"}}
+    assert len(reloaded["patterns"]) == 5
+
+
+def test_loading_the_snapshot_leaves_the_gc_as_it_found_it(app, snapshot):
+    gc.disable()
+    try:
+        assert local_index() is not None
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
+
+    app.extensions.pop("vpic_index", None)
+    assert local_index() is not None
+    assert gc.isenabled()
@@ -2,28 +2,37 @@ import { useCallback, useEffect, useState } from "react";
 import { api } from "../../services/api";
 import "./ServiceRecordAttachments.css";
 
-export default function ServiceRecordAttachmentList({ recordId, token }) {
-  const [attachments, setAttachments] = useState([]);
-  const [loading, setLoading] = useState(true);
+export default function ServiceRecordAttachmentList({
+  recordId,
+  token,
+  initialAttachments,
+}) {
+  const [fetchedAttachments, setFetchedAttachments] = useState([]);
+  const [fetching, setFetching] = useState(!initialAttachments);
   const [error, setError] = useState("");
 
   const loadAttachments = useCallback(async () => {
     setError("");
-    setLoading(true);
+    setFetching(true);
 
     try {
       const data = await api.listServiceRecordAttachments(token, recordId);
-      setAttachments(data.attachments || []);
+      setFetchedAttachments(data.attachments || []);
     } catch (err) {
       setError(err.message);
     } finally {
-      setLoading(false);
+      setFetching(false);
     }
   }, [recordId, token]);
 
   useEffect(() => {
+    // Attachments embedded in the service record list skip the per-record request
+    if (initialAttachments) return;
     loadAttachments();
-  }, [loadAttachments]);
+  }, [initialAttachments, loadAttachments]);
+
+  const attachments = initialAttachments || fetchedAttachments;
+  const loading = !initialAttachments && fetching;
 
   function isImage(fileType = "") {
     return fileType.startsWith("image/");
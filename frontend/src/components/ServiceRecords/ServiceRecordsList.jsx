@@ -48,7 +48,11 @@ export default function ServiceRecordsList({ records, loading, error, token }) {
 
               {r.notes && <p className="service-record-notes">{r.notes}</p>}
 
-              <ServiceRecordAttachmentList recordId={r.id} token={token} />
+              <ServiceRecordAttachmentList
+                recordId={r.id}
+                token={token}
+                initialAttachments={r.attachments}
+              />
             </div>
 
             {r.vehicle && (
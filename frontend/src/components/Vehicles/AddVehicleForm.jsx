@@ -72,6 +72,9 @@ export default function AddVehicleForm({ token, onCreated }) {
       return;
     }
 
+    // VIN without decoded details: let the server decode it in the background
+    payload.decode_vin = Boolean(payload.vin && !(payload.year && payload.make && payload.model));
+
     try {
       await api.createVehicle(token, payload);
       setForm({
@@ -47,6 +47,15 @@ export function AuthProvider({ children }) {
     setUser(data.user);
   }
 
+  // Profile/password changes return a fresh token; older tokens stop working
+  function updateSession(data) {
+    if (data?.access_token) {
+      localStorage.setItem("token", data.access_token);
+      setToken(data.access_token);
+    }
+    if (data?.user) setUser(data.user);
+  }
+
   function logout() {
     localStorage.removeItem("token");
     setToken("");
@@ -54,7 +63,7 @@ export function AuthProvider({ children }) {
   }
 
   const value = useMemo(
-    () => ({ token, user, loading, login, register, logout, loadProfile }),
+    () => ({ token, user, loading, login, register, logout, loadProfile, updateSession }),
     [token, user, loading, loadProfile]
   );
 
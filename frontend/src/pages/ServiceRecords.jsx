@@ -21,7 +21,8 @@ export default function ServiceRecords() {
     try {
       const data = await api.listServiceRecords(
         token,
-        vehicleId ? Number(vehicleId) : undefined
+        vehicleId ? Number(vehicleId) : undefined,
+        { include: "attachments" }
       );
       setRecords(data.service_records || []);
     } catch (err) {
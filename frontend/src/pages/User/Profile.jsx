@@ -3,7 +3,7 @@ import { useAuth } from "../../contexts/useAuth";
 import { api } from "../../services/api";
 
 export default function Profile() {
-  const { token } = useAuth();
+  const { token, updateSession } = useAuth();
   const [form, setForm] = useState({
     first_name: "",
     last_name: "",
@@ -36,7 +36,8 @@ export default function Profile() {
     e.preventDefault();
     setStatus({ error: "", success: "" });
     try {
-      await api.updateProfile(token, form); // PUT /auth/update
+      const data = await api.updateProfile(token, form); // PUT /auth/update
+      updateSession(data);
       setStatus({ error: "", success: "Profile updated successfully." });
     } catch (err) {
       setStatus({ error: err.message, success: "" });
@@ -45,9 +45,11 @@ export default function VehicleDetail() {
   const [recallsLoaded, setRecallsLoaded] = useState(false);
   const [recallsLoading, setRecallsLoading] = useState(false);
   const [showRecalls, setShowRecalls] = useState(true);
+  // Set when NHTSA was unavailable and the API answered with the last known count
+  const [staleRecalls, setStaleRecalls] = useState(null);
 
   async function loadVehicle() {
-    const data = await api.getVehicle(token, id);
+    const data = await api.getVehicleOverview(token, id);
     const v = data.vehicle;
 
     setVehicle(v);
@@ -261,6 +263,7 @@ export default function VehicleDetail() {
     try {
       const data = await api.getVehicleRecalls(token, id);
       setRecalls(data.recalls || []);
+      setStaleRecalls(data.stale ? data : null);
       setRecallsLoaded(true);
       setShowRecalls(true);
     } catch (err) {
@@ -623,6 +626,12 @@ export default function VehicleDetail() {
 
         {!recallsLoaded ? (
           <p className="muted">No recall search run yet.</p>
+        ) : staleRecalls ? (
+          <p className="muted">
+            NHTSA is unavailable right now. The last check on{" "}
+            {new Date(staleRecalls.recall_checked_at).toLocaleDateString()} found{" "}
+            {staleRecalls.count} recall{staleRecalls.count === 1 ? "" : "s"}.
+          </p>
         ) : !showRecalls ? (
           <p className="muted">
             Recall results hidden. {recalls.length} result
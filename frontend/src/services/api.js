@@ -55,15 +55,24 @@ export const api = {
   listVehicles: (token) => request("/vehicles/", { token }),
   createVehicle: (token, payload) => request("/vehicles/", { method: "POST", token, body: payload }),
   getVehicle: (token, id) => request(`/vehicles/${id}`, { token }),
+  getVehicleOverview: (token, id) => request(`/vehicles/${id}/overview`, { token }),
   updateVehicle: (token, id, payload) => request(`/vehicles/${id}`, { method: "PUT", token, body: payload }),
   deleteVehicle: (token, id) => request(`/vehicles/${id}`, { method: "DELETE", token }),
   decodeVin: (token, id) => request(`/vehicles/${id}/decode-vin`, { method: "POST", token }),
   decodeVinPreview: (token, vin) => request("/vehicles/decode", { method: "POST", token, body: { vin } }),
   getVehicleRecalls: (token, id) => request(`/vehicles/${id}/recalls`, { token }),
+
+  // Background jobs
+  enqueueJob: (token, payload) => request("/jobs/", { method: "POST", token, body: payload }),
+  getJob: (token, id) => request(`/jobs/${id}`, { token }),
+  getJobResult: (token, id) => request(`/jobs/${id}/result`, { token }),
   
   // Service Records
-  listServiceRecords: (token, vehicleId) => {
-    const qs = vehicleId ? `?vehicle_id=${vehicleId}` : "";
+  listServiceRecords: (token, vehicleId, { include } = {}) => {
+    const params = new URLSearchParams();
+    if (vehicleId) params.set("vehicle_id", vehicleId);
+    if (include) params.set("include", include);
+    const qs = params.toString() ? `?${params}` : "";
     return request(`/service-records/${qs}`, { token });
   },
   createServiceRecord: (token, payload) => request("/service-records/", { method: "POST", token, body: payload }),
@@ -83,7 +92,32 @@ export const api = {
   listServiceRecordAttachments: (token, recordId) =>
     request(`/service-records/${recordId}/attachments`, { token }),
 
-  uploadServiceRecordAttachment: (token, recordId, file) => {
+  // Uploads go straight to storage with a signed grant; the API only confirms the result
+  uploadServiceRecordAttachment: async (token, recordId, file) => {
+    const grant = await request(`/service-records/${recordId}/attachments/upload-url`, {
+      method: "POST",
+      token,
+      body: { file_name: file.name, file_type: file.type },
+    });
+
+    const formData = new FormData();
+    Object.entries(grant.fields).forEach(([key, value]) => formData.append(key, value));
+    formData.append("file", file);
+
+    const res = await fetch(grant.upload_url, { method: "POST", body: formData });
+    const result = await res.json().catch(() => null);
+    if (!res.ok) {
+      throw new Error(result?.error?.message || result?.message || `Upload failed (${res.status})`);
+    }
+
+    return request(`/service-records/${recordId}/attachments/confirm`, {
+      method: "POST",
+      token,
+      body: { upload_token: grant.upload_token, result },
+    });
+  },
+
+  uploadServiceRecordAttachmentViaApi: (token, recordId, file) => {
     const formData = new FormData();
     formData.append("file", file);
 